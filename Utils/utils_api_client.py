@@ -3,7 +3,8 @@ Utility module for handling API calls and caching in TradeRiser platform
 """
 import os
 import json
-import requests
+import time
+import threading
 import pandas as pd
 from datetime import datetime
 import redis
@@ -11,11 +12,17 @@ from alpha_vantage.fundamentaldata import FundamentalData
 from alpha_vantage.timeseries import TimeSeries
 from pytrends.request import TrendReq
 from textblob import TextBlob
-import requests
 from bs4 import BeautifulSoup
 import re
-from ratelimit import limits, sleep_and_retry
 import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from Utils.utils_singleflight import SingleFlight
+from Utils.utils_memory_cache import TTLCache
+from Utils.utils_codec import pack, unpack, is_packed
+from Utils.utils_rate_limiter import RateLimiter, RateLimitExceeded, rate_limited
+from Utils.utils_http import http_get
 
 logging.basicConfig(
     filename='traderiser.log',
@@ -25,6 +32,14 @@ logging.basicConfig(
 
 class APIClient:
     _twitter_warning_shown = False  # Class variable to track warning
+    # Background stale-while-revalidate refreshes, shared by all clients
+    _refresh_executor = None
+    _refreshing = set()
+    _refresh_lock = threading.Lock()
+    # Per-thread entries loaded by prewarm_cache()
+    _prewarm_local = threading.local()
+    # Bounded fallback cache shared by all clients when Redis is unavailable
+    _shared_memory_cache = None
     
     def __init__(self):
         """Initialize with Redis or in-memory fallback and tier-based API access"""
@@ -41,11 +56,28 @@ class APIClient:
             redis_db = int(os.getenv('REDIS_DB', 0))
             self.redis = redis.Redis(host=redis_host, port=redis_port, db=redis_db, decode_responses=True)
             self.redis.ping()  # Test connection
+            # Second client for packed binary values (DataFrames/arrays)
+            self.redis_binary = redis.Redis(host=redis_host, port=redis_port, db=redis_db, decode_responses=False)
             self.logger.info("Connected to Redis")
         except redis.ConnectionError:
             self.logger.warning("Redis connection failed, using in-memory cache")
             self.redis = None
-            self.in_memory_cache = {}
+            self.redis_binary = None
+            self.in_memory_cache = self._get_memory_cache()
+        
+        # Stale entries stay servable for ttl * CACHE_STALE_FACTOR while they refresh
+        self.stale_factor = max(1.0, float(os.getenv('CACHE_STALE_FACTOR', 4)))
+        
+        # Coalesce concurrent cache misses (in-process, and across processes via Redis)
+        self.single_flight = SingleFlight(self.redis)
+        
+        # Vendor call budgets, shared by all worker processes when Redis is available
+        self.rate_limiter = RateLimiter(self.redis)
+        self.rate_limiter.configure('alpha_vantage', 25 if self.is_pro_tier else 5, 60)
+        self.rate_limiter.configure('coingecko', 30, 60)  # Conservative for the free tier
+        self.rate_limiter.configure('social_sentiment', 10, 60)  # Conservative limit for web scraping
+        self.rate_limiter.configure('google_trends', 10, 60)
+        self.rate_limiter.configure('fred', 10, 60)
         
         # Free tier APIs (always available)
         self.alpha_vantage_key = os.getenv('ALPHA_VANTAGE_API_KEY')
@@ -116,28 +148,186 @@ class APIClient:
                 'note': 'Free tier with standard rate limits. Upgrade to Pro for premium features.'
             }
 
+    @classmethod
+    def _get_memory_cache(cls) -> TTLCache:
+        """Get the process-wide bounded in-memory cache"""
+        with cls._refresh_lock:
+            if cls._shared_memory_cache is None:
+                cls._shared_memory_cache = TTLCache(
+                    max_entries=int(os.getenv('MEMORY_CACHE_MAX_ENTRIES', 10000)),
+                    max_bytes=int(os.getenv('MEMORY_CACHE_MAX_MB', 64)) * 1024 * 1024
+                )
+            return cls._shared_memory_cache
+
+    def get_cache_stats(self) -> dict:
+        """Get in-memory cache counters (empty when Redis is the backend)"""
+        return {} if self.redis else self.in_memory_cache.stats()
+
     def _cache_get(self, key: str) -> dict:
-        """Get from cache (Redis or in-memory)"""
+        """Get a fresh value from cache (Redis or in-memory)"""
+        entry = self._cache_get_entry(key)
+        if entry is None or not entry[1]:
+            return None
+        return entry[0]
+
+    def _cache_get_many(self, keys: List[str]) -> Dict[str, object]:
+        """Get fresh values for many keys in one round trip (MGET); misses are omitted"""
+        return {key: value for key, (value, fresh) in self._cache_get_entries(keys).items() if fresh}
+
+    def _cache_get_entry(self, key: str):
+        """Get (value, is_fresh) from cache, or None once the hard TTL has passed"""
+        return self._cache_get_entries([key]).get(key)
+
+    def _cache_get_entries(self, keys: List[str]) -> Dict[str, tuple]:
+        """Get (value, is_fresh) for many keys, reading pre-warmed entries locally"""
+        prewarmed = self._prewarmed() or {}
+        entries = {key: prewarmed[key] for key in keys if key in prewarmed}
+        missing = [key for key in dict.fromkeys(keys) if key not in entries]
+        if not missing:
+            return entries
         if self.redis:
-            cached = self.redis.get(key)
-            return json.loads(cached) if cached else None
-        return self.in_memory_cache.get(key)
+            envelopes = [json.loads(raw) if raw else None for raw in self.redis.mget(missing)]
+        else:
+            envelopes = [self.in_memory_cache.get(key) for key in missing]
+        for key, envelope in zip(missing, envelopes):
+            if envelope is not None:
+                entries[key] = self._unwrap(envelope)
+        return entries
+
+    @staticmethod
+    def _unwrap(envelope) -> tuple:
+        """Split a cache envelope into (value, is_fresh)"""
+        if not (isinstance(envelope, dict) and '_soft' in envelope):
+            return envelope, True  # Entry written before soft TTLs existed
+        return envelope['_v'], time.time() < envelope['_soft']
 
     def _cache_set(self, key: str, value: dict, ttl: int):
-        """Set cache (Redis or in-memory)"""
+        """Set cache (Redis or in-memory); fresh for ttl, servable stale until the hard TTL"""
+        self._cache_set_many({key: value}, ttl)
+
+    def _cache_set_many(self, items: Dict[str, object], ttl: int):
+        """Set many keys with one TTL in a single pipelined round trip"""
+        if not items:
+            return
+        now = time.time()
+        hard_ttl = int(ttl * self.stale_factor)
+        envelopes = {key: {'_v': value, '_soft': now + ttl, '_hard': now + hard_ttl}
+                     for key, value in items.items()}
         if self.redis:
-            self.redis.setex(key, ttl, json.dumps(value))
+            pipe = self.redis.pipeline(transaction=False)
+            for key, envelope in envelopes.items():
+                pipe.setex(key, hard_ttl, json.dumps(envelope))
+            pipe.execute()
         else:
-            self.in_memory_cache[key] = value
+            for key, envelope in envelopes.items():
+                self.in_memory_cache.set(key, envelope, hard_ttl)
+        prewarmed = self._prewarmed()
+        if prewarmed is not None:
+            prewarmed.update({key: (value, True) for key, value in items.items()})
+
+    @contextmanager
+    def prewarm_cache(self, keys: List[str]):
+        """Load many keys in one round trip; cache reads in this thread are then served locally"""
+        local = APIClient._prewarm_local
+        previous = getattr(local, 'entries', None)
+        local.entries = dict(previous or {})
+        try:
+            local.entries.update(self._cache_get_entries(keys))
+            self.logger.info(f"Pre-warmed {len(local.entries)}/{len(keys)} cache keys")
+        except Exception as e:
+            self.logger.warning(f"Cache pre-warm failed, falling back to per-key reads: {str(e)}")
+        try:
+            yield
+        finally:
+            local.entries = previous
+
+    def _prewarmed(self) -> Optional[Dict[str, tuple]]:
+        """Entries pre-warmed for the current thread, if inside prewarm_cache()"""
+        return getattr(APIClient._prewarm_local, 'entries', None)
+
+    def _cache_get_frame(self, key: str):
+        """Get a cached DataFrame, Series or ndarray stored with _cache_set_frame"""
+        try:
+            data = self.redis_binary.get(key) if self.redis_binary else self.in_memory_cache.get(key)
+            return unpack(data) if is_packed(data) else None
+        except Exception as e:
+            self.logger.warning(f"Error reading packed cache value {key}: {str(e)}")
+            return None
+
+    def _cache_set_frame(self, key: str, value, ttl: int):
+        """Cache a DataFrame, Series or numeric ndarray in the compact binary format"""
+        try:
+            data = pack(value)
+            if self.redis_binary:
+                self.redis_binary.setex(key, ttl, data)
+            else:
+                self.in_memory_cache.set(key, data, ttl)
+        except Exception as e:
+            self.logger.warning(f"Error writing packed cache value {key}: {str(e)}")
+
+    def _get_or_fetch(self, cache_key: str, ttl: int, fetch):
+        """Serve from cache, coalescing concurrent misses into one vendor fetch"""
+        entry = self._cache_get_entry(cache_key)
+        if entry is not None:
+            value, fresh = entry
+            if not fresh:
+                # Serve the stale value now and refresh it off the request path
+                self._schedule_refresh(cache_key, ttl, fetch)
+            return value
+
+        try:
+            return self._load_once(cache_key, ttl, fetch)
+        except RateLimitExceeded:
+            # Nothing cached to serve: let the caller degrade or answer 429 with Retry-After
+            self.logger.warning(f"Rate limited on cold cache miss for {cache_key}")
+            raise
+
+    def _load_once(self, cache_key: str, ttl: int, fetch):
+        """Fetch and cache a value through single-flight"""
+        def load():
+            # Another flight may have filled the cache while we queued
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+            value = fetch()
+            self._cache_set(cache_key, value, ttl)
+            return value
+
+        return self.single_flight.do(cache_key, load, cache_probe=lambda: self._cache_get(cache_key))
+
+    def _schedule_refresh(self, cache_key: str, ttl: int, fetch):
+        """Queue one background refresh per stale key"""
+        with APIClient._refresh_lock:
+            if cache_key in APIClient._refreshing:
+                return
+            APIClient._refreshing.add(cache_key)
+            if APIClient._refresh_executor is None:
+                APIClient._refresh_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv('CACHE_REFRESH_WORKERS', 4)),
+                    thread_name_prefix='cache-refresh'
+                )
+        APIClient._refresh_executor.submit(self._refresh_entry, cache_key, ttl, fetch)
+
+    def _refresh_entry(self, cache_key: str, ttl: int, fetch):
+        """Re-fetch a stale entry; on failure the stale value stays until its hard TTL"""
+        try:
+            # Off the request path we can queue for a rate-limit token instead of failing fast
+            with self.rate_limiter.background():
+                self._load_once(cache_key, ttl, fetch)
+        except Exception as e:
+            self.logger.warning(f"Background refresh failed for {cache_key}: {str(e)}")
+        finally:
+            with APIClient._refresh_lock:
+                APIClient._refreshing.discard(cache_key)
 
-    @sleep_and_retry
-    @limits(calls=5, period=60)  # Alpha Vantage: 5 calls/minute
     def get_alpha_vantage_fundamentals(self, symbol: str) -> dict:
         """Fetch fundamental data from Alpha Vantage"""
-        cache_key = f"fundamental:{symbol}"
-        cached = self._cache_get(cache_key)
-        if cached:
-            return cached
+        return self._get_or_fetch(f"fundamental:{symbol}", 86400,  # Cache for 24 hours
+                                  lambda: self._fetch_alpha_vantage_fundamentals(symbol))
+
+    @rate_limited('alpha_vantage')
+    def _fetch_alpha_vantage_fundamentals(self, symbol: str) -> dict:
+        """Fetch fundamental data from Alpha Vantage (uncached, rate limited)"""
         try:
             fd = FundamentalData(key=self.alpha_vantage_key)
             overview, _ = fd.get_company_overview(symbol=symbol)
@@ -151,21 +341,20 @@ class APIClient:
                 'profit_margin': float(overview.get('ProfitMargin', 0)),
                 'last_updated': datetime.now().isoformat()
             }
-            self._cache_set(cache_key, data, 86400)  # Cache for 24 hours
             self.logger.info(f"Fetched Alpha Vantage fundamentals for {symbol}")
             return data
         except Exception as e:
             self.logger.error(f"Error fetching Alpha Vantage fundamentals for {symbol}: {str(e)}")
             raise
 
-    @sleep_and_retry
-    @limits(calls=5, period=60)  # Alpha Vantage: 5 calls/minute
     def get_alpha_vantage_quote(self, symbol: str) -> dict:
         """Fetch real-time quote from Alpha Vantage"""
-        cache_key = f"quote:{symbol}"
-        cached = self._cache_get(cache_key)
-        if cached:
-            return cached
+        return self._get_or_fetch(f"quote:{symbol}", 300,  # Cache for 5 minutes
+                                  lambda: self._fetch_alpha_vantage_quote(symbol))
+
+    @rate_limited('alpha_vantage')
+    def _fetch_alpha_vantage_quote(self, symbol: str) -> dict:
+        """Fetch real-time quote from Alpha Vantage (uncached, rate limited)"""
         try:
             ts = TimeSeries(key=self.alpha_vantage_key)
             data, _ = ts.get_quote_endpoint(symbol=symbol)
@@ -176,24 +365,23 @@ class APIClient:
                 'change_percent': float(data.get('10. change percent', 0).replace('%', '')),
                 'last_updated': datetime.now().isoformat()
             }
-            self._cache_set(cache_key, result, 300)  # Cache for 5 minutes
             self.logger.info(f"Fetched Alpha Vantage quote for {symbol}")
             return result
         except Exception as e:
             self.logger.error(f"Error fetching Alpha Vantage quote for {symbol}: {str(e)}")
             raise
 
-    @sleep_and_retry
-    @limits(calls=30, period=60)  # CoinGecko: conservative 30 calls/minute
     def get_coingecko_data(self, coin_id: str) -> dict:
         """Fetch cryptocurrency data from CoinGecko"""
-        cache_key = f"coingecko:{coin_id}"
-        cached = self._cache_get(cache_key)
-        if cached:
-            return cached
+        return self._get_or_fetch(f"coingecko:{coin_id}", 3600,  # Cache for 1 hour
+                                  lambda: self._fetch_coingecko_data(coin_id))
+
+    @rate_limited('coingecko')
+    def _fetch_coingecko_data(self, coin_id: str) -> dict:
+        """Fetch cryptocurrency data from CoinGecko (uncached, rate limited)"""
         try:
             url = f"https://api.coingecko.com/api/v3/coins/{coin_id}"
-            response = requests.get(url, timeout=10)
+            response = http_get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
             result = {
@@ -204,87 +392,81 @@ class APIClient:
                 'price_change_24h': data.get('market_data', {}).get('price_change_percentage_24h', 0),
                 'last_updated': datetime.now().isoformat()
             }
-            self._cache_set(cache_key, result, 3600)  # Cache for 1 hour
             self.logger.info(f"Fetched CoinGecko data for {coin_id}")
             return result
         except Exception as e:
             self.logger.error(f"Error fetching CoinGecko data for {coin_id}: {str(e)}")
             raise
 
-    @sleep_and_retry
-    @limits(calls=10, period=60)  # Conservative limit for web scraping
     def get_social_sentiment(self, query: str) -> float:
         """Calculate sentiment score from multiple sources using web scraping"""
-        cache_key = f"social_sentiment:{query}"
-        cached = self._cache_get(cache_key)
-        if cached:
-            return float(cached)
-        
         try:
-            sentiment_scores = []
-            
-            # Method 1: Reddit sentiment scraping
-            reddit_sentiment = self._scrape_reddit_sentiment(query)
-            if reddit_sentiment is not None:
-                sentiment_scores.append(reddit_sentiment)
-            
-            # Method 2: News headlines sentiment
-            news_sentiment = self._scrape_news_sentiment(query)
-            if news_sentiment is not None:
-                sentiment_scores.append(news_sentiment)
-            
-            # Method 3: Yahoo Finance discussions
-            yahoo_sentiment = self._scrape_yahoo_discussions(query)
-            if yahoo_sentiment is not None:
-                sentiment_scores.append(yahoo_sentiment)
-            
-            # Calculate average sentiment or return neutral if no data
-            if sentiment_scores:
-                final_sentiment = sum(sentiment_scores) / len(sentiment_scores)
-            else:
-                final_sentiment = 0.5  # Neutral sentiment
-            
-            self._cache_set(cache_key, final_sentiment, 3600)  # Cache for 1 hour
-            self.logger.info(f"Calculated social sentiment for {query}: {final_sentiment}")
-            return final_sentiment
-            
+            return float(self._get_or_fetch(f"social_sentiment:{query}", 3600,  # Cache for 1 hour
+                                            lambda: self._fetch_social_sentiment(query)))
         except Exception as e:
             self.logger.error(f"Error calculating social sentiment for {query}: {str(e)}")
             return 0.5  # Return neutral sentiment on error
 
-    @sleep_and_retry
-    @limits(calls=10, period=60)  # pytrends: conservative limit
+    @rate_limited('social_sentiment')
+    def _fetch_social_sentiment(self, query: str) -> float:
+        """Scrape and average sentiment sources (uncached, rate limited)"""
+        sentiment_scores = []
+        
+        # Method 1: Reddit sentiment scraping
+        reddit_sentiment = self._scrape_reddit_sentiment(query)
+        if reddit_sentiment is not None:
+            sentiment_scores.append(reddit_sentiment)
+        
+        # Method 2: News headlines sentiment
+        news_sentiment = self._scrape_news_sentiment(query)
+        if news_sentiment is not None:
+            sentiment_scores.append(news_sentiment)
+        
+        # Method 3: Yahoo Finance discussions
+        yahoo_sentiment = self._scrape_yahoo_discussions(query)
+        if yahoo_sentiment is not None:
+            sentiment_scores.append(yahoo_sentiment)
+        
+        # Calculate average sentiment or return neutral if no data
+        if sentiment_scores:
+            final_sentiment = sum(sentiment_scores) / len(sentiment_scores)
+        else:
+            final_sentiment = 0.5  # Neutral sentiment
+        
+        self.logger.info(f"Calculated social sentiment for {query}: {final_sentiment}")
+        return final_sentiment
+
     def get_google_trends(self, keyword: str) -> float:
         """Fetch Google Trends score"""
-        cache_key = f"trends:{keyword}"
-        cached = self._cache_get(cache_key)
-        if cached:
-            return float(cached)
+        return float(self._get_or_fetch(f"trends:{keyword}", 86400,  # Cache for 24 hours
+                                        lambda: self._fetch_google_trends(keyword)))
+
+    @rate_limited('google_trends')
+    def _fetch_google_trends(self, keyword: str) -> float:
+        """Fetch Google Trends score (uncached, rate limited)"""
         try:
             self.pytrends.build_payload(kw_list=[keyword], timeframe='now 7-d')
             trends_data = self.pytrends.interest_over_time()
             score = trends_data[keyword].mean() / 100 if keyword in trends_data else 0.5
-            self._cache_set(cache_key, score, 86400)  # Cache for 24 hours
             self.logger.info(f"Fetched Google Trends for {keyword}")
-            return score
+            return float(score)
         except Exception as e:
             self.logger.error(f"Error fetching Google Trends for {keyword}: {str(e)}")
             raise
 
-    @sleep_and_retry
-    @limits(calls=10, period=60)  # FRED: conservative limit
     def get_fred_data(self, series_id: str) -> float:
         """Fetch economic data from FRED"""
-        cache_key = f"fred:{series_id}"
-        cached = self._cache_get(cache_key)
-        if cached:
-            return float(cached)
+        return float(self._get_or_fetch(f"fred:{series_id}", 86400,  # Cache for 24 hours
+                                        lambda: self._fetch_fred_data(series_id)))
+
+    @rate_limited('fred')
+    def _fetch_fred_data(self, series_id: str) -> float:
+        """Fetch economic data from FRED (uncached, rate limited)"""
         try:
             url = f"https://api.stlouisfed.org/fred/series/observations?series_id={series_id}&api_key={os.getenv('FRED_API_KEY')}&file_type=json"
-            response = requests.get(url, timeout=10)
+            response = http_get(url, timeout=10)
             response.raise_for_status()
             value = float(response.json()['observations'][-1]['value'])
-            self._cache_set(cache_key, value, 86400)  # Cache for 24 hours
             self.logger.info(f"Fetched FRED data for {series_id}")
             return value
         except Exception as e:
@@ -298,7 +480,7 @@ class APIClient:
             url = f"https://www.reddit.com/search.json?q={query}&sort=hot&limit=25"
             headers = {'User-Agent': 'TradeRiser/1.0'}
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_get(url, headers=headers, timeout=10)
             if response.status_code != 200:
                 return None
                 
@@ -338,7 +520,7 @@ class APIClient:
             url = f"https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
             headers = {'User-Agent': 'TradeRiser/1.0'}
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_get(url, headers=headers, timeout=10)
             if response.status_code != 200:
                 return None
                 
@@ -374,7 +556,7 @@ class APIClient:
             url = f"https://query1.finance.yahoo.com/v1/finance/search?q={query}"
             headers = {'User-Agent': 'TradeRiser/1.0'}
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_get(url, headers=headers, timeout=10)
             if response.status_code != 200:
                 return None
                 
@@ -0,0 +1,156 @@
+"""
+Compact binary codec for cached NumPy arrays and pandas DataFrames
+A packed value is: magic, flags byte, header length, a small JSON header
+describing dtypes/shapes/index, then the raw little-endian column buffers
+(optionally zlib-compressed). Decoding maps the buffers straight back into
+arrays with np.frombuffer instead of parsing text.
+"""
+import json
+import zlib
+import struct
+from typing import List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'TRC1'
+FLAG_ZLIB = 0x01
+_PREAMBLE = struct.Struct('<4sBI')  # magic, flags, header length
+
+# Payloads smaller than this are stored uncompressed
+COMPRESS_MIN_BYTES = 1024
+
+
+def is_packed(data: bytes) -> bool:
+    """Check whether bytes were produced by pack()"""
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:4]) == MAGIC
+
+
+def pack(value: Union[pd.DataFrame, pd.Series, np.ndarray], compress: bool = True, level: int = 1) -> bytes:
+    """Encode a DataFrame, Series or numeric ndarray into a binary blob"""
+    if isinstance(value, pd.Series):
+        header, buffers = _pack_frame(value.to_frame(name=value.name if value.name is not None else 0))
+        header['kind'] = 'series'
+    elif isinstance(value, pd.DataFrame):
+        header, buffers = _pack_frame(value)
+    elif isinstance(value, np.ndarray):
+        header, buffers = _pack_array(value)
+    else:
+        raise TypeError(f"Cannot pack {type(value).__name__}")
+
+    payload = b''.join(buffers)
+    flags = 0
+    if compress and len(payload) >= COMPRESS_MIN_BYTES:
+        payload = zlib.compress(payload, level)
+        flags |= FLAG_ZLIB
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    return _PREAMBLE.pack(MAGIC, flags, len(header_bytes)) + header_bytes + payload
+
+
+def unpack(data: bytes) -> Union[pd.DataFrame, pd.Series, np.ndarray]:
+    """Decode a blob produced by pack()"""
+    magic, flags, header_length = _PREAMBLE.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a packed cache value")
+    offset = _PREAMBLE.size
+    header = json.loads(bytes(data[offset:offset + header_length]))
+    payload = memoryview(data)[offset + header_length:]
+    if flags & FLAG_ZLIB:
+        payload = memoryview(zlib.decompress(payload))
+
+    if header['kind'] == 'ndarray':
+        return _read_buffer(payload, header['dtype'], header['shape'], 0)[0]
+    frame = _unpack_frame(header, payload)
+    if header['kind'] == 'series':
+        series = frame.iloc[:, 0]
+        return series.rename(None) if header['columns'] == [0] else series
+    return frame
+
+
+def _pack_array(array: np.ndarray) -> Tuple[dict, List[bytes]]:
+    """Header and buffer for a numeric ndarray"""
+    if array.dtype.hasobject:
+        raise TypeError("Object arrays cannot be packed")
+    array = np.ascontiguousarray(array)
+    dtype = array.dtype.newbyteorder('<') if array.dtype.byteorder == '>' else array.dtype
+    return {'kind': 'ndarray', 'dtype': dtype.str, 'shape': list(array.shape)}, [array.astype(dtype).tobytes()]
+
+
+def _pack_frame(frame: pd.DataFrame) -> Tuple[dict, List[bytes]]:
+    """Header and column buffers for a DataFrame"""
+    buffers = []
+    index_spec = _pack_values(frame.index, buffers)
+    index_spec['name'] = frame.index.name
+    columns = []
+    for position in range(frame.shape[1]):
+        columns.append(_pack_values(frame.iloc[:, position], buffers))
+    column_labels = [list(c) if isinstance(c, tuple) else c for c in frame.columns]
+    header = {
+        'kind': 'frame',
+        'rows': len(frame),
+        'columns': column_labels,
+        'column_names': list(frame.columns.names) if isinstance(frame.columns, pd.MultiIndex) else None,
+        'index': index_spec,
+        'dtypes': columns
+    }
+    return header, buffers
+
+
+def _pack_values(values, buffers: List[bytes]) -> dict:
+    """Describe one column/index and append its buffer (non-numeric values go in the header)"""
+    if isinstance(values, pd.RangeIndex):
+        return {'type': 'range', 'start': values.start, 'step': values.step}
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        tz = getattr(values.dtype, 'tz', None)
+        as_index = pd.DatetimeIndex(values)
+        if tz is not None:
+            as_index = as_index.tz_convert('UTC').tz_localize(None)
+        buffers.append(as_index.asi8.astype('<i8').tobytes())
+        return {'type': 'datetime', 'unit': getattr(as_index, 'unit', 'ns'), 'tz': str(tz) if tz is not None else None}
+    array = np.asarray(values)
+    if array.dtype.kind in 'biuf' and not array.dtype.hasobject:
+        dtype = array.dtype.newbyteorder('<') if array.dtype.byteorder == '>' else array.dtype
+        buffers.append(np.ascontiguousarray(array, dtype=dtype).tobytes())
+        return {'type': 'numeric', 'dtype': dtype.str}
+    return {'type': 'json', 'values': [None if pd.isna(v) else (v if isinstance(v, (int, float, bool)) else str(v))
+                                       for v in array.tolist()]}
+
+
+def _unpack_frame(header: dict, payload: memoryview) -> pd.DataFrame:
+    """Rebuild a DataFrame from its header and column buffers"""
+    rows = header['rows']
+    offset = 0
+    index, offset = _unpack_values(header['index'], payload, rows, offset)
+    data = {}
+    for position, spec in enumerate(header['dtypes']):
+        data[position], offset = _unpack_values(spec, payload, rows, offset)
+    frame = pd.DataFrame(data, index=pd.Index(index, name=header['index'].get('name')))
+    labels = header['columns']
+    if header.get('column_names') is not None:
+        frame.columns = pd.MultiIndex.from_tuples([tuple(c) for c in labels], names=header['column_names'])
+    else:
+        frame.columns = labels
+    return frame
+
+
+def _unpack_values(spec: dict, payload: memoryview, rows: int, offset: int):
+    """Read one column/index described by spec starting at offset"""
+    if spec['type'] == 'range':
+        return pd.RangeIndex(spec['start'], spec['start'] + rows * spec['step'], spec['step']), offset
+    if spec['type'] == 'json':
+        return spec['values'], offset
+    if spec['type'] == 'datetime':
+        values, offset = _read_buffer(payload, '<i8', [rows], offset)
+        index = pd.DatetimeIndex(values.view(f"datetime64[{spec.get('unit', 'ns')}]"))
+        if spec.get('tz'):
+            index = index.tz_localize('UTC').tz_convert(spec['tz'])
+        return index, offset
+    return _read_buffer(payload, spec['dtype'], [rows], offset)
+
+
+def _read_buffer(payload: memoryview, dtype: str, shape: List[int], offset: int):
+    """View a slice of the payload as an array without copying"""
+    dtype = np.dtype(dtype)
+    count = int(np.prod(shape)) if shape else 1
+    array = np.frombuffer(payload, dtype=dtype, count=count, offset=offset).reshape(shape)
+    return array, offset + count * dtype.itemsize
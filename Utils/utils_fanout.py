@@ -0,0 +1,132 @@
+"""
+Bounded concurrent fan-out with a deadline for per-ticker vendor loops
+Items run on a process-wide thread pool with a per-call concurrency cap.
+When the deadline passes, whatever finished is returned and the remaining
+items are reported as pending so handlers can answer with partial results
+instead of blocking. Calls that missed the deadline keep their thread
+until the vendor answers, so background refreshers (pool='background')
+run on their own pool and cannot starve request handlers' fan-outs.
+"""
+import os
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Pool name -> (size setting, default size)
+POOL_SIZES = {
+    'request': ('FANOUT_POOL_SIZE', 32),
+    'background': ('FANOUT_BACKGROUND_POOL_SIZE', 8)
+}
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executor_lock = threading.Lock()
+_worker_context = threading.local()
+
+
+class FanOutResult:
+    """Outcome of a fan-out: results and errors by key, plus keys that missed the deadline"""
+
+    def __init__(self):
+        self.results: Dict[Hashable, Any] = {}
+        self.errors: Dict[Hashable, str] = {}
+        self.pending: List[Hashable] = []
+        self.elapsed = 0.0
+
+    @property
+    def partial(self) -> bool:
+        """True when some items did not finish before the deadline"""
+        return bool(self.pending)
+
+    def summary(self) -> Dict:
+        """Metadata suitable for including in an API response"""
+        return {
+            'partial': self.partial,
+            'pending': list(self.pending),
+            'failed': list(self.errors),
+            'elapsed_seconds': round(self.elapsed, 3)
+        }
+
+
+def fan_out(func: Callable[[Any], Any], items: Iterable, max_workers: int = None,
+            deadline: Optional[float] = None, key: Callable[[Any], Hashable] = None,
+            pool: str = 'request') -> FanOutResult:
+    """Run func over items concurrently on the named pool; stop waiting after `deadline` seconds"""
+    items = list(items)
+    key = key or (lambda item: item)
+    max_workers = max_workers or int(os.getenv('FANOUT_MAX_PER_REQUEST', 8))
+    deadline = deadline if deadline is not None else float(os.getenv('FANOUT_DEADLINE_SECONDS', 15))
+    outcome = FanOutResult()
+    started = time.monotonic()
+
+    if getattr(_worker_context, 'active', False) or len(items) <= 1:
+        # Nested fan-outs run inline so pool workers never wait on the same pool
+        for item in items:
+            if time.monotonic() - started > deadline:
+                outcome.pending.append(key(item))
+                continue
+            _collect(outcome, key(item), func, item)
+        outcome.elapsed = time.monotonic() - started
+        return outcome
+
+    executor = _get_executor(pool)
+    queue = list(items)
+    in_flight = {}
+    end = started + deadline
+    while queue or in_flight:
+        while queue and len(in_flight) < max_workers:
+            item = queue.pop(0)
+            in_flight[executor.submit(_run_in_worker, func, item)] = key(item)
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            break
+        done, _ = wait(list(in_flight), timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            item_key = in_flight.pop(future)
+            try:
+                outcome.results[item_key] = future.result()
+            except Exception as e:
+                outcome.errors[item_key] = str(e)
+
+    for future, item_key in in_flight.items():
+        future.cancel()  # Already-running calls finish in the background; results are dropped
+        outcome.pending.append(item_key)
+    outcome.pending.extend(key(item) for item in queue)
+    outcome.elapsed = time.monotonic() - started
+    if outcome.partial:
+        logger.warning(f"Fan-out deadline of {deadline}s reached with {len(outcome.pending)}/{len(items)} items pending")
+    return outcome
+
+
+def _collect(outcome: FanOutResult, item_key: Hashable, func: Callable, item: Any):
+    """Run one item inline and record its result or error"""
+    try:
+        outcome.results[item_key] = func(item)
+    except Exception as e:
+        outcome.errors[item_key] = str(e)
+
+
+def _run_in_worker(func: Callable, item: Any):
+    """Execute one item, marking the thread so nested fan-outs run inline"""
+    _worker_context.active = True
+    try:
+        return func(item)
+    finally:
+        _worker_context.active = False
+
+
+def _get_executor(pool: str) -> ThreadPoolExecutor:
+    """Process-wide pool shared by every fan-out with the same pool name"""
+    executor = _executors.get(pool)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(pool)
+            if executor is None:
+                setting, default = POOL_SIZES[pool]
+                executor = ThreadPoolExecutor(max_workers=int(os.getenv(setting, default)),
+                                              thread_name_prefix=f'fanout-{pool}')
+                _executors[pool] = executor
+    return executor
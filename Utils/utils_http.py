@@ -0,0 +1,82 @@
+"""
+Shared HTTP transport for TradeRiser vendor calls
+One process-wide requests.Session with pooled keep-alive connections per
+host (HTTP_POOL_SIZE connections each, HTTP_POOL_HOSTS host pools), so
+small JSON calls reuse an open TCP+TLS connection instead of paying the
+handshake every time. When HTTP2_ENABLED is set and httpx with h2 is
+installed, calls go through a shared HTTP/2 httpx.Client instead.
+"""
+import os
+import threading
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+    import h2  # noqa: F401  (required by httpx for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTP2_AVAILABLE = False
+
+_session = None
+_http2_client = None
+_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Get the process-wide pooled requests session"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def http_get(url: str, **kwargs):
+    """GET through the shared pooled transport (HTTP/2 when enabled and available)"""
+    client = _get_http2_client()
+    if client is not None:
+        kwargs.pop('allow_redirects', None)
+        return client.get(url, **kwargs)
+    return get_session().get(url, **kwargs)
+
+
+def _build_session() -> requests.Session:
+    """Create a session with sized connection pools and idempotent retries"""
+    pool_size = int(os.getenv('HTTP_POOL_SIZE', 20))
+    adapter = HTTPAdapter(
+        pool_connections=int(os.getenv('HTTP_POOL_HOSTS', 20)),
+        pool_maxsize=pool_size,
+        pool_block=False,
+        max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.2,
+                          status_forcelist=(502, 503, 504), allowed_methods=frozenset(['GET']),
+                          raise_on_status=False)
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    logging.getLogger(__name__).info(f"HTTP session created (pool size {pool_size} per host)")
+    return session
+
+
+def _get_http2_client():
+    """Shared httpx HTTP/2 client, or None when disabled/unavailable"""
+    global _http2_client
+    if not HTTP2_AVAILABLE or os.getenv('HTTP2_ENABLED', 'false').lower() != 'true':
+        return None
+    if _http2_client is None:
+        with _lock:
+            if _http2_client is None:
+                pool_size = int(os.getenv('HTTP_POOL_SIZE', 20))
+                _http2_client = httpx.Client(
+                    http2=True,
+                    follow_redirects=True,
+                    limits=httpx.Limits(max_connections=pool_size * int(os.getenv('HTTP_POOL_HOSTS', 20)),
+                                        max_keepalive_connections=pool_size)
+                )
+    return _http2_client
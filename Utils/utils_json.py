@@ -0,0 +1,116 @@
+"""
+Fast JSON serialization for TradeRiser Flask responses
+FastJSONProvider encodes responses with orjson when it is installed, which
+serializes NumPy scalars and arrays natively (NaN/inf become null), and
+handles pandas Timestamps, Series and DataFrames. DataFrames are emitted
+column-wise ({'index': [...], 'columns': {name: [...]}}) so large bar sets
+are written as whole arrays instead of one dict per row; timestamp
+columns and indexes are formatted in one vectorized pass. Without orjson
+the standard library encoder is used with the same conversions.
+"""
+import math
+import numpy as np
+import pandas as pd
+from datetime import date, datetime
+from typing import Any, Dict
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def frame_to_columns(frame: pd.DataFrame) -> Dict[str, Any]:
+    """Column-wise JSON-ready form of a DataFrame (values stay NumPy arrays)"""
+    return {
+        'index': _labels(frame.index),
+        'columns': {str(name): _column(frame[name]) for name in frame.columns}
+    }
+
+
+def _column(series: pd.Series):
+    """NumPy array the encoder can write directly, or a list for other dtypes"""
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        return _labels(pd.Index(series))
+    if series.dtype.kind in 'fiub':
+        return series.to_numpy()
+    if series.dtype.kind == 'M':
+        return _labels(pd.Index(series))
+    return [None if _is_missing(value) else value for value in series.tolist()]
+
+
+def _labels(index: pd.Index) -> list:
+    """Index labels as JSON values, with timestamps in ISO 8601"""
+    if isinstance(index, pd.DatetimeIndex):
+        return _iso_timestamps(index)
+    return [None if _is_missing(value) else value for value in index.tolist()]
+
+
+def _iso_timestamps(index: pd.DatetimeIndex) -> list:
+    """Vectorized ISO 8601 strings; tz-aware values are written in UTC with a Z suffix"""
+    timezone = 'naive'
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+        timezone = 'UTC'
+    values = index.to_numpy()
+    unit = 's' if (values.astype('datetime64[s]') == values)[~index.isna()].all() else 'us'
+    strings = np.datetime_as_string(values, unit=unit, timezone=timezone).tolist()
+    return [None if value == 'NaT' else value for value in strings] if index.hasnans else strings
+
+
+def _is_missing(value: Any) -> bool:
+    """True for None, NaN, NaT and pd.NA"""
+    if value is None or value is pd.NaT or value is pd.NA:
+        return True
+    return isinstance(value, float) and math.isnan(value)
+
+
+def _default(obj: Any) -> Any:
+    """Convert pandas/NumPy values the encoder does not handle itself"""
+    if isinstance(obj, pd.DataFrame):
+        return frame_to_columns(obj)
+    if isinstance(obj, pd.Series):
+        return {'index': _labels(obj.index), 'values': _column(obj)}
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (pd.Timestamp, datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        return None if isinstance(value, float) and not math.isfinite(value) else value
+    return DefaultJSONProvider.default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson with NumPy/pandas support"""
+
+    default = staticmethod(_default)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize to a JSON string"""
+        if not ORJSON_AVAILABLE or kwargs:
+            kwargs.setdefault('default', _default)
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj).decode('utf-8')
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Build a JSON response without an intermediate str copy"""
+        if not ORJSON_AVAILABLE:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj) + b'\n', mimetype=self.mimetype)
+
+    def _encode(self, obj: Any) -> bytes:
+        """orjson encoding honouring the provider's sort_keys/compact settings"""
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
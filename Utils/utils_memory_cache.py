@@ -0,0 +1,120 @@
+"""
+Bounded in-process cache for TradeRiser
+LRU eviction with per-entry TTL and limits on both entry count and
+approximate size in bytes. Used when Redis is unavailable, and to bound
+in-process memos such as MarketDataService's per-ticker frames.
+"""
+import sys
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        """Initialize with entry-count and approximate byte limits"""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (expires_at, size, value), least recently used first
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a live value and mark it most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value for ttl seconds, evicting least recently used entries as needed"""
+        size = self._estimate_size(key, value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return  # Larger than the whole cache; never store it
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self._bytes += size
+            self._evict()
+
+    def delete(self, key: str):
+        """Remove a key if present"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss/eviction counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def _evict(self):
+        """Drop expired entries first, then least recently used until within limits"""
+        if len(self._entries) <= self.max_entries and self._bytes <= self.max_bytes:
+            return
+        now = time.monotonic()
+        for key in [k for k, entry in self._entries.items() if entry[0] <= now]:
+            self._remove(key)
+            self.expirations += 1
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        """Remove an entry and release its bytes (lock held)"""
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    @staticmethod
+    def _estimate_size(key: str, value: Any) -> int:
+        """Approximate memory footprint of an entry"""
+        if hasattr(value, 'memory_usage'):
+            # pandas objects: the frame's own buffers, not the size of its text repr
+            usage = value.memory_usage(index=True)
+            return len(key) + int(usage.sum() if hasattr(usage, 'sum') else usage) + 64
+        try:
+            payload = len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            payload = sys.getsizeof(value)
+        return len(key) + payload + 64
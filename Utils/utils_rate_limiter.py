@@ -0,0 +1,211 @@
+"""
+Token-bucket rate limiting for TradeRiser vendor calls
+Buckets live in Redis (one hash per vendor, updated atomically by a Lua
+script using the Redis clock) so every worker process shares one budget.
+Without Redis each process keeps one local bucket per vendor, shared by
+every RateLimiter in the process (each APIClient has its own limiter, so
+per-instance buckets would multiply the budget). Components without an
+APIClient get a Redis-backed limiter from RateLimiter.from_env(). Callers
+either take a token without waiting (try_acquire), take what a batch can
+get in one round trip (try_acquire_up_to), or wait a bounded time
+(acquire) and get RateLimitExceeded instead of blocking a request thread
+indefinitely.
+"""
+import os
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Optional, Tuple
+
+# Refill the bucket for the elapsed time, then take tokens if available
+# (with ARGV[4] = 1, take as many whole tokens as are available instead).
+# Returns {tokens_taken, seconds_until_enough_tokens}.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local partial = tonumber(ARGV[4]) == 1
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+    allowed = requested
+else
+    wait = (requested - tokens) / rate
+    if partial then
+        allowed = math.floor(tokens)
+        tokens = tokens - allowed
+    end
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(wait)}
+"""
+
+
+class RateLimitExceeded(Exception):
+    """Raised when no token became available within the allowed wait"""
+
+    def __init__(self, vendor: str, retry_after: float):
+        super().__init__(f"Rate limit reached for {vendor}, retry in {retry_after:.1f}s")
+        self.vendor = vendor
+        self.retry_after = retry_after
+
+
+class _LocalBucket:
+    """In-process token bucket used without Redis"""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reconfigure(self, capacity: float, rate: float):
+        """Change the limits, keeping the tokens already spent"""
+        with self.lock:
+            self.capacity = capacity
+            self.rate = rate
+            self.tokens = min(self.tokens, capacity)
+
+    def take(self, requested: float) -> Tuple[bool, float]:
+        """Take tokens if available; otherwise return the wait until they are"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= requested:
+                self.tokens -= requested
+                return True, 0.0
+            return False, (requested - self.tokens) / self.rate
+
+    def take_up_to(self, requested: int) -> int:
+        """Take as many whole tokens as are available, up to requested"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            granted = min(requested, int(self.tokens))
+            self.tokens -= granted
+            return granted
+
+
+# Process-wide local buckets by vendor name
+_local_buckets: Dict[str, _LocalBucket] = {}
+_local_buckets_lock = threading.Lock()
+
+
+def _local_bucket(name: str, capacity: float, rate: float) -> _LocalBucket:
+    """The process's bucket for a vendor, created or reconfigured to the given limits"""
+    with _local_buckets_lock:
+        bucket = _local_buckets.get(name)
+        if bucket is None:
+            bucket = _local_buckets[name] = _LocalBucket(capacity, rate)
+        elif (bucket.capacity, bucket.rate) != (capacity, rate):
+            bucket.reconfigure(capacity, rate)
+        return bucket
+
+
+class RateLimiter:
+    """Named token buckets shared across processes through Redis"""
+
+    def __init__(self, redis_client=None, max_wait: float = None, background_max_wait: float = None):
+        """Initialize with optional Redis client and wait bounds (seconds)"""
+        self.logger = logging.getLogger(__name__)
+        self.redis = redis_client
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv('RATE_LIMIT_MAX_WAIT', 2))
+        self.background_max_wait = (background_max_wait if background_max_wait is not None
+                                    else float(os.getenv('RATE_LIMIT_BACKGROUND_WAIT', 60)))
+        self._script = redis_client.register_script(_TOKEN_BUCKET_SCRIPT) if redis_client else None
+        self._limits: Dict[str, Tuple[float, float]] = {}
+        self._local: Dict[str, _LocalBucket] = {}
+        self._context = threading.local()
+
+    @classmethod
+    def from_env(cls, **kwargs) -> 'RateLimiter':
+        """Limiter on the Redis at REDIS_HOST/REDIS_PORT/REDIS_DB, or on process-local buckets without it"""
+        try:
+            import redis
+            client = redis.Redis(host=os.getenv('REDIS_HOST', 'localhost'), port=int(os.getenv('REDIS_PORT', 6379)),
+                                 db=int(os.getenv('REDIS_DB', 0)), decode_responses=True)
+            client.ping()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Redis unavailable for rate limiting, using local buckets: {str(e)}")
+            client = None
+        return cls(client, **kwargs)
+
+    def configure(self, name: str, calls: int, period: float):
+        """Allow `calls` per `period` seconds for a vendor, with bursts up to `calls`"""
+        self._limits[name] = (float(calls), calls / float(period))
+        self._local[name] = _local_bucket(name, float(calls), calls / float(period))
+
+    def try_acquire(self, name: str, tokens: int = 1) -> Tuple[bool, float]:
+        """Take a token without waiting; returns (acquired, retry_after_seconds)"""
+        capacity, rate = self._limits[name]
+        if self._script is not None:
+            try:
+                allowed, wait = self._script(keys=[f"ratelimit:{name}"], args=[capacity, rate, tokens, 0])
+                return int(allowed) > 0, float(wait)
+            except Exception as e:
+                self.logger.warning(f"Shared rate limiter unavailable for {name}, using local bucket: {str(e)}")
+        return self._local[name].take(tokens)
+
+    def try_acquire_up_to(self, name: str, tokens: int) -> int:
+        """Take up to `tokens` without waiting in one round trip; returns how many were granted"""
+        if tokens <= 0:
+            return 0
+        capacity, rate = self._limits[name]
+        if self._script is not None:
+            try:
+                granted, _ = self._script(keys=[f"ratelimit:{name}"], args=[capacity, rate, tokens, 1])
+                return int(granted)
+            except Exception as e:
+                self.logger.warning(f"Shared rate limiter unavailable for {name}, using local bucket: {str(e)}")
+        return self._local[name].take_up_to(tokens)
+
+    def acquire(self, name: str, timeout: Optional[float] = None, tokens: int = 1):
+        """Wait up to timeout for a token, else raise RateLimitExceeded"""
+        timeout = self._default_wait() if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            acquired, retry_after = self.try_acquire(name, tokens)
+            if acquired:
+                return
+            remaining = deadline - time.monotonic()
+            if retry_after > remaining:
+                raise RateLimitExceeded(name, retry_after)
+            time.sleep(max(retry_after, 0.01))
+
+    @contextmanager
+    def background(self):
+        """Let waits in this thread use the longer background bound (queued work)"""
+        previous = getattr(self._context, 'background', False)
+        self._context.background = True
+        try:
+            yield
+        finally:
+            self._context.background = previous
+
+    def _default_wait(self) -> float:
+        """Wait bound for the current thread"""
+        return self.background_max_wait if getattr(self._context, 'background', False) else self.max_wait
+
+
+def rate_limited(name: str):
+    """Decorate a method of an object with a `rate_limiter` to take a token per call"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            self.rate_limiter.acquire(name)
+            return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,48 @@
+"""
+Request payload normalization for TradeRiser
+Produces a canonical form of a JSON request body (sorted keys, trimmed
+strings, upper-cased ticker symbols) and a stable hash of it, so requests
+that differ only in formatting are recognised as the same work. With
+sort_tickers, ticker lists are also put in sorted order unless the payload
+pairs them positionally with a weights/holdings list.
+"""
+import json
+import hashlib
+from typing import Any
+
+# Payload fields whose values (or, for holdings, keys) are ticker symbols
+TICKER_FIELDS = ('tickers', 'etf_tickers', 'symbols', 'holdings')
+# List fields whose items line up by position with a ticker list
+POSITIONAL_FIELDS = ('weights', 'holdings')
+
+
+def normalize_payload(payload: Any, sort_tickers: bool = False, _field: str = None) -> Any:
+    """Canonical copy of a JSON payload"""
+    if isinstance(payload, dict):
+        if any(isinstance(payload.get(field), list) for field in POSITIONAL_FIELDS):
+            sort_tickers = False
+        normalized = {}
+        for key in sorted(payload, key=str):
+            value = normalize_payload(payload[key], sort_tickers, key)
+            if _field in TICKER_FIELDS and isinstance(key, str):
+                key = key.strip().upper()
+            normalized[str(key)] = value
+        return normalized
+    if isinstance(payload, (list, tuple)):
+        items = [normalize_payload(item, sort_tickers, _field) for item in payload]
+        if sort_tickers and _field in TICKER_FIELDS and all(isinstance(item, str) for item in items):
+            items.sort()
+        return items
+    if isinstance(payload, str):
+        value = payload.strip()
+        return value.upper() if _field in TICKER_FIELDS else value
+    if isinstance(payload, float) and payload.is_integer():
+        return int(payload)
+    return payload
+
+
+def payload_hash(kind: str, payload: Any, sort_tickers: bool = False) -> str:
+    """Stable hash of a request kind and its normalized payload"""
+    canonical = json.dumps([kind, normalize_payload(payload, sort_tickers)], sort_keys=True,
+                           separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
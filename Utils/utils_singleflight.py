@@ -0,0 +1,109 @@
+"""
+Single-flight request coalescing for TradeRiser vendor calls
+Concurrent cache misses for the same key wait on one in-flight fetch,
+in-process through a shared call registry and across processes through a
+short Redis lock key.
+"""
+import time
+import uuid
+import threading
+import logging
+from typing import Any, Callable, Dict, Optional
+
+# In-process registry shared by every SingleFlight (and so every APIClient)
+_in_flight: Dict[str, '_Call'] = {}
+_registry_lock = threading.Lock()
+
+# Release the Redis lock only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class _Call:
+    """One in-flight fetch that followers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent loads of the same key into a single fetch"""
+
+    def __init__(self, redis_client=None, lock_ttl: float = 30.0, wait_timeout: float = 30.0,
+                 poll_interval: float = 0.1):
+        """Initialize with optional Redis client for cross-process coalescing"""
+        self.logger = logging.getLogger(__name__)
+        self.redis = redis_client
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._release = redis_client.register_script(_RELEASE_SCRIPT) if redis_client else None
+
+    def do(self, key: str, fn: Callable[[], Any], cache_probe: Callable[[], Any] = None) -> Any:
+        """Run fn once per key; concurrent callers share its result or exception"""
+        with _registry_lock:
+            call = _in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = _in_flight[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(self.wait_timeout):
+                self.logger.warning(f"Timed out waiting for in-flight fetch of {key}")
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_across_processes(key, fn, cache_probe)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with _registry_lock:
+                _in_flight.pop(key, None)
+            call.done.set()
+
+    def _run_across_processes(self, key: str, fn: Callable[[], Any], cache_probe: Callable[[], Any]) -> Any:
+        """Take the Redis lock or wait for the process holding it to fill the cache"""
+        if self.redis is None or cache_probe is None:
+            return fn()
+
+        lock_key = f"singleflight:{key}"
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.redis.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+        except Exception as e:
+            self.logger.warning(f"Single-flight lock unavailable for {key}: {str(e)}")
+            return fn()
+
+        if acquired:
+            try:
+                return fn()
+            finally:
+                try:
+                    self._release(keys=[lock_key], args=[token])
+                except Exception:
+                    pass  # Lock expires on its own
+
+        # Another process is fetching: wait for its result to land in the cache
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            value = cache_probe()
+            if value is not None:
+                return value
+            try:
+                if not self.redis.exists(lock_key):
+                    break  # Holder finished without caching (error) - fetch ourselves
+            except Exception:
+                break
+        return fn()
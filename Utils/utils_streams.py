@@ -0,0 +1,56 @@
+"""
+Capacity for long-lived streaming responses in TradeRiser
+Each open Server-Sent-Events response holds one server worker thread for
+as long as it stays open, so a process may only keep a fraction of its
+threads streaming: the cap is STREAM_MAX_CLIENTS, but never more than a
+quarter of SERVER_THREADS. The server entry points set SERVER_THREADS to
+the thread count they start with; when it is unset the cap assumes
+waitress's default of 4 threads. Clients refused a slot fall back to
+polling.
+"""
+import os
+import threading
+import logging
+from typing import Dict
+
+# Waitress's default thread count, the smallest pool the app is served with
+DEFAULT_SERVER_THREADS = 4
+# Share of the server threads that streams may hold
+STREAM_THREAD_SHARE = 4
+
+
+def stream_capacity(server_threads: int = None) -> int:
+    """Streams one process may hold open: STREAM_MAX_CLIENTS, at most a quarter of the server threads"""
+    threads = server_threads or int(os.getenv('SERVER_THREADS', DEFAULT_SERVER_THREADS))
+    configured = int(os.getenv('STREAM_MAX_CLIENTS', os.getenv('TICKER_STREAM_MAX_CLIENTS', 32)))
+    return max(1, min(configured, threads // STREAM_THREAD_SHARE))
+
+
+class StreamSlots:
+    """Per-process count of open streams against a fixed capacity"""
+
+    def __init__(self, capacity: int = None):
+        """Initialize with an explicit capacity, else one derived from the server threads"""
+        self.logger = logging.getLogger(__name__)
+        self.capacity = capacity or stream_capacity()
+        self._open = 0
+        self._lock = threading.Lock()
+        self.logger.info(f"Streaming responses capped at {self.capacity} per process")
+
+    def acquire(self) -> bool:
+        """Reserve a slot; False when the cap is reached"""
+        with self._lock:
+            if self._open >= self.capacity:
+                return False
+            self._open += 1
+            return True
+
+    def release(self):
+        """Release a slot"""
+        with self._lock:
+            self._open = max(0, self._open - 1)
+
+    def stats(self) -> Dict[str, int]:
+        """Open streams and capacity"""
+        with self._lock:
+            return {'open': self._open, 'capacity': self.capacity}
@@ -0,0 +1,202 @@
+"""ASGI entry point for TradeRiser.AI with async vendor-bound routes
+The quote and crypto endpoints spend almost all their time waiting on
+vendor APIs. Served from here they run as coroutines on one event loop
+and share a pooled aiohttp.ClientSession (ASYNC_MAX_CONNECTIONS connections),
+so a single worker holds hundreds of in-flight vendor calls instead of
+one per thread. Every other route is the unchanged Flask app, run
+through asgiref's WSGI adapter.
+
+Run with:  uvicorn async_app:app --host 0.0.0.0 --port 8000
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import aiohttp
+from asgiref.wsgi import WsgiToAsgi
+
+from utils_shared import setup_logging
+from response_cache import FRESHNESS_TTLS
+from new_traderiser_platform import (app as flask_app, quote_service, response_cache, coingecko_coin_id,
+                                     coingecko_price_url, coingecko_history_url, score_crypto_recommendation,
+                                     crypto_holding, crypto_position, summarize_crypto_portfolio)
+
+# Setup centralized logging
+setup_logging()
+logger = logging.getLogger(__name__)
+
+ASYNC_MAX_CONNECTIONS = int(os.getenv('ASYNC_MAX_CONNECTIONS', 500))
+
+
+class AsyncPlatform:
+    """ASGI app: native async handlers for I/O-bound routes, Flask for the rest"""
+
+    def __init__(self, wsgi_app):
+        """Wrap the Flask app and register the async routes"""
+        self.wsgi = WsgiToAsgi(wsgi_app)
+        self.client: Optional[aiohttp.ClientSession] = None
+        self.routes = {
+            ('GET', '/api/quotes'): self.quotes,
+            ('POST', '/api/crypto/analyze'): self.analyze_crypto
+        }
+
+    async def __call__(self, scope, receive, send):
+        """ASGI entry point"""
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        handler = self.routes.get((scope.get('method'), scope.get('path'))) if scope['type'] == 'http' else None
+        if handler is None:
+            return await self.wsgi(scope, receive, send)
+        try:
+            status, body, headers = await handler(scope, receive)
+        except Exception as e:
+            logger.error(f"Async route {scope['path']} failed: {str(e)}")
+            status, body, headers = 500, flask_app.json.dumps({'error': str(e)}), {}
+        await self._send_json(send, status, body, headers)
+
+    def get_client(self) -> aiohttp.ClientSession:
+        """Shared async HTTP session, created on first use inside the event loop"""
+        if self.client is None or self.client.closed:
+            self.client = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=ASYNC_MAX_CONNECTIONS, limit_per_host=ASYNC_MAX_CONNECTIONS,
+                                               ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+            logger.info(f"Async HTTP session created ({ASYNC_MAX_CONNECTIONS} connections)")
+        return self.client
+
+    async def quotes(self, scope, receive) -> Tuple[int, str, Dict]:
+        """GET /api/quotes?symbols=... on the event loop"""
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        symbols = [s for s in ','.join(query.get('symbols', [])).split(',') if s.strip()]
+        if not symbols:
+            return 400, flask_app.json.dumps({'error': 'No symbols provided'}), {}
+        if len(symbols) > quote_service.max_symbols:
+            return 400, flask_app.json.dumps({'error': f'At most {quote_service.max_symbols} symbols per request'}), {}
+        try:
+            return 200, flask_app.json.dumps(await quote_service.get_quotes_async(symbols, self.get_client())), {}
+        except Exception as e:
+            logger.error(f"Quotes API error: {str(e)}")
+            return 500, flask_app.json.dumps({'error': 'Failed to fetch quotes'}), {}
+
+    async def analyze_crypto(self, scope, receive) -> Tuple[int, str, Dict]:
+        """POST /api/crypto/analyze with concurrent CoinGecko calls and the shared response cache"""
+        try:
+            data = json.loads(await self._read_body(receive) or b'null')
+        except ValueError as e:
+            return 200, flask_app.json.dumps({'error': str(e)}), {}
+        if not isinstance(data, dict):
+            return 200, flask_app.json.dumps({'error': 'Request body must be a JSON object'}), {}
+
+        key = response_cache.key_for('crypto-analyze', data)
+        if 'no-cache' not in self._header(scope, b'cache-control'):
+            entry = response_cache.get(key)
+            if entry is not None:
+                return 200, entry['body'], {'X-Cache': 'HIT', 'Age': str(int(time.time() - entry['stored_at']))}
+
+        symbols = data.get('symbols', [])
+        holdings = data.get('holdings', [])
+        if not symbols:
+            return 200, flask_app.json.dumps({'error': 'No crypto symbols provided'}), {'X-Cache': 'MISS'}
+
+        # Price all holdings concurrently under one request deadline
+        client = self.get_client()
+        tasks = [asyncio.ensure_future(self._crypto_position(client, symbol, holdings, i))
+                 for i, symbol in enumerate(symbols)]
+        done, _ = await asyncio.wait(tasks, timeout=float(os.getenv('FANOUT_DEADLINE_SECONDS', 15)))
+        results, pending = {}, []
+        for i, task in enumerate(tasks):
+            if task in done:
+                results[i] = task.result()
+            else:
+                task.cancel()
+                pending.append(i)
+
+        body = summarize_crypto_portfolio(symbols, results, pending)
+        text = flask_app.json.dumps(body)
+        if response_cache.enabled and response_cache.cacheable(body):
+            response_cache.put(key, text, FRESHNESS_TTLS['quotes'])
+        return 200, text, {'X-Cache': 'MISS' if response_cache.enabled else 'BYPASS'}
+
+    async def _crypto_position(self, client: aiohttp.ClientSession, symbol: str, holdings: List, i: int) -> tuple:
+        """Price the i-th holding; returns (data, None) or (None, error message), as the Flask route does"""
+        try:
+            coin_id = coingecko_coin_id(symbol)
+            async with client.get(coingecko_price_url(coin_id)) as response:
+                if response.status != 200:
+                    return None, f'Failed to fetch data for {symbol}'
+                price_data = await response.json(content_type=None)
+            if coin_id not in price_data:
+                return None, f'Cryptocurrency {symbol} not found'
+
+            current_price = price_data[coin_id]['usd']
+            change_24h = price_data[coin_id].get('usd_24h_change', 0)
+            try:
+                async with client.get(coingecko_history_url(coin_id)) as history_response:
+                    history = await history_response.json(content_type=None) if history_response.status == 200 else None
+                recommendation = score_crypto_recommendation(current_price, change_24h, symbol.upper(), history)
+            except Exception as e:
+                logger.error(f"Error generating recommendation for {symbol}: {e}")
+                recommendation = {'action': 'HOLD', 'confidence': 50,
+                                  'reasoning': 'Unable to analyze market data', 'score': 0}
+            return crypto_position(current_price, change_24h, crypto_holding(holdings, i), recommendation), None
+        except Exception as e:
+            return None, f'Error fetching data for {symbol}: {str(e)}'
+
+    async def _lifespan(self, receive, send):
+        """Create the HTTP session on startup and close it on shutdown"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.get_client()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.client is not None:
+                    await self.client.close()
+                    self.client = None
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        """Read the full request body"""
+        chunks: List[bytes] = []
+        while True:
+            message = await receive()
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    @staticmethod
+    def _header(scope, name: bytes) -> str:
+        """Value of a request header, or ''"""
+        for key, value in scope.get('headers', []):
+            if key.lower() == name:
+                return value.decode('latin-1')
+        return ''
+
+    @staticmethod
+    async def _send_json(send, status: int, body: str, headers: Dict):
+        """Send a JSON response with the same security/CORS headers as the Flask app"""
+        payload = body.encode('utf-8') if isinstance(body, str) else body
+        response_headers = {
+            'Content-Type': 'application/json',
+            'Content-Length': str(len(payload)),
+            'Access-Control-Allow-Origin': '*',
+            'X-Content-Type-Options': 'nosniff',
+            'X-Frame-Options': 'DENY',
+            'X-XSS-Protection': '1; mode=block',
+            **headers
+        }
+        if os.getenv('FLASK_ENV') == 'production':
+            response_headers['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in response_headers.items()]})
+        await send({'type': 'http.response.body', 'body': payload})
+
+
+app = AsyncPlatform(flask_app)
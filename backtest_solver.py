@@ -38,22 +38,33 @@ class BacktestSolver:
             sectors = {i['symbol']: i['sector'] for i in instruments}
             unique_sectors = set(sectors.values()) - {'Unknown'}
 
-            # Fetch data for each instrument
+            # Fetch data for each instrument, reading all cached entries in one round trip
             returns = {}
             volatilities = {}
+            crypto_db = self.finance_database.symbol_database['CRYPTO']
+            coin_ids = {i['symbol']: crypto_db.get(i['symbol'], {}).get('coin_id', '')
+                        for i in instruments if i['category'] == 'CRYPTO'}
+            cache_keys = []
             for i in instruments:
-                symbol = i['symbol']
                 if i['category'] == 'CRYPTO':
-                    coin_id = self.finance_database.symbol_database['CRYPTO'].get(symbol, {}).get('coin_id', '')
-                    if coin_id:
-                        data = self.api_client.get_coingecko_data(coin_id)
-                        returns[symbol] = data.get('price_change_24h', 0) / 100
-                        volatilities[symbol] = abs(data.get('price_change_24h', 0)) / 100
+                    if coin_ids[i['symbol']]:
+                        cache_keys.append(f"coingecko:{coin_ids[i['symbol']]}")
                 else:
-                    quote = self.api_client.get_alpha_vantage_quote(symbol)
-                    fundamentals = self.api_client.get_alpha_vantage_fundamentals(symbol)
-                    returns[symbol] = quote.get('change_percent', 0) / 100
-                    volatilities[symbol] = fundamentals.get('beta', 1.0)
+                    cache_keys.extend([f"quote:{i['symbol']}", f"fundamental:{i['symbol']}"])
+            with self.api_client.prewarm_cache(cache_keys):
+                for i in instruments:
+                    symbol = i['symbol']
+                    if i['category'] == 'CRYPTO':
+                        coin_id = coin_ids[symbol]
+                        if coin_id:
+                            data = self.api_client.get_coingecko_data(coin_id)
+                            returns[symbol] = data.get('price_change_24h', 0) / 100
+                            volatilities[symbol] = abs(data.get('price_change_24h', 0)) / 100
+                    else:
+                        quote = self.api_client.get_alpha_vantage_quote(symbol)
+                        fundamentals = self.api_client.get_alpha_vantage_fundamentals(symbol)
+                        returns[symbol] = quote.get('change_percent', 0) / 100
+                        volatilities[symbol] = fundamentals.get('beta', 1.0)
 
             # Objective: Maximize expected return
             solver.Maximize(solver.Sum(x[symbol] * returns[symbol] for symbol in x))
@@ -7,6 +7,7 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from utils_shared import AnalysisBase, TechnicalIndicators, DataProcessor, ErrorHandler, setup_logging
+from market_data_service import get_market_data_service
 
 # Setup centralized logging
 setup_logging()
@@ -19,12 +20,12 @@ class BaseAnalyzer(AnalysisBase):
         super().__init__(analyzer_name)
         self.data_processor = DataProcessor()
         self.error_handler = ErrorHandler()
+        self.market_data = get_market_data_service()
         
     def fetch_stock_data(self, ticker: str, period: str = "1y") -> Optional[pd.DataFrame]:
-        """Fetch stock data using yfinance with error handling"""
+        """Fetch stock data from the shared market data service with error handling"""
         try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period=period)
+            hist = self.market_data.get_ticker_history(ticker, period=period)
             
             if hist.empty:
                 self.logger.warning(f"No data available for {ticker}")
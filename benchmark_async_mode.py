@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Threaded vs async serving benchmark for TradeRiser vendor-bound endpoints
+Starts a stub CoinGecko API that answers after a fixed latency, then runs
+the platform twice against it: the Flask app under waitress (one thread
+per in-flight request) and async_app under uvicorn (one event loop).
+Both are loaded with the same number of concurrent POST /api/crypto/analyze
+clients and the requests/sec and latency percentiles are compared.
+
+Usage:  python benchmark_async_mode.py [--concurrency 200] [--latency 0.25]
+        [--duration 15] [--threads 32] [--symbols BTC,ETH,SOL]
+"""
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+from typing import Dict, List
+
+import aiohttp
+
+STUB_HISTORY_POINTS = 8
+
+
+def free_port() -> int:
+    """An unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def serve_stub(port: int, latency: float):
+    """Minimal keep-alive HTTP/1.1 server imitating the CoinGecko endpoints used by the platform"""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                path = head.split(b' ', 2)[1].decode('latin-1')
+                await asyncio.sleep(latency)
+                coin_id = path.split('ids=')[1].split('&')[0] if 'ids=' in path else path.split('/')[2]
+                if path.startswith('/simple/price'):
+                    body = {coin_id: {'usd': 100.0, 'usd_24h_change': 1.5}}
+                else:
+                    body = {'prices': [[i, 95.0 + i] for i in range(STUB_HISTORY_POINTS)]}
+                payload = json.dumps(body).encode('utf-8')
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                             b'Content-Length: ' + str(len(payload)).encode() + b'\r\n\r\n' + payload)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, IndexError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', port, backlog=4096)
+    async with server:
+        await server.serve_forever()
+
+
+def start_server(mode: str, port: int, stub_port: int, threads: int) -> subprocess.Popen:
+    """Start the platform in threaded (waitress) or async (uvicorn) mode"""
+    env = dict(os.environ,
+               COINGECKO_API_URL=f"http://127.0.0.1:{stub_port}",
+               RESPONSE_CACHE_ENABLED='false',
+               CACHE_WARMUP='false',
+               FINANCEDATABASE_WARMUP='off',
+               FANOUT_POOL_SIZE=str(threads * 2),
+               HTTP_POOL_SIZE=str(threads * 2))
+    if mode == 'threaded':
+        code = ("from waitress import serve; from new_traderiser_platform import app; "
+                f"serve(app, host='127.0.0.1', port={port}, threads={threads}, backlog=4096, _quiet=True)")
+        command = [sys.executable, '-c', code]
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'async_app:app', '--host', '127.0.0.1', '--port', str(port),
+                   '--log-level', 'warning', '--backlog', '4096']
+    return subprocess.Popen(command, env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_until_up(port: int, timeout: float = 90.0):
+    """Poll /health until the server answers"""
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=2)) as client:
+        while time.monotonic() < deadline:
+            try:
+                async with client.get(f"http://127.0.0.1:{port}/health") as response:
+                    if response.status == 200:
+                        return
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"Server on port {port} did not start within {timeout:.0f}s")
+
+
+async def load(port: int, concurrency: int, duration: float, symbols: List[str]) -> Dict:
+    """Run concurrent clients against the crypto endpoint for duration seconds"""
+    url = f"http://127.0.0.1:{port}/api/crypto/analyze"
+    latencies, errors = [], 0
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency),
+                                     timeout=aiohttp.ClientTimeout(total=60)) as client:
+        end = time.monotonic() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < end:
+                started = time.monotonic()
+                try:
+                    async with client.post(url, json={'symbols': symbols}) as response:
+                        body = await response.json(content_type=None)
+                    if response.status != 200 or 'error' in body:
+                        errors += 1
+                        continue
+                    latencies.append(time.monotonic() - started)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    errors += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed,
+        'p50': latencies[len(latencies) // 2] if latencies else float('nan'),
+        'p95': latencies[int(len(latencies) * 0.95)] if latencies else float('nan')
+    }
+
+
+def run_mode(mode: str, stub_port: int, args) -> Dict:
+    """Start one server mode, warm it up, load it and stop it"""
+    port = free_port()
+    process = start_server(mode, port, stub_port, args.threads)
+    try:
+        asyncio.run(wait_until_up(port))
+        asyncio.run(load(port, min(args.concurrency, 10), 2, args.symbols))  # Warm connection pools
+        return asyncio.run(load(port, args.concurrency, args.duration, args.symbols))
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare threaded and async serving of vendor-bound endpoints')
+    parser.add_argument('--concurrency', type=int, default=200, help='Concurrent clients')
+    parser.add_argument('--latency', type=float, default=0.25, help='Stub vendor latency (seconds)')
+    parser.add_argument('--duration', type=float, default=15, help='Seconds of load per mode')
+    parser.add_argument('--threads', type=int, default=32, help='Waitress threads in threaded mode')
+    parser.add_argument('--symbols', type=lambda s: s.split(','), default=['BTC', 'ETH', 'SOL'],
+                        help='Crypto symbols per request')
+    parser.add_argument('--stub-port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stub_port:
+        asyncio.run(serve_stub(args.stub_port, args.latency))
+        return
+
+    stub_port = free_port()
+    stub = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--stub-port', str(stub_port),
+                             '--latency', str(args.latency)])
+    try:
+        print(f"Stub vendor latency {args.latency * 1000:.0f} ms, {len(args.symbols)} symbols/request "
+              f"(2 vendor calls each), {args.concurrency} concurrent clients, {args.duration:.0f}s per mode, "
+              f"{args.threads} waitress threads")
+        results = {mode: run_mode(mode, stub_port, args) for mode in ('threaded', 'async')}
+    finally:
+        stub.terminate()
+        stub.wait(timeout=10)
+
+    print(f"\n{'mode':<10}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for mode, result in results.items():
+        print(f"{mode:<10}{result['requests']:>10}{result['errors']:>8}{result['rps']:>10.1f}"
+              f"{result['p50'] * 1000:>10.0f}{result['p95'] * 1000:>10.0f}")
+    if results['threaded']['rps']:
+        print(f"\nAsync mode: {results['async']['rps'] / results['threaded']['rps']:.1f}x the threaded throughput")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Memory and filter benchmark for the columnar instrument universe
+Builds the US equity and ETF universe twice from the same FinanceDatabase
+selections: as the old dict of dicts (one dict per instrument) and as an
+InstrumentUniverse (categorical/numeric columns plus a symbol index). It
+reports the memory each representation retains (tracemalloc) and the time
+of a "US tech with options" screen and of single-symbol lookups.
+Without financedatabase installed a synthetic universe of the same shape
+is used.
+
+Usage:  python benchmark_instrument_universe.py [--equities 24000] [--etfs 3000] [--synthetic]
+"""
+import gc
+import time
+import random
+import string
+import argparse
+import tracemalloc
+from typing import Callable, Dict
+
+import pandas as pd
+
+from instrument_universe import InstrumentUniverse
+
+SECTORS = ['Information Technology', 'Health Care', 'Financials', 'Industrials', 'Consumer Discretionary',
+           'Energy', 'Materials', 'Utilities', 'Real Estate', 'Communication Services', 'Consumer Staples']
+MARKET_CAPS = ['Mega Cap', 'Large Cap', 'Mid Cap', 'Small Cap', 'Micro Cap', 'Nano Cap']
+WORDS = ['Global', 'Energy', 'Capital', 'Holdings', 'Systems', 'Therapeutics', 'Bancorp', 'Industries',
+         'Technologies', 'Resources', 'Partners', 'Group', 'Trust', 'Pharmaceuticals', 'Networks']
+
+
+def synthetic_frames(equities: int, etfs: int, seed: int = 11) -> Dict[str, pd.DataFrame]:
+    """FinanceDatabase-shaped selections; every cell is its own string object, as read_csv produces"""
+    rng = random.Random(seed)
+    symbols = set()
+    while len(symbols) < equities + etfs:
+        symbols.add(''.join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(1, 5))))
+    symbols = sorted(symbols)
+    industries = [f"{sector} {i}" for sector in SECTORS for i in range(12)]
+    # ''.join copies each label so cells do not share one string object
+    equity_rows = {
+        symbol: {
+            'name': ' '.join(rng.choice(WORDS) for _ in range(3)) + ' Inc.',
+            'sector': ''.join(rng.choice(SECTORS)),
+            'industry': ''.join(rng.choice(industries)),
+            'country': ''.join('United States'),
+            'market_cap': ''.join(rng.choice(MARKET_CAPS)),
+            'has_options': True
+        } for symbol in symbols[:equities]
+    }
+    etf_rows = {
+        symbol: {
+            'name': 'iShares ' + ' '.join(rng.choice(WORDS) for _ in range(2)) + ' ETF',
+            'category': ''.join(rng.choice(SECTORS)),
+            'family': ''.join(rng.choice(['iShares', 'Vanguard', 'SPDR', 'Invesco', 'Schwab'])),
+            'expense_ratio': round(rng.uniform(0.03, 0.95), 2),
+            'total_assets': rng.uniform(1e6, 5e11)
+        } for symbol in symbols[equities:]
+    }
+    return {'US_STOCKS': pd.DataFrame.from_dict(equity_rows, orient='index'),
+            'ETFS': pd.DataFrame.from_dict(etf_rows, orient='index')}
+
+
+def financedatabase_frames() -> Dict[str, pd.DataFrame]:
+    """The real US equity and ETF selections"""
+    from financedatabase import Equities, ETFs
+    return {'US_STOCKS': Equities().select(country='United States').assign(has_options=True),
+            'ETFS': ETFs().select(country='United States')}
+
+
+def dict_of_dicts(frames: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, Dict]]:
+    """The original symbol_database layout"""
+    fields = {'US_STOCKS': ('name', 'sector', 'industry', 'market_cap', 'country', 'has_options'),
+              'ETFS': ('name', 'category', 'family', 'expense_ratio', 'total_assets')}
+    database = {}
+    for asset_class, frame in frames.items():
+        records = frame.astype(object).where(frame.notna(), '').to_dict('index')
+        database[asset_class] = {symbol: {field: row.get(field, '') for field in fields[asset_class]}
+                                 for symbol, row in records.items()}
+    return database
+
+
+def retained_mb(load_frames: Callable[[], Dict[str, pd.DataFrame]], build: Callable) -> tuple:
+    """(result, MB still allocated once the source frames are released)"""
+    gc.collect()
+    tracemalloc.start()
+    frames = load_frames()
+    result = build(frames)
+    del frames
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 1024 / 1024
+
+
+def timed_ms(func: Callable, repeat: int) -> float:
+    """Average milliseconds per call"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare dict-of-dicts and columnar instrument universes')
+    parser.add_argument('--equities', type=int, default=24000, help='Synthetic US equities')
+    parser.add_argument('--etfs', type=int, default=3000, help='Synthetic US ETFs')
+    parser.add_argument('--synthetic', action='store_true', help='Skip FinanceDatabase even when installed')
+    args = parser.parse_args()
+
+    load_frames = lambda: synthetic_frames(args.equities, args.etfs)  # noqa: E731
+    source = 'synthetic'
+    if not args.synthetic:
+        try:
+            import financedatabase  # noqa: F401
+            load_frames, source = financedatabase_frames, 'FinanceDatabase'
+        except ImportError:
+            pass
+
+    database, dict_mb = retained_mb(load_frames, dict_of_dicts)
+    universe, columnar_mb = retained_mb(load_frames, InstrumentUniverse)
+    instruments = len(universe)
+    print(f"{source} universe: {instruments} instruments")
+    print(f"\n{'representation':<16}{'retained MB':>12}{'bytes/instrument':>18}")
+    print(f"{'dict of dicts':<16}{dict_mb:>12.1f}{dict_mb * 1024 * 1024 / instruments:>18.0f}")
+    print(f"{'columnar':<16}{columnar_mb:>12.1f}{columnar_mb * 1024 * 1024 / instruments:>18.0f}")
+    print(f"Columnar uses {columnar_mb / dict_mb:.0%} of the dict-of-dicts memory")
+
+    def scan():
+        return [symbol for symbol, info in database['US_STOCKS'].items()
+                if info['country'] == 'United States' and info['sector'] == 'Information Technology'
+                and info['has_options']]
+
+    def vectorized():
+        return universe.symbols_where(asset_class='US_STOCKS', country='United States',
+                                      sector='Information Technology', has_options=True)
+
+    assert sorted(scan()) == sorted(vectorized())
+    symbols = universe.symbols[:1000].tolist()
+    print(f"\n{'operation':<34}{'dict ms':>10}{'columnar ms':>14}")
+    print(f"{'US tech with options screen':<34}{timed_ms(scan, 20):>10.2f}{timed_ms(vectorized, 20):>14.2f}")
+    lookups_dict = timed_ms(lambda: [database['US_STOCKS'].get(s) for s in symbols], 20)
+    lookups_columnar = timed_ms(lambda: [universe.row(s) for s in symbols], 20)
+    print(f"{'1000 symbol lookups':<34}{lookups_dict:>10.2f}{lookups_columnar:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Search latency benchmark for the instrument index and security search
+Builds an InstrumentIndex (/api/symbols/search) and a SecuritySearchEngine
+(/api/search-securities, /api/autocomplete) over the same US equity and
+ETF selections and reports the average milliseconds per query for exact,
+prefix, substring and misspelled queries. The index targets under 1 ms
+per search and the search engine the autocomplete budget
+(AUTOCOMPLETE_BUDGET_MS). Without financedatabase installed the synthetic
+universe from benchmark_instrument_universe is used.
+
+Usage:  python benchmark_search.py [--equities 24000] [--etfs 3000] [--repeat 50] [--synthetic]
+"""
+import os
+import time
+import argparse
+
+import pandas as pd
+
+from instrument_index import InstrumentIndex
+from security_search import SecuritySearchEngine
+from benchmark_instrument_universe import synthetic_frames, financedatabase_frames, timed_ms
+
+INDEX_QUERIES = ['a', 'ab', 'abc', 'energy', 'olding', 'apital gro', 'zzzzz']
+SEARCH_QUERIES = ['aapl', 'app', 'energy', 'globl holdngs', 'therapeutcs', 'bank of amer', 'zzzzz']
+INDEX_TARGET_MS = 1.0
+
+
+def build_timed(build) -> tuple:
+    """(result, seconds taken to build it)"""
+    started = time.perf_counter()
+    result = build()
+    return result, time.perf_counter() - started
+
+
+def report(title: str, search, queries, repeat: int, target_ms: float):
+    """Print the average latency of each query against a target"""
+    print(f"\n{title}")
+    print(f"{'query':<18}{'results':>8}{'ms/search':>12}")
+    worst = 0.0
+    for query in queries:
+        ms = timed_ms(lambda: search(query), repeat)
+        worst = max(worst, ms)
+        print(f"{query:<18}{len(search(query)):>8}{ms:>12.3f}")
+    print(f"Slowest query {worst:.3f} ms ({'within' if worst < target_ms else 'over'} the {target_ms:g} ms target)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark instrument index and security search latency')
+    parser.add_argument('--equities', type=int, default=24000, help='Synthetic US equities')
+    parser.add_argument('--etfs', type=int, default=3000, help='Synthetic US ETFs')
+    parser.add_argument('--repeat', type=int, default=50, help='Searches per query')
+    parser.add_argument('--synthetic', action='store_true', help='Skip FinanceDatabase even when installed')
+    args = parser.parse_args()
+
+    frames = None
+    source = 'synthetic'
+    if not args.synthetic:
+        try:
+            frames, source = financedatabase_frames(), 'FinanceDatabase'
+        except ImportError:
+            pass
+    if frames is None:
+        frames = synthetic_frames(args.equities, args.etfs)
+    combined = pd.concat(frames.values())
+    combined = combined[~combined.index.duplicated()]
+
+    index, index_seconds = build_timed(lambda: InstrumentIndex(
+        (category, symbol, name) for category, frame in frames.items()
+        for symbol, name in frame['name'].fillna('').items()))
+    engine, engine_seconds = build_timed(lambda: SecuritySearchEngine.from_frame(combined))
+    print(f"{source} universe: {len(combined)} instruments")
+    print(f"Built instrument index in {index_seconds:.2f}s, security search engine in {engine_seconds:.2f}s")
+
+    report('InstrumentIndex.search (limit 50)', lambda query: index.search(query, limit=50),
+           INDEX_QUERIES, args.repeat, INDEX_TARGET_MS)
+    budget_ms = float(os.getenv('AUTOCOMPLETE_BUDGET_MS', 25))
+    report('SecuritySearchEngine.search (limit 10)', lambda query: engine.search(query, 10),
+           SEARCH_QUERIES, args.repeat, budget_ms)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""Pre-traffic cache warmup for TradeRiser.AI
+After a deploy the popular symbols (top tickers, the ETF, commodities and
+crypto universes) are fetched once in a background thread so the first
+users don't pay every cold vendor call. Each step's symbols are warmed in
+batches paced by a token bucket, progress is tracked per step, and the
+warmer reports ready once every step has finished or the time budget
+(CACHE_WARMUP_MAX_SECONDS) is spent.
+"""
+import os
+import time
+import threading
+import logging
+from typing import Callable, Dict, List, Optional
+
+from utils_shared import setup_logging
+from Utils.utils_rate_limiter import RateLimiter, RateLimitExceeded
+
+# Setup centralized logging
+setup_logging()
+
+
+class WarmupStep:
+    """One named group of symbols and the function that warms a batch of them"""
+
+    def __init__(self, name: str, symbols: Callable[[], List[str]], warm: Callable[[List[str]], int]):
+        self.name = name
+        self.symbols = symbols
+        self.warm = warm
+        self.status = 'pending'
+        self.total = 0
+        self.warmed = 0
+        self.failed = 0
+        self.elapsed = 0.0
+        self.error = None
+
+    def to_dict(self) -> Dict:
+        """Progress metrics for this step"""
+        data = {
+            'status': self.status,
+            'total': self.total,
+            'warmed': self.warmed,
+            'failed': self.failed,
+            'elapsed_seconds': round(self.elapsed, 2)
+        }
+        if self.error:
+            data['error'] = self.error
+        return data
+
+
+class CacheWarmer:
+    """Runs warmup steps once per process in a background thread"""
+
+    def __init__(self, enabled: bool = None, batch_size: int = None, batches_per_minute: int = None,
+                 max_seconds: float = None, only: Optional[List[str]] = None):
+        """Initialize from arguments or CACHE_WARMUP_* settings"""
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled if enabled is not None else os.getenv('CACHE_WARMUP', 'true').lower() == 'true'
+        self.batch_size = batch_size or int(os.getenv('CACHE_WARMUP_BATCH_SIZE', 25))
+        self.max_seconds = max_seconds or float(os.getenv('CACHE_WARMUP_MAX_SECONDS', 300))
+        # Empty -> run every registered step
+        self.only = only if only is not None else [s.strip() for s in os.getenv('CACHE_WARMUP_STEPS', '').split(',')
+                                                   if s.strip()]
+        # Batches share one budget so a cold start never bursts past the vendors' limits
+        self.rate_limiter = RateLimiter(background_max_wait=self.max_seconds)
+        self.rate_limiter.configure('warmup',
+                                    batches_per_minute or int(os.getenv('CACHE_WARMUP_BATCHES_PER_MINUTE', 30)), 60)
+        self.steps: Dict[str, WarmupStep] = {}
+        self.state = 'idle' if self.enabled else 'disabled'
+        self.started_at = None
+        self.finished_at = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def add_step(self, name: str, symbols: Callable[[], List[str]], warm: Callable[[List[str]], int]):
+        """Register a step; symbols is called lazily, warm returns how many symbols it loaded"""
+        if not self.only or name in self.only:
+            self.steps[name] = WarmupStep(name, symbols, warm)
+
+    def start(self):
+        """Start the warmup thread once"""
+        if not self.enabled or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self.run, name='cache-warmer', daemon=True)
+        self._thread.start()
+
+    def run(self):
+        """Run every step in order within the time budget"""
+        self.state = 'running'
+        self.started_at = time.time()
+        deadline = time.monotonic() + self.max_seconds
+        self.logger.info(f"Cache warmup started: {', '.join(self.steps) or 'no steps'}")
+        with self.rate_limiter.background():
+            for step in self.steps.values():
+                if time.monotonic() >= deadline:
+                    step.status = 'skipped'
+                    continue
+                self._run_step(step, deadline)
+        self.finished_at = time.time()
+        self.state = 'timed_out' if time.monotonic() >= deadline else 'done'
+        self.logger.info(f"Cache warmup {self.state} in {self.finished_at - self.started_at:.1f}s: "
+                         + ', '.join(f"{s.name} {s.warmed}/{s.total}" for s in self.steps.values()))
+
+    def status(self) -> Dict:
+        """Overall state, readiness and per-step progress"""
+        running_for = (self.finished_at or time.time()) - self.started_at if self.started_at else 0.0
+        total = sum(s.total for s in self.steps.values())
+        warmed = sum(s.warmed for s in self.steps.values())
+        return {
+            'state': self.state,
+            'ready': self.state in ('done', 'timed_out', 'disabled'),
+            'progress': round(warmed / total, 3) if total else (1.0 if self.state == 'done' else 0.0),
+            'elapsed_seconds': round(running_for, 2),
+            'steps': {name: step.to_dict() for name, step in self.steps.items()}
+        }
+
+    def _run_step(self, step: WarmupStep, deadline: float):
+        """Warm one step's symbols batch by batch"""
+        started = time.monotonic()
+        step.status = 'running'
+        try:
+            symbols = list(dict.fromkeys(step.symbols()))
+        except Exception as e:
+            self.logger.error(f"Warmup step {step.name} could not list symbols: {str(e)}")
+            step.status, step.error = 'failed', str(e)
+            return
+        step.total = len(symbols)
+        for start in range(0, len(symbols), self.batch_size):
+            batch = symbols[start:start + self.batch_size]
+            try:
+                self.rate_limiter.acquire('warmup', timeout=max(0.0, deadline - time.monotonic()))
+            except RateLimitExceeded:
+                step.status = 'timed_out'
+                break
+            try:
+                warmed = step.warm(batch)
+                step.warmed += warmed
+                step.failed += len(batch) - warmed
+            except Exception as e:
+                self.logger.error(f"Warmup step {step.name} failed for {len(batch)} symbols: {str(e)}")
+                step.failed += len(batch)
+                step.error = str(e)
+            step.elapsed = time.monotonic() - started
+            self.logger.info(f"Warmup {step.name}: {step.warmed + step.failed}/{step.total} symbols "
+                             f"({step.failed} failed, {step.elapsed:.1f}s)")
+        if step.status == 'running':
+            step.status = 'done'
+        step.elapsed = time.monotonic() - started
@@ -1,12 +1,12 @@
 """Commodities Trading Module for TradeRiser.AI
 Handles gold, oil, agricultural products, and other commodities trading
 """
-import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from Utils.utils_api_client import APIClient
 from utils_shared import AnalysisBase, TechnicalIndicators, setup_logging
+from market_data_service import get_market_data_service
 import logging
 
 # Setup centralized logging
@@ -18,6 +18,7 @@ class CommoditiesTrader(AnalysisBase):
         super().__init__('CommoditiesTrader')
         self.api_client = APIClient()
         self.finance_database = finance_database
+        self.market_data = get_market_data_service()
         
         # Commodities universe with ETF symbols for easy trading
         self.commodities_universe = {
@@ -64,6 +65,9 @@ class CommoditiesTrader(AnalysisBase):
                 'recommendations': []
             }
             
+            # Bulk-download the whole universe before per-symbol analysis
+            self.market_data.prefetch(list(self.commodities_universe.keys()), period="1y")
+            
             for symbol, info in self.commodities_universe.items():
                 commodity_data = self._analyze_single_commodity(symbol, info)
                 if commodity_data:
@@ -105,9 +109,8 @@ class CommoditiesTrader(AnalysisBase):
     def _analyze_single_commodity(self, symbol: str, info: Dict) -> Optional[Dict]:
         """Analyze a single commodity ETF"""
         try:
-            # Get price data
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="1y")
+            # Get price data from the shared panel
+            hist = self.market_data.get_ticker_history(symbol, period="1y")
             
             if hist.empty:
                 return None
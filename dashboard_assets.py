@@ -0,0 +1,119 @@
+"""Precompiled dashboard assets for TradeRiser.AI
+The dashboard template has no dynamic content, so it is built once: the
+inline <style> and <script> blocks are split into content-fingerprinted
+CSS/JS files, and every asset (HTML included) is precompressed with gzip
+and, when the brotli package is installed, brotli. Responses carry strong
+ETags; fingerprinted files are cached as immutable for a year while the
+HTML is revalidated so new fingerprints are picked up after a deploy.
+
+Write the built files for a CDN/static host with:
+    python dashboard_assets.py --out static/dist
+"""
+import os
+import re
+import sys
+import gzip
+import hashlib
+import logging
+from typing import Dict, Optional
+
+from flask import Response
+from utils_shared import setup_logging
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+# Setup centralized logging
+setup_logging()
+
+ASSET_URL_PREFIX = '/assets/'
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+
+_STYLE_BLOCK = re.compile(r'<style>(.*?)</style>', re.S)
+_SCRIPT_BLOCK = re.compile(r'<script>(.*?)</script>', re.S)
+
+
+class _Asset:
+    """One built file with its precompressed encodings"""
+
+    def __init__(self, name: str, body: bytes, mimetype: str, cache_control: str):
+        self.name = name
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+        self.encodings: Dict[str, bytes] = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if BROTLI_AVAILABLE:
+            self.encodings['br'] = brotli.compress(body, quality=11)
+
+
+class DashboardAssets:
+    """Builds the dashboard once and serves it with negotiated precompressed encodings"""
+
+    def __init__(self, template: str):
+        """Split the template into fingerprinted CSS/JS and compress everything"""
+        self.logger = logging.getLogger(__name__)
+        self.assets: Dict[str, _Asset] = {}
+        html = template
+        html = self._extract(html, _STYLE_BLOCK, 'css', 'text/css',
+                             lambda url: f'<link rel="stylesheet" href="{url}">')
+        html = self._extract(html, _SCRIPT_BLOCK, 'js', 'application/javascript',
+                             lambda url: f'<script src="{url}"></script>')
+        # The page itself is revalidated so a deploy's new fingerprints are picked up
+        self.html = _Asset('index.html', html.encode('utf-8'), 'text/html', 'no-cache')
+        self.logger.info(f"Built dashboard: {len(self.assets)} assets, "
+                         f"{len(self.html.encodings['identity'])} -> {len(self.html.encodings['gzip'])} bytes gzip")
+
+    def page_response(self, request) -> Response:
+        """Response for the dashboard HTML"""
+        return self._respond(self.html, request)
+
+    def asset_response(self, name: str, request) -> Optional[Response]:
+        """Response for a fingerprinted asset, or None if unknown"""
+        asset = self.assets.get(name)
+        return self._respond(asset, request) if asset else None
+
+    def write(self, directory: str):
+        """Write the page, assets and their compressed variants for static hosting"""
+        os.makedirs(directory, exist_ok=True)
+        suffixes = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+        for asset in [self.html] + list(self.assets.values()):
+            for encoding, body in asset.encodings.items():
+                with open(os.path.join(directory, asset.name + suffixes[encoding]), 'wb') as f:
+                    f.write(body)
+
+    def _extract(self, html: str, pattern, extension: str, mimetype: str, tag) -> str:
+        """Move the first matching inline block into a fingerprinted asset"""
+        match = pattern.search(html)
+        if not match:
+            return html
+        body = match.group(1).strip().encode('utf-8')
+        name = f"dashboard.{hashlib.sha256(body).hexdigest()[:12]}.{extension}"
+        self.assets[name] = _Asset(name, body, mimetype, IMMUTABLE_CACHE)
+        return html[:match.start()] + tag(ASSET_URL_PREFIX + name) + html[match.end():]
+
+    def _respond(self, asset: _Asset, request) -> Response:
+        """Pick the best encoding the client accepts and answer 304 when the ETag matches"""
+        encoding = 'identity'
+        for candidate in ('br', 'gzip'):
+            if candidate in asset.encodings and request.accept_encodings[candidate]:
+                encoding = candidate
+                break
+        response = Response(asset.encodings[encoding], mimetype=asset.mimetype)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = asset.cache_control
+        # Each encoding is a distinct representation, so it gets its own strong ETag
+        response.set_etag(f"{asset.etag}-{encoding}")
+        return response.make_conditional(request)
+
+
+if __name__ == '__main__':
+    from new_traderiser_platform import MODERN_DASHBOARD_TEMPLATE
+    out = sys.argv[sys.argv.index('--out') + 1] if '--out' in sys.argv else os.path.join('static', 'dist')
+    DashboardAssets(MODERN_DASHBOARD_TEMPLATE).write(out)
+    print(f"Dashboard assets written to {out}")
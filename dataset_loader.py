@@ -0,0 +1,126 @@
+"""
+Background dataset loading for TradeRiser.AI
+Reference datasets such as the FinanceDatabase equities, ETFs and funds
+take seconds to build, so they are never built on the request path. A
+single loader thread builds them one at a time, which also bounds the
+memory peak: warmup queues the preloaded datasets, and the first use of
+any other dataset is queued onto the same thread (ahead of the remaining
+warmup) rather than starting a thread of its own. Until a dataset has
+loaded, get() returns None and callers use their fallbacks.
+"""
+import time
+import threading
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from utils_shared import setup_logging
+
+# Setup centralized logging
+setup_logging()
+
+
+def dataset_property(name: str) -> property:
+    """Property returning self.get_dataset(name): the dataset once loaded, else None"""
+    return property(lambda self: self.get_dataset(name))
+
+
+class DatasetLoader:
+    """Named datasets built one at a time on a background thread"""
+
+    def __init__(self, builders: Dict[str, Optional[Callable[[], Any]]], preload: List[str] = (),
+                 mode: str = 'background', on_loaded: Callable[[str, Any], None] = None):
+        """Initialize with name -> builder (None when unavailable), the warmup list and the warmup mode"""
+        self.logger = logging.getLogger(__name__)
+        self.builders = builders
+        self.preload = [name for name in preload if name in builders]
+        self.mode = mode
+        self.on_loaded = on_loaded
+        self.status = {name: 'pending' if builder else 'unavailable' for name, builder in builders.items()}
+        self._datasets = {}
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._warmup_started = False
+
+    def get(self, name: str) -> Optional[Any]:
+        """Loaded dataset, or None while it loads; the first use queues the load ahead of warmup"""
+        dataset = self._datasets.get(name)
+        if dataset is None:
+            self._enqueue([name], urgent=True)
+        return dataset
+
+    def start_warmup(self):
+        """Queue the preloaded datasets (background mode only, once)"""
+        with self._condition:
+            if self.mode != 'background' or self._warmup_started:
+                return
+            self._warmup_started = True
+        self._enqueue(self.preload)
+
+    def readiness(self) -> Dict:
+        """Dataset load states and whether the preloaded ones have settled"""
+        with self._condition:
+            status = dict(self.status)
+        waiting = [name for name in self.preload if status[name] in ('pending', 'queued', 'loading')]
+        return {
+            'ready': self.mode != 'background' or not waiting,
+            'warmup_mode': self.mode,
+            'datasets': status
+        }
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until nothing is queued or loading; False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not any(state in ('queued', 'loading') for state in self.status.values()), timeout)
+
+    def _enqueue(self, names: List[str], urgent: bool = False):
+        """Queue pending datasets for the loader thread, starting it on first use"""
+        with self._condition:
+            for name in names:
+                state = self.status.get(name)
+                if state == 'queued' and urgent:
+                    self._queue.remove(name)
+                elif state != 'pending':
+                    continue
+                self.status[name] = 'queued'
+                if urgent:
+                    self._queue.appendleft(name)
+                else:
+                    self._queue.append(name)
+            if not self._queue:
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='dataset-loader', daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _run(self):
+        """Loader thread: build queued datasets one after another"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue)
+                name = self._queue.popleft()
+                self.status[name] = 'loading'
+            state = self._load(name)
+            with self._condition:
+                self.status[name] = state
+                self._condition.notify_all()
+
+    def _load(self, name: str) -> str:
+        """Build one dataset; returns its final state"""
+        started = time.perf_counter()
+        try:
+            dataset = self.builders[name]()
+        except Exception as e:
+            self.logger.warning(f"Dataset {name} not available: {e}")
+            return 'failed'
+        self._datasets[name] = dataset
+        if self.on_loaded:
+            try:
+                self.on_loaded(name, dataset)
+            except Exception as e:
+                self.logger.warning(f"Post-load step for dataset {name} failed: {e}")
+        self.logger.info(f"Dataset {name} loaded in {time.perf_counter() - started:.1f}s")
+        return 'loaded'
@@ -1,10 +1,10 @@
 """
 Enhanced Cryptocurrency Trading Algorithm with AML Compliance for TradeRiser.AI
 """
-import yfinance as yf
 from datetime import datetime
 from typing import Dict, List, Optional
 from Utils.utils_api_client import APIClient
+from market_data_service import get_market_data_service
 import logging
 
 logging.basicConfig(
@@ -18,6 +18,7 @@ class EnhancedCryptoTrader:
         """Initialize with API client and crypto universe"""
         self.api_client = APIClient()
         self.finance_database = finance_database
+        self.market_data = get_market_data_service()
         self.logger = logging.getLogger(__name__)
         # Comprehensive crypto universe matching top 100 cryptocurrencies
         self.crypto_universe = {
@@ -129,6 +130,8 @@ class EnhancedCryptoTrader:
         """Analyze cryptocurrency market with AML compliance"""
         self.logger.info("Analyzing Cryptocurrency Market")
         recommendations = []
+        # Bulk-download the universe up front instead of one request per coin
+        self.market_data.prefetch(list(self.crypto_universe.keys()), period="30d")
         for ticker, info in self.crypto_universe.items():
             if len(recommendations) >= max_recommendations:
                 break
@@ -147,8 +150,7 @@ class EnhancedCryptoTrader:
     def _analyze_single_crypto(self, ticker: str, name: str, symbol: str, coin_id: str) -> Optional[Dict]:
         """Analyze a single cryptocurrency"""
         try:
-            crypto = yf.Ticker(ticker)
-            hist = crypto.history(period="30d")
+            hist = self.market_data.get_ticker_history(ticker, period="30d")
             if hist.empty or len(hist) < 5:
                 self.logger.warning(f"Insufficient history data for {symbol}")
                 return None
@@ -11,6 +11,7 @@ from Utils.utils_api_client import APIClient
 import logging
 import requests
 from utils_shared import AnalysisBase, TechnicalIndicators, setup_logging
+from market_data_service import get_market_data_service
 
 # Setup centralized logging
 setup_logging()
@@ -21,6 +22,7 @@ class ETFAnalyzer(AnalysisBase):
         super().__init__('ETFAnalyzer')
         self.api_client = APIClient()
         self.finance_database = finance_database
+        self.market_data = get_market_data_service()
         
         # Comprehensive ETF universe based on Finance Database methodology
         self.etf_universe = {
@@ -83,6 +85,9 @@ class ETFAnalyzer(AnalysisBase):
             expense_ratios = []
             total_aum = 0
             
+            # Bulk-download the universe (plus the SPY benchmark) before per-ETF analysis
+            self._prefetch_history(list(self.etf_universe.keys()))
+            
             for symbol, info in self.etf_universe.items():
                 etf_data = self._analyze_single_etf(symbol, info)
                 if etf_data:
@@ -140,8 +145,7 @@ class ETFAnalyzer(AnalysisBase):
     def _analyze_single_etf(self, symbol: str, info: Dict) -> Optional[Dict]:
         """Comprehensive single ETF analysis with financial ratios"""
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="2y")
+            hist = self.market_data.get_ticker_history(symbol, period="2y")
             
             if hist.empty:
                 return None
@@ -181,7 +185,7 @@ class ETFAnalyzer(AnalysisBase):
             relative_strength = self._calculate_relative_strength(symbol, 'SPY')
             
             # ETF-specific metrics
-            premium_discount = self._estimate_premium_discount(ticker)
+            premium_discount = self._estimate_premium_discount(yf.Ticker(symbol))
             
             return {
                 'symbol': symbol,
@@ -231,6 +235,12 @@ class ETFAnalyzer(AnalysisBase):
             self.logger.error(f"Error analyzing ETF {symbol}: {str(e)}")
             return None
     
+    def _prefetch_history(self, symbols: List[str]) -> None:
+        """Bulk-download the 2y analysis window and the 1y relative-strength window"""
+        symbols = symbols + ['SPY']
+        self.market_data.prefetch(symbols, period="2y")
+        self.market_data.prefetch(symbols, period="1y")
+    
     def _calculate_return(self, prices: pd.Series, periods: int) -> float:
         """Calculate return over specified periods"""
         try:
@@ -293,8 +303,8 @@ class ETFAnalyzer(AnalysisBase):
     def _calculate_relative_strength(self, symbol: str, benchmark: str) -> float:
         """Calculate relative strength vs benchmark"""
         try:
-            etf_data = yf.Ticker(symbol).history(period="1y")
-            benchmark_data = yf.Ticker(benchmark).history(period="1y")
+            etf_data = self.market_data.get_ticker_history(symbol, period="1y")
+            benchmark_data = self.market_data.get_ticker_history(benchmark, period="1y")
             
             if etf_data.empty or benchmark_data.empty:
                 return 0
@@ -390,6 +400,8 @@ class ETFAnalyzer(AnalysisBase):
                 'timestamp': datetime.now().isoformat()
             }
             
+            self._prefetch_history([s for s in symbols if s in self.etf_universe])
+            
             for symbol in symbols:
                 if symbol in self.etf_universe:
                     etf_data = self._analyze_single_etf(symbol, self.etf_universe[symbol])
@@ -0,0 +1,142 @@
+"""Prebuilt symbol/name search index for TradeRiser.AI instruments
+Built once from the symbol database so searches over the full
+FinanceDatabase universe (tens of thousands of instruments) avoid a
+linear scan. Exact symbols and names are dict lookups, symbol and name
+token prefixes are bisected from sorted key lists, and substrings are
+found by intersecting trigram posting lists before verifying the match.
+Results rank exact matches first, then prefix, then substring matches,
+with symbol matches ahead of name matches in each tier.
+"""
+import re
+import bisect
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils_shared import setup_logging
+
+# Setup centralized logging
+setup_logging()
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def trigrams(text: str) -> set:
+    """Distinct 3-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class InstrumentIndex:
+    """Exact, prefix and trigram lookups over instrument symbols and names"""
+
+    def __init__(self, instruments: Iterable[Tuple[str, str, str]]):
+        """Build from (category, symbol, name) entries"""
+        self.logger = logging.getLogger(__name__)
+        self.categories: List[str] = []
+        self.symbols: List[str] = []
+        self.names: List[str] = []
+        self._symbol_lower: List[str] = []
+        self._name_lower: List[str] = []
+        symbol_exact, name_exact = defaultdict(list), defaultdict(list)
+        name_keys = defaultdict(list)
+        symbol_grams, name_grams = defaultdict(list), defaultdict(list)
+
+        for i, (category, symbol, name) in enumerate(instruments):
+            symbol_lower, name_lower = symbol.lower(), (name or '').strip().lower()
+            self.categories.append(category)
+            self.symbols.append(symbol)
+            self.names.append(name or '')
+            self._symbol_lower.append(symbol_lower)
+            self._name_lower.append(name_lower)
+            symbol_exact[symbol_lower].append(i)
+            if name_lower:
+                name_exact[name_lower].append(i)
+                # Whole name plus each token, so "apple in" and "inc" both prefix-match "Apple Inc."
+                for key in {name_lower, *TOKEN_PATTERN.findall(name_lower)}:
+                    name_keys[key].append(i)
+            for gram in trigrams(symbol_lower):
+                symbol_grams[gram].append(i)
+            for gram in trigrams(name_lower):
+                name_grams[gram].append(i)
+
+        self._symbol_exact = dict(symbol_exact)
+        self._name_exact = dict(name_exact)
+        self._symbol_keys = sorted(symbol_exact)
+        self._name_keys = sorted(name_keys)
+        self._name_key_ids = [name_keys[key] for key in self._name_keys]
+        # Ids are appended in order, so every posting list is already sorted and unique
+        self._symbol_trigrams = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in symbol_grams.items()}
+        self._name_trigrams = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in name_grams.items()}
+        self.logger.info(f"Built instrument index: {len(self.symbols)} instruments, "
+                         f"{len(self._name_keys)} name keys, {len(self._name_trigrams)} name trigrams")
+
+    @classmethod
+    def from_symbol_database(cls, symbol_database: Dict[str, Dict[str, Dict]]) -> 'InstrumentIndex':
+        """Index an IntegratedFinanceDatabase-style {category: {symbol: info}} mapping"""
+        return cls((category, symbol, info.get('name', '') or '')
+                   for category, instruments in symbol_database.items()
+                   for symbol, info in instruments.items())
+
+    def __len__(self) -> int:
+        """Number of indexed instruments"""
+        return len(self.symbols)
+
+    def search(self, query: str, limit: int = 50, categories: Optional[Sequence[str]] = None) -> List[Tuple[str, str]]:
+        """Ranked (category, symbol) matches for query"""
+        allowed = set(categories) if categories is not None else None
+        q = query.strip().lower()
+        seen, ranked = set(), []
+        for i in self._candidates(q):
+            if i in seen or (allowed is not None and self.categories[i] not in allowed):
+                continue
+            seen.add(i)
+            ranked.append((self.categories[i], self.symbols[i]))
+            if len(ranked) >= limit:
+                break
+        return ranked
+
+    def _candidates(self, q: str) -> Iterator[int]:
+        """Instrument ids in rank order: exact, prefix, then substring; may repeat ids"""
+        if not q:
+            yield from range(len(self.symbols))
+            return
+        yield from self._symbol_exact.get(q, ())
+        yield from self._name_exact.get(q, ())
+        for key in self._prefixed(self._symbol_keys, q):
+            yield from self._symbol_exact[key]
+        start = bisect.bisect_left(self._name_keys, q)
+        for position in range(start, len(self._name_keys)):
+            if not self._name_keys[position].startswith(q):
+                break
+            yield from self._name_key_ids[position]
+        yield from self._substring_matches(q, self._symbol_lower, self._symbol_trigrams)
+        yield from self._substring_matches(q, self._name_lower, self._name_trigrams)
+
+    @staticmethod
+    def _prefixed(keys: List[str], q: str) -> Iterator[str]:
+        """Keys of a sorted list that start with q"""
+        for position in range(bisect.bisect_left(keys, q), len(keys)):
+            if not keys[position].startswith(q):
+                return
+            yield keys[position]
+
+    def _substring_matches(self, q: str, texts: List[str], postings: Dict[str, np.ndarray]) -> Iterator[int]:
+        """Ids whose text contains q, from the intersected trigram postings"""
+        if len(q) < 3:
+            # Too short for trigrams; the prefix tiers have usually filled the limit by now
+            candidates = range(len(texts))
+        else:
+            lists = sorted((postings.get(gram) for gram in trigrams(q)), key=lambda ids: -1 if ids is None else len(ids))
+            if lists[0] is None:
+                return
+            candidates = lists[0]
+            for ids in lists[1:]:
+                candidates = np.intersect1d(candidates, ids, assume_unique=True)
+                if not len(candidates):
+                    return
+            candidates = candidates.tolist()
+        for i in candidates:
+            if q in texts[i]:
+                yield i
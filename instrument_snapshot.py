@@ -0,0 +1,256 @@
+"""Prebuilt on-disk instrument universe snapshot for TradeRiser.AI
+An offline build step loads the FinanceDatabase universe (with the
+persisted options-availability flags) once and writes it as a versioned
+binary file: every column of the InstrumentUniverse laid out as one
+aligned array (categorical codes, numeric and boolean columns,
+NUL-separated UTF-8 for symbols and names) with a JSON manifest
+describing the layout. At startup IntegratedFinanceDatabase
+memory-maps the current snapshot in milliseconds instead of building
+FinanceDatabase objects. New versions are written under a fresh name
+and published by atomically replacing the manifest; a background
+thread notices and swaps them in.
+
+Build with:  python instrument_snapshot.py --once   (or without --once to rebuild on a cadence)
+"""
+import os
+import sys
+import json
+import time
+import glob
+import threading
+import logging
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils_shared import setup_logging
+from instrument_universe import InstrumentUniverse, UNIVERSE_SCHEMA
+
+# Setup centralized logging
+setup_logging()
+
+MANIFEST_FILE = 'current.json'
+SNAPSHOT_MAGIC = b'TRSNAP01'
+SNAPSHOT_FORMAT = 1
+
+
+def default_snapshot_dir() -> str:
+    """Snapshot directory: INSTRUMENT_SNAPSHOT_DIR, else data/instrument_snapshot"""
+    return os.getenv('INSTRUMENT_SNAPSHOT_DIR', os.path.join('data', 'instrument_snapshot'))
+
+
+def _pack_strings(values) -> np.ndarray:
+    """NUL-separated UTF-8 bytes of a string column"""
+    text = '\x00'.join(str(value).replace('\x00', '') for value in values)
+    return np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+
+
+def _unpack_strings(buffer: np.ndarray, count: int) -> np.ndarray:
+    """Object array of count strings from _pack_strings bytes"""
+    if count == 0:
+        return np.array([], dtype=object)
+    return np.array(buffer.tobytes().decode('utf-8').split('\x00'), dtype=object)
+
+
+def write_snapshot(path: str, universe: InstrumentUniverse) -> Dict:
+    """Write the universe's columns to path (atomically); returns the array layout for the manifest"""
+    arrays = {'symbols': _pack_strings(universe.symbols), 'asset_class': universe.asset_class.codes}
+    labels = {'asset_class': [str(label) for label in universe.asset_class.categories]}
+    for column, kind in UNIVERSE_SCHEMA.items():
+        if column == 'market_cap_rank':
+            continue  # Derived from market_cap on load
+        values = universe.columns[column]
+        if kind == 'category':
+            arrays[column] = values.codes
+            labels[column] = [str(label) for label in values.categories]
+        elif kind == 'text':
+            arrays[column] = _pack_strings(values)
+        else:
+            arrays[column] = np.ascontiguousarray(values)
+
+    layout = {}
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        offset = len(SNAPSHOT_MAGIC)
+        for name, array in arrays.items():
+            padding = -offset % 8  # Keep every array 8-byte aligned in the mapping
+            f.write(b'\x00' * padding)
+            offset += padding
+            f.write(array.tobytes())
+            layout[name] = {'offset': offset, 'dtype': array.dtype.str, 'count': len(array)}
+            offset += array.nbytes
+    os.replace(tmp_path, path)
+    return {'rows': len(universe), 'arrays': layout, 'labels': labels}
+
+
+def read_snapshot(path: str, manifest: Dict) -> InstrumentUniverse:
+    """Memory-map a snapshot file; numeric columns stay zero-copy views of the mapping"""
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    if buffer[:len(SNAPSHOT_MAGIC)].tobytes() != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not an instrument snapshot")
+    rows, labels = manifest['rows'], manifest['labels']
+
+    def view(name: str) -> np.ndarray:
+        spec = manifest['arrays'][name]
+        return np.frombuffer(buffer, dtype=np.dtype(spec['dtype']), count=spec['count'], offset=spec['offset'])
+
+    columns = {}
+    for column, kind in UNIVERSE_SCHEMA.items():
+        if column == 'market_cap_rank':
+            continue
+        if kind == 'category':
+            columns[column] = pd.Categorical.from_codes(view(column), categories=labels[column])
+        elif kind == 'text':
+            columns[column] = _unpack_strings(view(column), rows)
+        elif kind == 'bool':
+            columns[column] = np.array(view(column))  # Private copy: set_flags writes to it
+        else:
+            columns[column] = view(column)
+    return InstrumentUniverse.from_arrays(
+        _unpack_strings(view('symbols'), rows),
+        pd.Categorical.from_codes(view('asset_class'), categories=labels['asset_class']),
+        columns
+    )
+
+
+class InstrumentSnapshot:
+    """Loads the published instrument snapshot and hot-swaps newer versions"""
+
+    def __init__(self, directory: str = None, check_interval: float = None):
+        """Initialize a reader for the snapshot published in directory"""
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory or default_snapshot_dir()
+        self.check_interval = check_interval or float(os.getenv('INSTRUMENT_SNAPSHOT_CHECK_SECONDS', 60))
+        self.manifest = None
+        self._manifest_mtime = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional['InstrumentSnapshot']:
+        """Create a reader unless INSTRUMENT_SNAPSHOT_ENABLED is false"""
+        if os.getenv('INSTRUMENT_SNAPSHOT_ENABLED', 'true').lower() != 'true':
+            return None
+        return cls()
+
+    def load(self) -> Optional[InstrumentUniverse]:
+        """Map the snapshot the manifest points to, or None when there is no usable snapshot"""
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        try:
+            mtime = os.stat(manifest_path).st_mtime_ns
+        except OSError:
+            return None
+        try:
+            started = time.perf_counter()
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('format') != SNAPSHOT_FORMAT:
+                self.logger.warning(f"Ignoring instrument snapshot with format {manifest.get('format')}")
+                return None
+            universe = read_snapshot(os.path.join(self.directory, manifest['data_file']), manifest)
+            self.manifest, self._manifest_mtime = manifest, mtime
+            self.logger.info(f"Loaded instrument snapshot {manifest['version']} ({len(universe)} instruments) "
+                             f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+            return universe
+        except Exception as e:
+            self.logger.error(f"Error loading instrument snapshot: {str(e)}")
+            return None
+
+    def version(self) -> Optional[str]:
+        """Version of the loaded snapshot"""
+        return self.manifest['version'] if self.manifest else None
+
+    def start_refresh(self, on_swap: Callable[[InstrumentUniverse], None]):
+        """Watch the manifest in a daemon thread and hand each newly published universe to on_swap"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._watch, args=(on_swap,), name='instrument-snapshot',
+                                            daemon=True)
+        self._thread.start()
+
+    def _watch(self, on_swap: Callable[[InstrumentUniverse], None]):
+        """Poll the manifest; load and swap in new versions"""
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        while True:
+            time.sleep(self.check_interval)
+            try:
+                if os.stat(manifest_path).st_mtime_ns == self._manifest_mtime:
+                    continue
+            except OSError:
+                continue
+            universe = self.load()
+            if universe is not None:
+                try:
+                    on_swap(universe)
+                except Exception as e:
+                    self.logger.error(f"Error swapping in instrument snapshot: {str(e)}")
+
+
+class InstrumentSnapshotPublisher:
+    """Builds the instrument snapshot and publishes new versions atomically"""
+
+    def __init__(self, directory: str = None, keep_versions: int = 2):
+        """Initialize publisher for a snapshot directory"""
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory or default_snapshot_dir()
+        self.keep_versions = keep_versions
+
+    def publish(self, universe: InstrumentUniverse = None) -> Optional[Dict]:
+        """Write universe (by default freshly loaded from FinanceDatabase) and swap the manifest"""
+        if universe is None:
+            from integrated_finance_database import IntegratedFinanceDatabase
+
+            # Never read from the snapshot we are about to replace
+            universe = IntegratedFinanceDatabase(use_snapshot=False, enrich_options=False).universe
+        if not len(universe):
+            self.logger.error("Instrument snapshot not published: empty universe")
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        version = str(time.time_ns())
+        data_file = f"universe-{version}.bin"
+        layout = write_snapshot(os.path.join(self.directory, data_file), universe)
+        manifest = {
+            'format': SNAPSHOT_FORMAT,
+            'version': version,
+            'data_file': data_file,
+            'created_at': time.time(),
+            **layout
+        }
+        tmp_path = os.path.join(self.directory, f".{MANIFEST_FILE}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST_FILE))
+        self._cleanup_old_versions()
+        self.logger.info(f"Published instrument snapshot {version}: {len(universe)} instruments")
+        return manifest
+
+    def run_forever(self, refresh_seconds: int = None):
+        """Rebuild and republish the snapshot on a fixed cadence"""
+        refresh_seconds = refresh_seconds or int(os.getenv('INSTRUMENT_SNAPSHOT_REFRESH_SECONDS', 86400))
+        while True:
+            try:
+                self.publish()
+            except Exception as e:
+                self.logger.error(f"Error publishing instrument snapshot: {str(e)}")
+            time.sleep(refresh_seconds)
+
+    def _cleanup_old_versions(self):
+        """Remove superseded versions; mapped readers keep their pages until they swap"""
+        files = sorted(glob.glob(os.path.join(self.directory, 'universe-*.bin')))
+        for path in files[:-self.keep_versions]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+if __name__ == '__main__':
+    publisher = InstrumentSnapshotPublisher()
+    if '--once' in sys.argv:
+        publisher.publish()
+    else:
+        publisher.run_forever()
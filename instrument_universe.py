@@ -0,0 +1,242 @@
+"""Columnar in-memory instrument universe for TradeRiser.AI
+Holds the full FinanceDatabase universe as one set of column arrays
+instead of a dict of dicts per instrument: sector, industry, country,
+category, family and market-cap class are categorical (small integer codes
+plus one copy of each label), expense ratio, total assets and the ordinal
+market-cap rank are numeric arrays, has_options is a boolean array, and a
+symbol -> row hash index gives O(1) lookups. Filters such as "US tech with
+options" are vectorized over the whole universe. A read-only
+{asset_class: {symbol: info}} view keeps the old symbol_database layout
+working for existing callers.
+"""
+import logging
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils_shared import setup_logging
+
+# Setup centralized logging
+setup_logging()
+
+# Column -> storage kind
+UNIVERSE_SCHEMA = {
+    'name': 'text',
+    'sector': 'category',
+    'industry': 'category',
+    'country': 'category',
+    'category': 'category',
+    'family': 'category',
+    'market_cap': 'category',
+    'market_cap_rank': 'int',
+    'expense_ratio': 'float',
+    'total_assets': 'float',
+    'has_options': 'bool'
+}
+
+# Fields each asset class exposes through the dict-style view (the original symbol_database layout)
+ASSET_CLASS_FIELDS = {
+    'US_STOCKS': ('name', 'sector', 'industry', 'market_cap', 'country', 'has_options'),
+    'ETFS': ('name', 'category', 'family', 'expense_ratio', 'total_assets'),
+    'CRYPTO': ('name', 'category', 'market_cap'),
+    'INDICES': ('name',),
+    'CURRENCIES': ('name',)
+}
+ASSET_CLASSES = tuple(ASSET_CLASS_FIELDS)
+
+# FinanceDatabase market-cap classes ("Large Cap", ...) ordered for numeric filters
+MARKET_CAP_RANKS = {'nano': 1, 'micro': 2, 'small': 3, 'mid': 4, 'large': 5, 'mega': 6}
+
+
+def market_cap_rank(label: str) -> int:
+    """Ordinal rank of a market-cap class label (0 when unknown)"""
+    words = str(label).lower().split()
+    return MARKET_CAP_RANKS.get(words[0], 0) if words else 0
+
+
+class InstrumentUniverse:
+    """Columnar instrument universe with a symbol -> row hash index"""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        """Build from one symbol-indexed DataFrame per asset class"""
+        self.logger = logging.getLogger(__name__)
+        source_columns = [c for c in UNIVERSE_SCHEMA if c != 'market_cap_rank']
+        parts = []
+        for asset_class, frame in frames.items():
+            if frame is None or frame.empty:
+                continue
+            frame = frame[frame.index.notna()]
+            part = frame.reindex(columns=source_columns)
+            part.index = part.index.astype(str)
+            part.insert(0, 'asset_class', asset_class)
+            parts.append(part[part.index != ''])
+        table = pd.concat(parts) if parts else pd.DataFrame(columns=['asset_class', *source_columns])
+
+        classes = list(dict.fromkeys([*ASSET_CLASSES, *table['asset_class'].unique()]))
+        columns = {}
+        for column, kind in UNIVERSE_SCHEMA.items():
+            if column == 'market_cap_rank':
+                continue
+            values = table[column]
+            if kind == 'category':
+                columns[column] = pd.Categorical(values.where(values.notna() & (values != ''), None))
+            elif kind == 'float':
+                columns[column] = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+            elif kind == 'bool':
+                flags = values.astype(object).where(values.notna(), False)
+                columns[column] = flags.to_numpy(dtype=bool, copy=True)  # Writable for set_flags
+            else:
+                columns[column] = values.fillna('').astype(str).to_numpy(dtype=object)
+        self._attach(table.index.to_numpy(dtype=object),
+                     pd.Categorical(table['asset_class'].to_numpy(), categories=classes), columns)
+
+    @classmethod
+    def from_arrays(cls, symbols: np.ndarray, asset_class: pd.Categorical,
+                    columns: Dict[str, object]) -> 'InstrumentUniverse':
+        """Wrap ready-made column arrays (e.g. memory-mapped from a snapshot) without copying them"""
+        universe = cls.__new__(cls)
+        universe.logger = logging.getLogger(__name__)
+        universe._attach(symbols, asset_class, dict(columns))
+        return universe
+
+    def _attach(self, symbols: np.ndarray, asset_class: pd.Categorical, columns: Dict[str, object]):
+        """Set the column arrays and build the derived rank column and symbol index"""
+        self.symbols = symbols
+        self.asset_class = asset_class
+        self.columns = columns
+        market_cap = self.columns['market_cap']
+        ranks = np.array([market_cap_rank(label) for label in market_cap.categories] + [0], dtype=np.int8)
+        self.columns['market_cap_rank'] = ranks[market_cap.codes]
+
+        # First occurrence wins, matching the old per-category scan; repeats are kept per asset class
+        self._rows: Dict[str, int] = {}
+        self._class_rows: Dict[Tuple[str, str], int] = {}
+        for row, symbol in enumerate(self.symbols):
+            if self._rows.setdefault(symbol, row) != row:
+                self._class_rows.setdefault((self.asset_class[row], symbol), row)
+        self.logger.info(f"Built instrument universe: {len(self.symbols)} instruments")
+
+    @classmethod
+    def from_records(cls, symbol_database: Dict[str, Dict[str, Dict]]) -> 'InstrumentUniverse':
+        """Build from a {asset_class: {symbol: info}} mapping"""
+        return cls({asset_class: pd.DataFrame.from_dict(instruments, orient='index')
+                    for asset_class, instruments in symbol_database.items() if instruments})
+
+    def __len__(self) -> int:
+        """Number of instruments"""
+        return len(self.symbols)
+
+    def row(self, symbol: str, asset_class: Optional[str] = None) -> Optional[int]:
+        """Row of a symbol, optionally within one asset class"""
+        row = self._rows.get(symbol)
+        if row is None or asset_class is None or self.asset_class[row] == asset_class:
+            return row
+        return self._class_rows.get((asset_class, symbol))
+
+    def value(self, column: str, row: int):
+        """One cell as a plain Python value ('' for missing labels)"""
+        values = self.columns[column]
+        if isinstance(values, pd.Categorical):
+            code = values.codes[row]
+            return values.categories[code] if code >= 0 else ''
+        value = values[row]
+        if UNIVERSE_SCHEMA[column] == 'float':
+            return 0 if np.isnan(value) else float(value)
+        return value.item() if isinstance(value, np.generic) else value
+
+    def record(self, row: int) -> Dict:
+        """Instrument info in the dict layout of its asset class"""
+        fields = ASSET_CLASS_FIELDS.get(self.asset_class[row], ('name',))
+        return {field: self.value(field, row) for field in fields}
+
+    def mask(self, **conditions) -> np.ndarray:
+        """Boolean row mask; column=value, column=[values], min_column=x or max_column=x"""
+        mask = np.ones(len(self.symbols), dtype=bool)
+        for key, wanted in conditions.items():
+            bound, column = None, key
+            if key.startswith(('min_', 'max_')) and key[4:] in self.columns:
+                bound, column = key[:3], key[4:]
+            values = self.asset_class if column == 'asset_class' else self.columns.get(column)
+            if values is None or (bound and UNIVERSE_SCHEMA[column] not in ('int', 'float')):
+                raise ValueError(f"Unsupported filter: {key}")
+            if bound == 'min':
+                mask &= values >= wanted
+            elif bound == 'max':
+                mask &= values <= wanted
+            elif isinstance(values, pd.Categorical):
+                labels = list(wanted) if isinstance(wanted, (list, tuple, set)) else [wanted]
+                codes = [values.categories.get_loc(label) for label in labels if label in values.categories]
+                mask &= np.isin(values.codes, codes)
+            elif isinstance(wanted, (list, tuple, set)):
+                mask &= np.isin(values, list(wanted))
+            else:
+                mask &= values == wanted
+        return mask
+
+    def filter(self, **conditions) -> np.ndarray:
+        """Rows matching every condition (see mask)"""
+        return np.flatnonzero(self.mask(**conditions))
+
+    def symbols_where(self, **conditions) -> List[str]:
+        """Symbols matching every condition (see mask)"""
+        return self.symbols[self.mask(**conditions)].tolist()
+
+    def set_flags(self, column: str, flags: Dict[str, bool], asset_class: Optional[str] = None):
+        """Update a boolean column for the given symbols"""
+        values = self.columns[column]
+        for symbol, flag in flags.items():
+            row = self.row(symbol, asset_class)
+            if row is not None:
+                values[row] = bool(flag)
+
+    def entries(self) -> Iterator[Tuple[str, str, str]]:
+        """(asset_class, symbol, name) per row, for building search indexes"""
+        return zip(self.asset_class.astype(object), self.symbols, self.columns['name'])
+
+    def as_symbol_database(self) -> 'UniverseView':
+        """Read-only {asset_class: {symbol: info}} view"""
+        return UniverseView(self)
+
+
+class AssetClassView(Mapping):
+    """Read-only {symbol: info} view of one asset class; info dicts are built on access"""
+
+    def __init__(self, universe: InstrumentUniverse, asset_class: str):
+        self.universe = universe
+        self.asset_class = asset_class
+        self.rows = universe.filter(asset_class=asset_class)
+
+    def __getitem__(self, symbol: str) -> Dict:
+        row = self.universe.row(symbol, self.asset_class)
+        if row is None:
+            raise KeyError(symbol)
+        return self.universe.record(row)
+
+    def __contains__(self, symbol) -> bool:
+        return self.universe.row(symbol, self.asset_class) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.universe.symbols[self.rows].tolist())
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class UniverseView(Mapping):
+    """Read-only {asset_class: {symbol: info}} view of an InstrumentUniverse"""
+
+    def __init__(self, universe: InstrumentUniverse):
+        self.universe = universe
+        self._classes = {asset_class: AssetClassView(universe, asset_class)
+                         for asset_class in universe.asset_class.categories}
+
+    def __getitem__(self, asset_class: str) -> AssetClassView:
+        return self._classes[asset_class]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._classes)
+
+    def __len__(self) -> int:
+        return len(self._classes)
@@ -1,12 +1,17 @@
 """Integrated Finance Database using Finance Database and Toolkit"""
 import os
 import pandas as pd
-import requests
 from datetime import datetime
 from typing import Dict, List, Optional
 from Utils.utils_api_client import APIClient
+from Utils.utils_http import http_get
+from instrument_index import InstrumentIndex
+from instrument_universe import InstrumentUniverse
+from instrument_snapshot import InstrumentSnapshot
+from options_enrichment import OptionsEnrichment
 import logging
-from financedatabase import Equities, ETFs, Funds, Indices, Currencies, Moneymarkets
+import threading
+from financedatabase import Equities, ETFs
 from financetoolkit import Toolkit
 
 logging.basicConfig(
@@ -16,134 +21,138 @@ logging.basicConfig(
 )
 
 class IntegratedFinanceDatabase:
-    def __init__(self):
-        """Initialize the integrated finance database using Finance Database"""
+    def __init__(self, use_snapshot: bool = True, enrich_options: bool = None):
+        """Initialize from the prebuilt instrument snapshot, else from Finance Database"""
         self.api_client = APIClient()
         self.logger = logging.getLogger(__name__)
-        
-        # Initialize Finance Database components
-        try:
-            self.equities = Equities()
-            self.etfs = ETFs()
-            self.funds = Funds()
-            self.indices = Indices()
-            self.currencies = Currencies()
-            self.money_markets = Moneymarkets()
-            self.logger.info("Successfully initialized Finance Database")
-        except Exception as e:
-            self.logger.error(f"Error initializing Finance Database: {str(e)}")
-            # Fallback to basic data
-            self.equities = None
-            self.etfs = None
-        
         self.base_urls = {
             'yahoo_options': 'https://query1.finance.yahoo.com/v7/finance/options',
             'sec_edgar': 'https://www.sec.gov/files/company_tickers.json'
         }
+        self.snapshot = InstrumentSnapshot.from_env() if use_snapshot else None
+        # Options availability comes from persisted flags refreshed in the background, never at lookup time
+        self.options_enrichment = OptionsEnrichment(self._probe_options, rate_limiter=self.api_client.rate_limiter)
+        if enrich_options is None:
+            enrich_options = os.getenv('OPTIONS_ENRICHMENT_ENABLED', 'true').lower() == 'true'
+        # (universe, symbol_database view, search index or None), replaced as one reference on swap
+        self._catalog = None
+        self._index_lock = threading.Lock()
         self._initialize_symbol_database()
+        if enrich_options:
+            self.options_enrichment.start(lambda: self.universe.symbols_where(asset_class='US_STOCKS'),
+                                          lambda flags: self.universe.set_flags('has_options', flags, 'US_STOCKS'))
+
+    @property
+    def universe(self) -> InstrumentUniverse:
+        """Current columnar instrument universe"""
+        return self._catalog[0]
+
+    @property
+    def symbol_database(self):
+        """Read-only {category: {symbol: info}} view of the current universe"""
+        return self._catalog[1]
+
+    @property
+    def instrument_index(self) -> InstrumentIndex:
+        """Search index over the current universe, built on first use"""
+        index = self._catalog[2]
+        if index is None:
+            with self._index_lock:
+                catalog = self._catalog
+                if catalog[2] is None:
+                    catalog = (catalog[0], catalog[1], InstrumentIndex(catalog[0].entries()))
+                    self._catalog = catalog
+                index = catalog[2]
+        return index
+
+    def _use_universe(self, universe: InstrumentUniverse, build_index: bool = False):
+        """Swap in a universe together with its dict view (and optionally its search index)"""
+        self.options_enrichment.apply(universe)
+        index = InstrumentIndex(universe.entries()) if build_index else None
+        self._catalog = (universe, universe.as_symbol_database(), index)
 
     def _initialize_symbol_database(self):
-        """Initialize comprehensive symbol database using Finance Database"""
+        """Map the instrument snapshot when one is published, else load from Finance Database"""
+        universe = self.snapshot.load() if self.snapshot else None
+        if universe is not None:
+            self._use_universe(universe)
+            # Newer snapshots are swapped in with their search index already built
+            self.snapshot.start_refresh(lambda fresh: self._use_universe(fresh, build_index=True))
+            return
+        self._use_universe(self.load_universe(), build_index=True)
+        self.logger.info("Initialized comprehensive symbol database")
+
+    def load_universe(self) -> InstrumentUniverse:
+        """Build the universe from Finance Database selections and the persisted options flags"""
         try:
-            symbol_db = {
-                'US_STOCKS': {},
-                'ETFS': {},
-                'CRYPTO': {},
-                'INDICES': {},
-                'CURRENCIES': {}
-            }
+            frames = {}
             
-            # Get equities data from Finance Database
-            if self.equities is not None:
-                try:
-                    # Get a subset of US equities (limit to avoid memory issues)
-                    us_equities = self.equities.select(country='United States')
-                    # Take first 100 for performance
-                    for symbol, data in list(us_equities.items())[:100]:
-                        if symbol and isinstance(data, dict):
-                            symbol_db['US_STOCKS'][symbol] = {
-                                'name': data.get('name', ''),
-                                'sector': data.get('sector', ''),
-                                'industry': data.get('industry', ''),
-                                'market_cap': data.get('market_cap', ''),
-                                'country': data.get('country', ''),
-                                'has_options': True  # Assume major US stocks have options
-                            }
-                    self.logger.info(f"Loaded {len(symbol_db['US_STOCKS'])} US equities")
-                except Exception as e:
-                    self.logger.error(f"Error loading equities: {str(e)}")
+            # Get equities data from Finance Database (select() returns a DataFrame indexed by symbol)
+            try:
+                us_equities = Equities().select(country='United States')
+                # Assume US stocks have options until the background enrichment has checked them
+                frames['US_STOCKS'] = us_equities.assign(has_options=True)
+                self.logger.info(f"Loaded {len(us_equities)} US equities")
+            except Exception as e:
+                self.logger.error(f"Error loading equities: {str(e)}")
             
             # Get ETFs data
-            if self.etfs is not None:
-                try:
-                    us_etfs = self.etfs.select(country='United States')
-                    # Take first 50 ETFs for performance
-                    for symbol, data in list(us_etfs.items())[:50]:
-                        if symbol and isinstance(data, dict):
-                            symbol_db['ETFS'][symbol] = {
-                                'name': data.get('name', ''),
-                                'category': data.get('category', ''),
-                                'family': data.get('family', ''),
-                                'expense_ratio': data.get('expense_ratio', 0),
-                                'total_assets': data.get('total_assets', 0)
-                            }
-                    self.logger.info(f"Loaded {len(symbol_db['ETFS'])} ETFs")
-                except Exception as e:
-                    self.logger.error(f"Error loading ETFs: {str(e)}")
+            try:
+                frames['ETFS'] = ETFs().select(country='United States')
+                self.logger.info(f"Loaded {len(frames['ETFS'])} ETFs")
+            except Exception as e:
+                self.logger.error(f"Error loading ETFs: {str(e)}")
             
             # Add some popular cryptocurrencies
-            symbol_db['CRYPTO'] = {
+            frames['CRYPTO'] = pd.DataFrame.from_dict({
                 'BTC-USD': {'name': 'Bitcoin', 'category': 'Cryptocurrency', 'market_cap': 'Large'},
                 'ETH-USD': {'name': 'Ethereum', 'category': 'Cryptocurrency', 'market_cap': 'Large'},
                 'ADA-USD': {'name': 'Cardano', 'category': 'Cryptocurrency', 'market_cap': 'Large'},
                 'SOL-USD': {'name': 'Solana', 'category': 'Cryptocurrency', 'market_cap': 'Large'}
-            }
+            }, orient='index')
             
             # No fallback placeholder data - use only real data from Finance Database
-            
-            self.symbol_database = symbol_db
-            
-            # Update has_options for stocks (limit to avoid rate limits)
-            for symbol in list(self.symbol_database['US_STOCKS'].keys())[:20]:  # Reduced limit
-                options_data = self._get_options_data(symbol)
-                self.symbol_database['US_STOCKS'][symbol]['has_options'] = options_data.get('has_options', False)
-            
-            self.logger.info("Initialized comprehensive symbol database")
+            universe = InstrumentUniverse(frames)
+            self.options_enrichment.apply(universe)
+            return universe
             
         except Exception as e:
             self.logger.error(f"Error initializing symbol database: {str(e)}")
             # No fallback data - return empty database
-            self.symbol_database = {
-                'US_STOCKS': {},
-                'ETFS': {},
-                'CRYPTO': {},
-                'INDICES': {},
-                'CURRENCIES': {}
-            }
+            return InstrumentUniverse({})
+
+    def filter_instruments(self, limit: Optional[int] = 100, **conditions) -> List[Dict]:
+        """Vectorized screen over the whole universe (e.g. sector='Information Technology', has_options=True)"""
+        try:
+            rows = self.universe.filter(**conditions)[:limit]
+            return [{'symbol': self.universe.symbols[row], 'database_category': self.universe.asset_class[row],
+                     **self.universe.record(row)} for row in rows]
+        except ValueError as e:
+            self.logger.error(f"Error filtering instruments: {str(e)}")
+            return []
 
     def search_instruments(self, query: str, category: Optional[str] = None, limit: int = 50) -> List[Dict]:
         """Search for financial instruments"""
         try:
+            categories = None
+            if category:
+                categories = [name for name in self.symbol_database if category.lower() in name.lower()]
             results = []
-            query_lower = query.lower()
-            for db_category, instruments in self.symbol_database.items():
-                if category and category.lower() not in db_category.lower():
-                    continue
-                for symbol, info in instruments.items():
-                    if query_lower in symbol.lower() or query_lower in info.get('name', '').lower():
-                        result = {
-                            'symbol': symbol,
-                            'name': info.get('name', ''),
-                            'category': info.get('category', db_category),
-                            'sector': info.get('sector', ''),
-                            'market_cap': info.get('market_cap', ''),
-                            'exchange': self._get_exchange_from_symbol(symbol),
-                            'currency': 'USD',
-                            'has_options': info.get('has_options', False)
-                        }
-                        results.append(result)
+            # Ranked exact > prefix > substring by the prebuilt index
+            for db_category, symbol in self.instrument_index.search(query, limit, categories):
+                info = self.symbol_database[db_category][symbol]
+                results.append({
+                    'symbol': symbol,
+                    'name': info.get('name', ''),
+                    'category': info.get('category', db_category),
+                    'sector': info.get('sector', ''),
+                    'market_cap': info.get('market_cap', ''),
+                    'exchange': self._get_exchange_from_symbol(symbol),
+                    'currency': 'USD',
+                    'has_options': info.get('has_options', False)
+                })
             self.logger.info(f"Searched instruments with query: {query}")
-            return sorted(results, key=lambda x: x['symbol'] == query_lower, reverse=True)[:limit]
+            return results
         except Exception as e:
             self.logger.error(f"Error searching instruments: {str(e)}")
             return []
@@ -174,34 +183,54 @@ class IntegratedFinanceDatabase:
     def _get_options_data(self, symbol: str) -> Dict:
         """Get options data for a symbol"""
         try:
-            cache_key = f"options:{symbol}"
-            cached = self.api_client._cache_get(cache_key)
-            if cached:
-                return cached
-            url = f"{self.base_urls['yahoo_options']}/{symbol}"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json().get('optionChain', {}).get('result', [{}])[0]
-            calls = data.get('options', [{}])[0].get('calls', [])
-            puts = data.get('options', [{}])[0].get('puts', [])
-            call_ivs = [opt.get('impliedVolatility', 0) for opt in calls]
-            put_ivs = [opt.get('impliedVolatility', 0) for opt in puts]
-            result = {
-                'has_options': bool(calls or puts),
-                'implied_volatility_avg': sum(call_ivs + put_ivs) / max(len(call_ivs + put_ivs), 1),
-                'expiration_dates': data.get('expirationDates', []),
-                'call_options': calls[:10],  # Limit to avoid large responses
-                'put_options': puts[:10]
-            }
-            self.api_client._cache_set(cache_key, result, 3600)  # Cache for 1 hour
-            self.logger.info(f"Fetched options data for {symbol}")
-            return result
+            return self._fetch_options_data(symbol)
         except Exception as e:
             self.logger.error(f"Error getting options data for {symbol}: {str(e)}")
             return {'has_options': False}
 
+    def _fetch_options_data(self, symbol: str) -> Dict:
+        """Options chain summary for a symbol; raises when Yahoo cannot be reached"""
+        cache_key = f"options:{symbol}"
+        cached = self.api_client._cache_get(cache_key)
+        if cached:
+            return cached
+        data = self._request_option_chain(symbol)
+        calls = (data.get('options') or [{}])[0].get('calls', [])
+        puts = (data.get('options') or [{}])[0].get('puts', [])
+        call_ivs = [opt.get('impliedVolatility', 0) for opt in calls]
+        put_ivs = [opt.get('impliedVolatility', 0) for opt in puts]
+        result = {
+            'has_options': bool(calls or puts),
+            'implied_volatility_avg': sum(call_ivs + put_ivs) / max(len(call_ivs + put_ivs), 1),
+            'expiration_dates': data.get('expirationDates', []),
+            'call_options': calls[:10],  # Limit to avoid large responses
+            'put_options': puts[:10]
+        }
+        self.api_client._cache_set(cache_key, result, 3600)  # Cache for 1 hour
+        self.logger.info(f"Fetched options data for {symbol}")
+        return result
+
+    def _request_option_chain(self, symbol: str) -> Dict:
+        """Nearest-expiry option chain from Yahoo; raises when Yahoo cannot be reached"""
+        url = f"{self.base_urls['yahoo_options']}/{symbol}"
+        response = http_get(url, timeout=10)
+        response.raise_for_status()
+        return (response.json().get('optionChain', {}).get('result') or [{}])[0]
+
+    def _probe_options(self, symbol: str) -> bool:
+        """Background enrichment probe (paced by OptionsEnrichment): whether Yahoo lists options for symbol"""
+        # Only the flag is kept; chain summaries are cached by get_instrument_details for symbols users open
+        cached = self.api_client._cache_get(f"options:{symbol}")
+        if cached:
+            return cached['has_options']
+        chain = (self._request_option_chain(symbol).get('options') or [{}])[0]
+        return bool(chain.get('calls') or chain.get('puts'))
+
     def _has_options(self, symbol: str) -> bool:
-        """Check if symbol has options trading"""
+        """Check if symbol has options trading (persisted flag, else the universe default)"""
+        flag = self.options_enrichment.has_options(symbol)
+        if flag is not None:
+            return flag
         return self.symbol_database.get('US_STOCKS', {}).get(symbol, {}).get('has_options', False)
 
     def _get_exchange_from_symbol(self, symbol: str) -> str:
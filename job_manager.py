@@ -0,0 +1,192 @@
+"""Asynchronous analysis jobs for TradeRiser.AI
+Heavy analysis requests are submitted as jobs: the request returns a job id
+immediately and a bounded worker pool runs the analysis, so slow vendor
+calls never hold a web server thread. Identical queued or running jobs
+(same kind and normalized payload) share one job, and finished jobs are
+kept for JOB_RESULT_TTL seconds so clients can poll or stream the result.
+"""
+import os
+import json
+import time
+import uuid
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from utils_shared import setup_logging
+from Utils.utils_request import payload_hash
+
+# Setup centralized logging
+setup_logging()
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already waiting"""
+
+
+class Job:
+    """One submitted analysis and its outcome"""
+
+    def __init__(self, kind: str, payload: Dict, request_hash: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.payload = payload
+        self.request_hash = request_hash
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        """True once the job succeeded or failed"""
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        """JSON-serializable job status"""
+        data = {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+        if self.error:
+            data['error'] = self.error
+        if include_result and self.status == SUCCEEDED:
+            data['result'] = self.result
+        return data
+
+
+class JobManager:
+    """Runs registered job kinds on a worker pool with request deduplication"""
+
+    def __init__(self, max_workers: int = None, result_ttl: int = None, max_queued: int = None,
+                 dumps: Callable[[Any], str] = None):
+        """Initialize with pool size, result retention (seconds), queue bound and the JSON encoder for streams"""
+        self.logger = logging.getLogger(__name__)
+        # Pass the app's JSON provider so streamed results match GET /api/jobs/<id>
+        self.dumps = dumps or (lambda obj: json.dumps(obj, default=str))
+        self.max_workers = max_workers or int(os.getenv('JOB_WORKERS', 4))
+        self.result_ttl = result_ttl or int(os.getenv('JOB_RESULT_TTL', 600))
+        self.max_queued = max_queued or int(os.getenv('JOB_MAX_QUEUED', 100))
+        self._handlers: Dict[str, Tuple[Callable[[Dict], Any], Optional[Callable[[Dict], Optional[str]]]]] = {}
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._active: Dict[str, str] = {}  # request hash -> id of its queued/running job
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def register(self, kind: str, func: Callable[[Dict], Any],
+                 validate: Optional[Callable[[Dict], Optional[str]]] = None):
+        """Register a job kind; validate returns an error message for bad payloads"""
+        self._handlers[kind] = (func, validate)
+
+    def kinds(self):
+        """Registered job kinds"""
+        return list(self._handlers)
+
+    def validate(self, kind: str, payload: Dict) -> Optional[str]:
+        """Error message for an unknown kind or invalid payload, else None"""
+        if kind not in self._handlers:
+            return f"Unknown job type '{kind}'"
+        validate = self._handlers[kind][1]
+        return validate(payload) if validate else None
+
+    def submit(self, kind: str, payload: Dict) -> Tuple[Job, bool]:
+        """Queue a job, or return the identical active one; returns (job, created)"""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job type '{kind}'")
+        request_hash = payload_hash(kind, payload)
+        with self._lock:
+            self._purge_expired()
+            existing = self._jobs.get(self._active.get(request_hash))
+            if existing is not None and not existing.finished:
+                return existing, False
+            queued = sum(1 for job in self._active.values() if self._jobs[job].status == QUEUED)
+            if queued >= self.max_queued:
+                raise JobQueueFull(f"{queued} jobs already queued")
+            job = Job(kind, payload, request_hash)
+            self._jobs[job.id] = job
+            self._active[request_hash] = job.id
+        self._get_executor().submit(self._run, job)
+        self.logger.info(f"Queued {kind} job {job.id}")
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job that has not expired"""
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        """Block up to timeout for a job to finish, then return it"""
+        job = self.get(job_id)
+        if job is not None and timeout > 0:
+            job.done.wait(timeout)
+        return job
+
+    def stream(self, job_id: str, heartbeat: float = 15.0, max_seconds: float = 300.0) -> Iterator[str]:
+        """Yield SSE messages: the current status, keep-alives, then the final job"""
+        job = self.get(job_id)
+        if job is None:
+            return
+        yield f"retry: 5000\nevent: status\ndata: {self.dumps(job.to_dict(include_result=False))}\n\n"
+        deadline = time.monotonic() + max_seconds
+        while not job.done.wait(min(heartbeat, max(0.0, deadline - time.monotonic()))):
+            if time.monotonic() >= deadline:
+                return
+            yield ": keep-alive\n\n"
+        yield f"event: result\ndata: {self.dumps(job.to_dict())}\n\n"
+
+    def stats(self) -> Dict:
+        """Job counts by status"""
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return counts
+
+    def _run(self, job: Job):
+        """Execute a job on a worker thread"""
+        func = self._handlers[job.kind][0]
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = func(job.payload)
+            job.status = SUCCEEDED
+        except Exception as e:
+            self.logger.error(f"{job.kind} job {job.id} failed: {str(e)}")
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if self._active.get(job.request_hash) == job.id:
+                    del self._active[job.request_hash]
+            job.done.set()
+
+    def _purge_expired(self):
+        """Drop finished jobs older than the result TTL (caller holds the lock)"""
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Worker pool, created on first submit"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+        return self._executor
@@ -0,0 +1,265 @@
+"""Shared market data service for TradeRiser.AI
+Batches per-symbol history requests into bulk yfinance downloads and returns
+aligned (dates x tickers) panels that every analyzer can slice from. Daily
+bars are persisted in the local PriceStore so repeat requests only download
+the bars after the last stored timestamp (a split or dividend in those
+bars re-downloads the stored range, so old and new bars share one
+adjustment basis), and when a SharedPricePanel is published workers
+read each ticker's daily history from it without a per-worker copy instead.
+"""
+import os
+import threading
+import time
+import logging
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+import yfinance as yf
+from utils_shared import setup_logging
+from price_store import PriceStore, period_start
+from shared_price_panel import SharedPricePanel
+from Utils.utils_memory_cache import TTLCache
+
+# Setup centralized logging
+setup_logging()
+
+OHLCV_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+ACTION_FIELDS = ['Dividends', 'Stock Splits']
+STORED_INTERVALS = ('1d',)
+
+
+class MarketDataService:
+    """Bulk OHLCV history provider shared by all analyzers"""
+
+    def __init__(self, batch_size: int = None, memo_ttl: int = None, price_store: PriceStore = None,
+                 shared_panel=None):
+        """Initialize with batch size, memo TTL (seconds), local price store and shared panel"""
+        self.logger = logging.getLogger(__name__)
+        self.batch_size = batch_size or int(os.getenv('MARKET_DATA_BATCH_SIZE', 50))
+        self.memo_ttl = memo_ttl if memo_ttl is not None else int(os.getenv('MARKET_DATA_MEMO_TTL', 300))
+        self.price_store = price_store or PriceStore()
+        # Minimum age of stored bars before an incremental refresh is attempted
+        self.store_refresh = int(os.getenv('PRICE_STORE_REFRESH_SECONDS', 900))
+        # None -> attach when PRICE_PANEL_ENABLED, False -> never read the shared panel
+        self.shared_panel = SharedPricePanel.from_env() if shared_panel is None else (shared_panel or None)
+        # "ticker|period|interval" -> frame; LRU-bounded so scans of large universes cannot grow it forever
+        self._memo = TTLCache(max_entries=int(os.getenv('MARKET_DATA_MEMO_MAX_ENTRIES', 2000)),
+                              max_bytes=int(os.getenv('MARKET_DATA_MEMO_MAX_MB', 256)) * 1024 * 1024)
+        self.stats = {'bulk_requests': 0, 'symbols_downloaded': 0, 'memo_hits': 0,
+                      'store_reads': 0, 'panel_hits': 0}
+
+    def get_history(self, tickers: Union[str, List[str]], period: str = '1y',
+                    interval: str = '1d') -> pd.DataFrame:
+        """Get an aligned OHLCV panel with (field, ticker) columns indexed by date"""
+        symbols = self._normalize_tickers(tickers)
+        if not symbols:
+            return pd.DataFrame()
+
+        frames = self._panel_lookup(symbols, period, interval)
+        frames.update(self._memo_lookup([s for s in symbols if s not in frames], period, interval))
+        missing = [s for s in symbols if s not in frames]
+        if missing:
+            frames.update(self._download(missing, period, interval))
+
+        available = {s: frames[s] for s in symbols if s in frames and not frames[s].empty}
+        if not available:
+            return pd.DataFrame()
+        panel = pd.concat(available, axis=1, names=['Ticker', 'Price'])
+        return panel.swaplevel(0, 1, axis=1).sort_index(axis=1, level=0, sort_remaining=False)
+
+    def get_ticker_history(self, ticker: str, period: str = '1y', interval: str = '1d') -> pd.DataFrame:
+        """Get OHLCV history for a single ticker, served from the shared panel when published"""
+        symbol = ticker.strip().upper()
+        frames = self._panel_lookup([symbol], period, interval)
+        if symbol in frames:
+            return frames[symbol]  # Read-only frame over the shared mapping, not copied per request
+        frames = self._memo_lookup([symbol], period, interval)
+        if symbol not in frames:
+            frames = self._download([symbol], period, interval)
+        # Copy so callers cannot modify the memoized frame
+        return frames.get(symbol, pd.DataFrame()).copy()
+
+    def prefetch(self, tickers: List[str], period: str = '1y', interval: str = '1d') -> int:
+        """Warm the memo for many tickers with bulk downloads; returns symbols loaded"""
+        symbols = self._normalize_tickers(tickers)
+        served = self._panel_lookup(symbols, period, interval)
+        served.update(self._memo_lookup([s for s in symbols if s not in served], period, interval))
+        missing = [s for s in symbols if s not in served]
+        if not missing:
+            return 0
+        return len(self._download(missing, period, interval))
+
+    def _download(self, symbols: List[str], period: str, interval: str) -> Dict[str, pd.DataFrame]:
+        """Load symbols (via the local store when possible) and memoize the per-ticker frames"""
+        start = period_start(period) if interval in STORED_INTERVALS else None
+        if self.price_store.enabled and start is not None:
+            frames = self._download_via_store(symbols, period, interval, start)
+        else:
+            frames = self._bulk_download(symbols, interval, period=period)
+
+        for symbol in symbols:
+            # Memoize misses as empty frames so repeated scans don't re-request them
+            self._memo.set(f"{symbol}|{period}|{interval}", frames.get(symbol, pd.DataFrame()), self.memo_ttl)
+        self.logger.info(f"Loaded {len(frames)}/{len(symbols)} symbols ({period}, {interval})")
+        return frames
+
+    def _download_via_store(self, symbols: List[str], period: str, interval: str,
+                            start: pd.Timestamp) -> Dict[str, pd.DataFrame]:
+        """Fetch only missing bars from the vendor, then range-read from the local store"""
+        full_fetch = []
+        incremental: Dict[pd.Timestamp, List[str]] = {}
+        metas = {}
+        now = time.time()
+        for symbol in symbols:
+            meta = metas[symbol] = self.price_store.coverage(symbol, interval)
+            if meta is None or meta['covered_from'] > start:
+                full_fetch.append(symbol)
+            elif now - meta.get('updated_at', 0) >= self.store_refresh:
+                # Symbols sharing a last bar date are refreshed in one bulk request
+                incremental.setdefault(meta['last'], []).append(symbol)
+
+        downloaded = {}
+        if full_fetch:
+            downloaded = self._bulk_download(full_fetch, interval, period=period)
+            for symbol, frame in downloaded.items():
+                self._store_call(self.price_store.replace, symbol, frame, start, interval)
+        readjust: Dict[pd.Timestamp, List[str]] = {}
+        for last, group in incremental.items():
+            tail = self._bulk_download(group, interval, actions=True, start=last.strftime('%Y-%m-%d'))
+            for symbol in group:
+                if symbol not in tail:
+                    # No new bars (weekend/holiday): record the check so we don't re-ask
+                    self._store_call(self.price_store.touch, symbol, interval)
+                elif self._has_corporate_action(tail[symbol], last):
+                    # Stored bars are adjusted as of their download; a split or dividend changes that basis
+                    readjust.setdefault(metas[symbol]['covered_from'], []).append(symbol)
+                else:
+                    bars = tail[symbol][[c for c in OHLCV_FIELDS if c in tail[symbol].columns]]
+                    self._store_call(self.price_store.append, symbol, bars, interval)
+        for covered_from, group in readjust.items():
+            self.logger.info(f"Corporate action for {', '.join(group)}: re-downloading stored history")
+            refreshed = self._bulk_download(group, interval, start=covered_from.strftime('%Y-%m-%d'))
+            for symbol, frame in refreshed.items():
+                self._store_call(self.price_store.replace, symbol, frame, covered_from, interval)
+
+        frames = {}
+        for symbol in symbols:
+            frame = self.price_store.read(symbol, start=start, interval=interval)
+            if frame.empty:
+                frame = downloaded.get(symbol, pd.DataFrame())
+            else:
+                self.stats['store_reads'] += 1
+            if not frame.empty:
+                frames[symbol] = frame[[c for c in OHLCV_FIELDS if c in frame.columns]]
+        return frames
+
+    def _store_call(self, method, symbol: str, *args):
+        """Write to the price store without letting disk errors break the request"""
+        try:
+            method(symbol, *args)
+        except Exception as e:
+            self.logger.error(f"Price store write failed for {symbol}: {str(e)}")
+
+    @staticmethod
+    def _has_corporate_action(frame: pd.DataFrame, after: pd.Timestamp) -> bool:
+        """True when a dividend or split falls after the given (last stored) bar"""
+        index = pd.DatetimeIndex(frame.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        new_bars = frame[index > after]
+        return any((new_bars[c].fillna(0) != 0).any() for c in ACTION_FIELDS if c in new_bars.columns)
+
+    def _bulk_download(self, symbols: List[str], interval: str, actions: bool = False,
+                       **window) -> Dict[str, pd.DataFrame]:
+        """Download symbols from yfinance in batches for a period= or start= window"""
+        frames = {}
+        for start in range(0, len(symbols), self.batch_size):
+            batch = symbols[start:start + self.batch_size]
+            try:
+                raw = yf.download(
+                    tickers=' '.join(batch),
+                    interval=interval,
+                    group_by='column',
+                    auto_adjust=True,
+                    actions=actions,
+                    threads=True,
+                    progress=False,
+                    **window
+                )
+                self.stats['bulk_requests'] += 1
+            except Exception as e:
+                self.logger.error(f"Bulk download failed for {len(batch)} symbols: {str(e)}")
+                continue
+            frames.update(self._split_panel(raw, batch, OHLCV_FIELDS + ACTION_FIELDS if actions else OHLCV_FIELDS))
+        self.stats['symbols_downloaded'] += len(frames)
+        return frames
+
+    def _split_panel(self, raw: pd.DataFrame, batch: List[str],
+                     fields: List[str] = OHLCV_FIELDS) -> Dict[str, pd.DataFrame]:
+        """Split a yfinance bulk result into per-ticker frames of the given fields"""
+        frames = {}
+        if raw is None or raw.empty:
+            return frames
+        if not isinstance(raw.columns, pd.MultiIndex):
+            # Older yfinance returns flat columns for a single symbol
+            raw = pd.concat({batch[0]: raw}, axis=1).swaplevel(0, 1, axis=1)
+        tickers_level = raw.columns.get_level_values(1)
+        for symbol in batch:
+            if symbol not in tickers_level:
+                continue
+            frame = raw.xs(symbol, axis=1, level=1)
+            frame = frame[[c for c in fields if c in frame.columns]]
+            frame = frame.dropna(how='all', subset=[c for c in OHLCV_FIELDS if c in frame.columns])
+            if not frame.empty:
+                frames[symbol] = frame
+        return frames
+
+    def _panel_lookup(self, symbols: List[str], period: str, interval: str) -> Dict[str, pd.DataFrame]:
+        """Slice frames from the shared price panel; not memoized so workers share one copy"""
+        if self.shared_panel is None:
+            return {}
+        start = period_start(period)
+        found = {}
+        for symbol in symbols:
+            if self.shared_panel.covers(symbol, start, interval):
+                frame = self.shared_panel.ticker_history(symbol, start)
+                if not frame.empty:
+                    found[symbol] = frame
+        self.stats['panel_hits'] += len(found)
+        return found
+
+    def _memo_lookup(self, symbols: List[str], period: str, interval: str) -> Dict[str, pd.DataFrame]:
+        """Return memoized frames that are still within the memo TTL"""
+        found = {}
+        for symbol in symbols:
+            frame = self._memo.get(f"{symbol}|{period}|{interval}")
+            if frame is not None:
+                found[symbol] = frame
+        self.stats['memo_hits'] += len(found)
+        return found
+
+    @staticmethod
+    def _normalize_tickers(tickers: Union[str, List[str]]) -> List[str]:
+        """Upper-case, strip and de-duplicate tickers preserving order"""
+        if isinstance(tickers, str):
+            tickers = tickers.replace(',', ' ').split()
+        seen = []
+        for ticker in tickers or []:
+            symbol = str(ticker).strip().upper()
+            if symbol and symbol not in seen:
+                seen.append(symbol)
+        return seen
+
+
+_market_data_service = None
+_service_lock = threading.Lock()
+
+
+def get_market_data_service() -> MarketDataService:
+    """Get the process-wide market data service shared by all analyzers"""
+    global _market_data_service
+    if _market_data_service is None:
+        with _service_lock:
+            if _market_data_service is None:
+                _market_data_service = MarketDataService()
+    return _market_data_service
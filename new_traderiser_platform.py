@@ -1,7 +1,7 @@
 """TradeRiser.AI - Next Generation Financial Platform
 Complete refactor with modern UI and professional financial analysis
 """
-from flask import Flask, render_template_string, request, jsonify
+from flask import Flask, request, jsonify
 from flask_cors import CORS
 import sys
 import os
@@ -10,7 +10,19 @@ import logging
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
-import requests
+from Utils.utils_http import http_get
+from Utils.utils_json import FastJSONProvider
+from ticker_broadcaster import TickerBroadcaster
+from Utils.utils_streams import StreamSlots
+from Utils.utils_fanout import fan_out
+from Utils.utils_rate_limiter import RateLimiter, RateLimitExceeded
+from dashboard_assets import DashboardAssets
+from job_manager import JobManager, JobQueueFull
+from response_cache import ResponseCache
+from quote_service import QuoteService
+from cache_warmer import CacheWarmer
+from security_search import SecuritySearchEngine
+from dataset_loader import DatasetLoader, dataset_property
 
 # Load environment variables with priority: .env.local > .env
 try:
@@ -84,6 +96,7 @@ except ImportError:
     FINNHUB_API_KEY = None
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app, origins="*")
 
 # Configure logging
@@ -136,25 +149,54 @@ def security_headers(response):
         response.headers['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
     return response
 
+@app.errorhandler(RateLimitExceeded)
+def rate_limit_exceeded(error):
+    """Vendor budget spent on a cold cache miss: ask the client to retry instead of failing with 500"""
+    from flask import make_response
+    
+    response = make_response(jsonify({'error': str(error), 'retry_after': round(error.retry_after, 1)}), 429)
+    response.headers['Retry-After'] = str(max(1, int(error.retry_after + 0.999)))
+    return response
+
+# CoinGecko API base (overridable for testing and benchmarks)
+COINGECKO_API_URL = os.getenv('COINGECKO_API_URL', 'https://api.coingecko.com/api/v3')
+
+# Map common symbols to CoinGecko IDs
+COINGECKO_SYMBOL_IDS = {
+    'BTC': 'bitcoin', 'ETH': 'ethereum', 'XRP': 'ripple', 'ADA': 'cardano',
+    'DOT': 'polkadot', 'LINK': 'chainlink', 'LTC': 'litecoin', 'BCH': 'bitcoin-cash',
+    'XLM': 'stellar', 'DOGE': 'dogecoin', 'SOL': 'solana', 'MATIC': 'matic-network'
+}
+
+def coingecko_coin_id(symbol: str) -> str:
+    """CoinGecko id for a crypto symbol"""
+    return COINGECKO_SYMBOL_IDS.get(symbol.upper(), symbol.lower())
+
+def coingecko_price_url(coin_id: str) -> str:
+    """CoinGecko simple price URL (USD price and 24h change)"""
+    return f"{COINGECKO_API_URL}/simple/price?ids={coin_id}&vs_currencies=usd&include_24hr_change=true"
+
+def coingecko_history_url(coin_id: str) -> str:
+    """CoinGecko 7-day price history URL"""
+    return f"{COINGECKO_API_URL}/coins/{coin_id}/market_chart?vs_currency=usd&days=7"
+
 def generate_crypto_recommendation(current_price: float, change_24h: float, symbol: str) -> dict:
     """Generate Buy/Hold/Sell recommendation for cryptocurrency based on technical analysis"""
     try:
-        # Fetch additional market data for better analysis
-        symbol_mapping = {
-            'BTC': 'bitcoin', 'ETH': 'ethereum', 'XRP': 'ripple', 'ADA': 'cardano',
-            'DOT': 'polkadot', 'LINK': 'chainlink', 'LTC': 'litecoin', 'BCH': 'bitcoin-cash',
-            'XLM': 'stellar', 'DOGE': 'dogecoin', 'SOL': 'solana', 'MATIC': 'matic-network'
-        }
-        
-        coin_id = symbol_mapping.get(symbol, symbol.lower())
-        
         # Get 7-day price history for trend analysis
-        history_url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart?vs_currency=usd&days=7"
-        response = requests.get(history_url, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            prices = [price[1] for price in data['prices']]
+        response = http_get(coingecko_history_url(coingecko_coin_id(symbol)), timeout=10)
+        history = response.json() if response.status_code == 200 else None
+    except Exception as e:
+        logger.error(f"Error generating recommendation for {symbol}: {e}")
+        return {'action': 'HOLD', 'confidence': 50, 'reasoning': 'Unable to analyze market data', 'score': 0}
+    return score_crypto_recommendation(current_price, change_24h, symbol, history)
+
+def score_crypto_recommendation(current_price: float, change_24h: float, symbol: str,
+                                history: Optional[Dict]) -> dict:
+    """Score a recommendation from the 24h change and, when available, the 7-day history"""
+    try:
+        if history is not None:
+            prices = [price[1] for price in history['prices']]
             
             # Calculate technical indicators
             if len(prices) >= 7:
@@ -259,27 +301,131 @@ def generate_crypto_recommendation(current_price: float, change_24h: float, symb
         logger.error(f"Error generating recommendation for {symbol}: {e}")
         return {'action': 'HOLD', 'confidence': 50, 'reasoning': 'Unable to analyze market data', 'score': 0}
 
+# Top tickers shown on the dashboard (5 per category, 20 total)
+TOP_TICKER_LISTS = {
+    'djia': ['AAPL', 'MSFT', 'UNH', 'GS', 'HD'],
+    'nasdaq': ['GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA'],
+    'sp': ['JPM', 'JNJ', 'V', 'PG', 'MA'],
+    'crypto': ['BTC-USD', 'ETH-USD', 'BNB-USD', 'XRP-USD', 'ADA-USD']
+}
+
+def fetch_ticker_quote(ticker: str) -> dict:
+    """Fetch current price and daily change for one ticker (Finnhub for stocks, YFinance otherwise)"""
+    if 'USD' in ticker:  # Crypto
+        stock = yf.Ticker(ticker)
+        info = stock.info
+        hist = stock.history(period='1d')
+        if not hist.empty:
+            current_price = hist['Close'].iloc[-1]
+            prev_close = info.get('previousClose', current_price)
+            change_percent = ((current_price - prev_close) / prev_close * 100) if prev_close else 0
+            return {'current_price': float(current_price), 'change_percent': float(change_percent)}
+    elif FINNHUB_API_KEY:
+        quote = finnhub_client.quote(ticker)
+        return {'current_price': quote.get('c', 0), 'change_percent': quote.get('dp', 0)}
+    else:
+        # Fallback to YFinance
+        stock = yf.Ticker(ticker)
+        hist = stock.history(period='1d')
+        if not hist.empty:
+            current_price = hist['Close'].iloc[-1]
+            prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
+            change_percent = ((current_price - prev_close) / prev_close * 100) if prev_close else 0
+            return {'current_price': float(current_price), 'change_percent': float(change_percent)}
+    return {'current_price': 0, 'change_percent': 0}
+
+# Long-lived SSE responses each hold a server thread; the cap follows SERVER_THREADS
+stream_slots = StreamSlots()
+
+# One refresher per process serves every dashboard tab
+ticker_broadcaster = TickerBroadcaster(TOP_TICKER_LISTS, fetch_ticker_quote, slots=stream_slots)
+
+# Cache-first batch quotes for /api/quotes
+quote_service = QuoteService(finnhub_client if FINNHUB_AVAILABLE else None, yf,
+                             finnhub_api_key=FINNHUB_API_KEY if FINNHUB_AVAILABLE else None,
+                             rate_limiter=RateLimiter.from_env())
+
+# FinanceDatabase dataset attribute -> class name
+FINANCE_DATABASE_CLASSES = {
+    'equities': 'Equities',
+    'etfs': 'ETFs',
+    'funds': 'Funds',
+    'indices': 'Indices',
+    'currencies': 'Currencies',
+    'cryptocurrencies': 'Cryptocurrencies'
+}
+
+# /api/search-securities and /api/autocomplete asset types -> FinanceDatabase dataset
+SEARCH_ASSET_TYPES = {
+    'equities': 'equities',
+    'etfs': 'etfs',
+    'funds': 'funds',
+    'crypto': 'cryptocurrencies',
+    'indices': 'indices',
+    'currencies': 'currencies'
+}
+AUTOCOMPLETE_BUDGET_MS = float(os.getenv('AUTOCOMPLETE_BUDGET_MS', 25))
+AUTOCOMPLETE_MAX_RESULTS = int(os.getenv('AUTOCOMPLETE_MAX_RESULTS', 20))
+
 class FinancialLibrariesIntegration:
     """Integration wrapper for advanced financial libraries"""
     
+    equities = dataset_property('equities')
+    etfs = dataset_property('etfs')
+    funds = dataset_property('funds')
+    indices = dataset_property('indices')
+    currencies = dataset_property('currencies')
+    cryptocurrencies = dataset_property('cryptocurrencies')
+    
     def __init__(self):
-        # Initialize FinanceDatabase components
-        if FINANCEDATABASE_AVAILABLE and fd:
-            try:
-                self.equities = fd.Equities() if hasattr(fd, 'Equities') else None
-                self.etfs = fd.ETFs() if hasattr(fd, 'ETFs') else None
-                self.funds = fd.Funds() if hasattr(fd, 'Funds') else None
-                self.indices = fd.Indices() if hasattr(fd, 'Indices') else None
-                self.currencies = fd.Currencies() if hasattr(fd, 'Currencies') else None
-                self.cryptocurrencies = fd.Cryptocurrencies() if hasattr(fd, 'Cryptocurrencies') else None
-            except Exception as e:
-                logger.warning(f"Some FinanceDatabase components not available: {e}")
-                self.equities = self.etfs = self.funds = self.indices = self.currencies = self.cryptocurrencies = None
-        else:
-            self.equities = self.etfs = self.funds = self.indices = self.currencies = self.cryptocurrencies = None
+        # FinanceDatabase datasets are large, so they load in a background thread
+        # (FINANCEDATABASE_WARMUP=background) or on first use (lazy) instead of at import
+        builders = {
+            name: getattr(fd, cls) if FINANCEDATABASE_AVAILABLE and fd and hasattr(fd, cls) else None
+            for name, cls in FINANCE_DATABASE_CLASSES.items()
+        }
+        self.datasets = DatasetLoader(
+            builders,
+            preload=[name.strip() for name in
+                     os.getenv('FINANCEDATABASE_PRELOAD', 'equities,etfs,funds,cryptocurrencies').split(',')],
+            mode=os.getenv('FINANCEDATABASE_WARMUP', 'background').lower(),
+            on_loaded=self._build_search_engine
+        )
+        self._search_engines = {}
         
         logger.info("Financial Libraries Integration initialized successfully")
     
+    def get_dataset(self, name: str):
+        """Loaded FinanceDatabase dataset, or None while it loads in the background"""
+        # Never block a request on a dataset load; callers fall back to Finnhub/YFinance meanwhile
+        return self.datasets.get(name)
+    
+    def start_warmup(self):
+        """Load the preloaded datasets one after another in a background thread"""
+        self.datasets.start_warmup()
+    
+    def readiness(self) -> Dict:
+        """Dataset load states and whether the preloaded ones have settled"""
+        status = self.datasets.readiness()
+        status['search_engines'] = sorted(self._search_engines)
+        return status
+    
+    def _build_search_engine(self, name: str, dataset):
+        """Index a loaded dataset for in-memory search; the top tickers rank as most popular"""
+        try:
+            popular = [t for tick_list in TOP_TICKER_LISTS.values() for t in tick_list]
+            self._search_engines[name] = SecuritySearchEngine.from_frame(dataset.select(), popular)
+        except Exception as e:
+            logger.warning(f"Search engine for FinanceDatabase {name} not built: {e}")
+    
+    def search_engine(self, asset_type: str) -> Optional[SecuritySearchEngine]:
+        """Search engine for an asset type, or None while its dataset loads in the background"""
+        name = SEARCH_ASSET_TYPES.get(asset_type, 'equities')
+        engine = self._search_engines.get(name)
+        if engine is None:
+            self.get_dataset(name)  # Starts the load on first use
+        return engine
+    
     def get_comprehensive_analysis(self, tickers: List[str], period: str = "5y") -> Dict:
         """Get comprehensive financial analysis using Finnhub, FinanceToolkit or YFinance"""
         # Try Finnhub first for real-time data
@@ -317,7 +463,7 @@ class FinancialLibrariesIntegration:
             return self._get_yfinance_analysis(tickers)
     
     def search_securities(self, query: str, asset_type: str = "equities") -> Dict:
-        """Search securities using Finnhub with fallbacks to FinanceDatabase and YFinance"""
+        """Search securities using Finnhub with a fallback to the in-memory FinanceDatabase search engine"""
         try:
             # Try Finnhub first for real-time data
             if FINNHUB_AVAILABLE:
@@ -325,26 +471,11 @@ class FinancialLibrariesIntegration:
                 if results:
                     return results
             
-            # Fallback to FinanceDatabase
-            results = None
-            if asset_type == "equities" and self.equities:
-                results = self.equities.search(query)
-            elif asset_type == "etfs" and self.etfs:
-                results = self.etfs.search(query)
-            elif asset_type == "funds" and self.funds:
-                results = self.funds.search(query)
-            elif asset_type == "crypto" and self.cryptocurrencies:
-                results = self.cryptocurrencies.search(query)
-            elif self.equities:
-                results = self.equities.search(query)
-            
-            if results is not None and hasattr(results, 'head'):
-                return results.head(20).to_dict('records')
-            else:
-                return self._get_yfinance_search_results(query, asset_type)
+            # Fallback to the typo-tolerant local engine (no vendor calls per keystroke)
+            return self._get_local_search_results(query, asset_type)
         except Exception as e:
             logger.error(f"Error searching securities: {e}")
-            return self._get_yfinance_search_results(query, asset_type)
+            return self._get_fallback_search_results(query, asset_type)
     
     def get_etf_analysis(self, etf_tickers: List[str]) -> Dict:
         """Get ETF analysis using Finnhub with fallbacks to The Passive Investor and YFinance"""
@@ -469,78 +600,86 @@ class FinancialLibrariesIntegration:
             'data_source': 'Finnhub (Real-Time Data)'
         }
         
+        # Three Finnhub calls per ticker, fanned out across tickers under one deadline
+        fetched = fan_out(self._fetch_finnhub_ticker, tickers)
         for ticker in tickers:
-            try:
-                # Get real-time quote
-                quote = finnhub_client.quote(ticker)
-                
-                # Get company profile
-                profile = finnhub_client.company_profile2(symbol=ticker)
-                
-                # Get basic financials
-                financials = finnhub_client.company_basic_financials(ticker, 'all')
-                
-                # Current price and basic info
-                analysis_result['current_prices'][ticker] = {
-                    'current_price': quote.get('c', 0),  # Current price
-                    'change': quote.get('d', 0),  # Change
-                    'percent_change': quote.get('dp', 0),  # Percent change
-                    'high': quote.get('h', 0),  # High price of the day
-                    'low': quote.get('l', 0),  # Low price of the day
-                    'open': quote.get('o', 0),  # Open price of the day
-                    'previous_close': quote.get('pc', 0)  # Previous close price
-                }
-                
-                # Company profile
-                analysis_result['company_profiles'][ticker] = {
-                    'name': profile.get('name', ticker),
-                    'country': profile.get('country', 'N/A'),
-                    'currency': profile.get('currency', 'USD'),
-                    'exchange': profile.get('exchange', 'N/A'),
-                    'industry': profile.get('finnhubIndustry', 'N/A'),
-                    'market_cap': profile.get('marketCapitalization', 0),
-                    'share_outstanding': profile.get('shareOutstanding', 0),
-                    'website': profile.get('weburl', 'N/A')
-                }
-                
-                # Financial ratios from Finnhub
-                metrics = financials.get('metric', {})
-                analysis_result['ratios'][ticker] = {
-                    'pe_ratio': metrics.get('peBasicExclExtraTTM', 0),
-                    'pe_forward': metrics.get('peNormalizedAnnual', 0),
-                    'price_to_book': metrics.get('pbAnnual', 0),
-                    'price_to_sales': metrics.get('psAnnual', 0),
-                    'debt_to_equity': metrics.get('totalDebt/totalEquityAnnual', 0),
-                    'return_on_equity': metrics.get('roeRfy', 0),
-                    'return_on_assets': metrics.get('roaRfy', 0),
-                    'profit_margin': metrics.get('netProfitMarginAnnual', 0),
-                    'gross_margin': metrics.get('grossMarginAnnual', 0)
-                }
-                
-                # Performance metrics
-                analysis_result['performance'][ticker] = {
-                    'beta': metrics.get('beta', 1.0),
-                    '52_week_high': metrics.get('52WeekHigh', 0),
-                    '52_week_low': metrics.get('52WeekLow', 0),
-                    '52_week_return': metrics.get('52WeekPriceReturnDaily', 0),
-                    'ytd_return': metrics.get('ytdPriceReturnDaily', 0),
-                    '1_year_return': metrics.get('1YearPriceReturnDaily', 0)
-                }
-                
-                # Risk metrics
-                analysis_result['risk_metrics'][ticker] = {
-                    'beta': metrics.get('beta', 1.0),
-                    'volatility': metrics.get('epsGrowth5Y', 0),  # Using as proxy
-                    'dividend_yield': metrics.get('dividendYieldIndicatedAnnual', 0)
-                }
-                
-            except Exception as e:
-                logger.warning(f"Error getting Finnhub data for {ticker}: {e}")
+            if ticker in fetched.results:
+                for section, values in fetched.results[ticker].items():
+                    analysis_result[section][ticker] = values
+            elif ticker in fetched.errors:
+                logger.warning(f"Error getting Finnhub data for {ticker}: {fetched.errors[ticker]}")
                 # Add minimal data for failed tickers
-                analysis_result['current_prices'][ticker] = {'error': str(e)}
+                analysis_result['current_prices'][ticker] = {'error': fetched.errors[ticker]}
+            else:
+                analysis_result['current_prices'][ticker] = {'error': 'Timed out', 'pending': True}
+        analysis_result['partial'] = fetched.partial
+        analysis_result['pending_tickers'] = fetched.pending
         
         return analysis_result
     
+    def _fetch_finnhub_ticker(self, ticker: str) -> Dict:
+        """Fetch quote, profile and basic financials for one ticker from Finnhub"""
+        # Get real-time quote
+        quote = finnhub_client.quote(ticker)
+        
+        # Get company profile
+        profile = finnhub_client.company_profile2(symbol=ticker)
+        
+        # Get basic financials
+        financials = finnhub_client.company_basic_financials(ticker, 'all')
+        metrics = financials.get('metric', {})
+        
+        return {
+            # Current price and basic info
+            'current_prices': {
+                'current_price': quote.get('c', 0),  # Current price
+                'change': quote.get('d', 0),  # Change
+                'percent_change': quote.get('dp', 0),  # Percent change
+                'high': quote.get('h', 0),  # High price of the day
+                'low': quote.get('l', 0),  # Low price of the day
+                'open': quote.get('o', 0),  # Open price of the day
+                'previous_close': quote.get('pc', 0)  # Previous close price
+            },
+            # Company profile
+            'company_profiles': {
+                'name': profile.get('name', ticker),
+                'country': profile.get('country', 'N/A'),
+                'currency': profile.get('currency', 'USD'),
+                'exchange': profile.get('exchange', 'N/A'),
+                'industry': profile.get('finnhubIndustry', 'N/A'),
+                'market_cap': profile.get('marketCapitalization', 0),
+                'share_outstanding': profile.get('shareOutstanding', 0),
+                'website': profile.get('weburl', 'N/A')
+            },
+            # Financial ratios from Finnhub
+            'ratios': {
+                'pe_ratio': metrics.get('peBasicExclExtraTTM', 0),
+                'pe_forward': metrics.get('peNormalizedAnnual', 0),
+                'price_to_book': metrics.get('pbAnnual', 0),
+                'price_to_sales': metrics.get('psAnnual', 0),
+                'debt_to_equity': metrics.get('totalDebt/totalEquityAnnual', 0),
+                'return_on_equity': metrics.get('roeRfy', 0),
+                'return_on_assets': metrics.get('roaRfy', 0),
+                'profit_margin': metrics.get('netProfitMarginAnnual', 0),
+                'gross_margin': metrics.get('grossMarginAnnual', 0)
+            },
+            # Performance metrics
+            'performance': {
+                'beta': metrics.get('beta', 1.0),
+                '52_week_high': metrics.get('52WeekHigh', 0),
+                '52_week_low': metrics.get('52WeekLow', 0),
+                '52_week_return': metrics.get('52WeekPriceReturnDaily', 0),
+                'ytd_return': metrics.get('ytdPriceReturnDaily', 0),
+                '1_year_return': metrics.get('1YearPriceReturnDaily', 0)
+            },
+            # Risk metrics
+            'risk_metrics': {
+                'beta': metrics.get('beta', 1.0),
+                'volatility': metrics.get('epsGrowth5Y', 0),  # Using as proxy
+                'dividend_yield': metrics.get('dividendYieldIndicatedAnnual', 0)
+            }
+        }
+    
     def _get_finnhub_etf_analysis(self, etf_tickers: List[str]) -> Dict:
         """Get real ETF data using Finnhub API"""
         if not FINNHUB_AVAILABLE:
@@ -590,7 +729,7 @@ class FinancialLibrariesIntegration:
     def _get_finnhub_search_results(self, query: str, asset_type: str) -> List[Dict]:
         """Search for securities using Finnhub symbol lookup"""
         if not FINNHUB_AVAILABLE:
-            return self._get_yfinance_search_results(query, asset_type)
+            return self._get_local_search_results(query, asset_type)
         
         try:
             # Use Finnhub symbol lookup
@@ -626,7 +765,7 @@ class FinancialLibrariesIntegration:
             
         except Exception as e:
             logger.warning(f"Error in Finnhub search: {e}")
-            return self._get_yfinance_search_results(query, asset_type)
+            return self._get_local_search_results(query, asset_type)
     
     def _get_yfinance_etf_analysis(self, etf_tickers: List[str]) -> Dict:
         """Get real ETF data using YFinance"""
@@ -672,39 +811,12 @@ class FinancialLibrariesIntegration:
             'data_source': 'YFinance (Real Data)'
         }
     
-    def _get_yfinance_search_results(self, query: str, asset_type: str) -> List[Dict]:
-        """Search for securities using YFinance validation"""
-        if not YFINANCE_AVAILABLE:
+    def _get_local_search_results(self, query: str, asset_type: str, limit: int = 20) -> List[Dict]:
+        """Ranked matches from the in-memory search engine (symbols, names, typos)"""
+        engine = self.search_engine(asset_type)
+        if engine is None:
             return self._get_fallback_search_results(query, asset_type)
-        
-        # Try to validate the query as a ticker symbol
-        search_results = []
-        potential_tickers = [query.upper(), f"{query.upper()}.TO", f"{query.upper()}.L"]
-        
-        for ticker in potential_tickers:
-            try:
-                stock = yf.Ticker(ticker)
-                info = stock.info
-                
-                # Check if we got valid data
-                if info.get('longName') or info.get('shortName'):
-                    search_results.append({
-                        'symbol': ticker,
-                        'name': info.get('longName', info.get('shortName', ticker)),
-                        'sector': info.get('sector', 'N/A'),
-                        'industry': info.get('industry', 'N/A'),
-                        'market_cap': info.get('marketCap', 0),
-                        'current_price': info.get('currentPrice', 0)
-                    })
-                    break  # Found valid ticker, stop searching
-            except:
-                continue
-        
-        # If no results found, return fallback
-        if not search_results:
-            return self._get_fallback_search_results(query, asset_type)
-        
-        return search_results
+        return engine.search(query, limit)
     
     def _get_fallback_search_results(self, query: str, asset_type: str) -> List[Dict]:
         """Return empty results when FinanceDatabase is not available - no fallback data"""
@@ -712,22 +824,34 @@ class FinancialLibrariesIntegration:
 
 # Initialize Financial Libraries Integration
 financial_integration = FinancialLibrariesIntegration()
+response_cache = ResponseCache()
 
 @app.route('/')
 def index():
-    """Modern TradeRiser dashboard"""
-    logger.info("Rendering new modern interface")
-    return render_template_string(MODERN_DASHBOARD_TEMPLATE)
+    """Modern TradeRiser dashboard (prebuilt and precompressed at startup)"""
+    return dashboard_assets.page_response(request)
+
+@app.route('/assets/<path:name>')
+def dashboard_asset(name):
+    """Fingerprinted dashboard CSS/JS with immutable caching"""
+    response = dashboard_assets.asset_response(name, request)
+    if response is None:
+        return jsonify({'error': 'Asset not found'}), 404
+    return response
 
 @app.route('/api/comprehensive-analysis', methods=['POST'])
+@response_cache.cached('comprehensive-analysis', 'intraday')
 def comprehensive_analysis():
     """Comprehensive financial analysis using FinanceToolkit"""
     try:
         data = request.get_json()
-        tickers = data.get('tickers', [])
+        # Canonical symbols so cached responses match any casing of the request
+        tickers = [str(t).strip().upper() for t in data.get('tickers', [])]
         
         if not tickers:
             return jsonify({'error': 'No tickers provided'}), 400
+        if request.args.get('async') == '1':
+            return submit_job('comprehensive-analysis', data)
         
         analysis = financial_integration.get_comprehensive_analysis(tickers)
         return jsonify(analysis)
@@ -750,12 +874,36 @@ def search_securities():
         logger.error(f"Error searching securities: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/autocomplete', methods=['GET'])
+def autocomplete():
+    """Top-k security suggestions from the in-memory search engine (?q=appl&type=equities&limit=10)"""
+    try:
+        started = datetime.now()
+        query = request.args.get('q', request.args.get('query', ''))
+        asset_type = request.args.get('type', 'equities')
+        limit = max(1, min(request.args.get('limit', 10, type=int), AUTOCOMPLETE_MAX_RESULTS))
+        
+        engine = financial_integration.search_engine(asset_type)
+        results = engine.search(query, limit, budget_ms=AUTOCOMPLETE_BUDGET_MS) if engine else []
+        return jsonify({
+            'query': query,
+            'type': asset_type,
+            'results': results,
+            'ready': engine is not None,
+            'elapsed_ms': round((datetime.now() - started).total_seconds() * 1000, 2)
+        })
+    
+    except Exception as e:
+        logger.error(f"Error in autocomplete: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/etf-analysis', methods=['POST'])
+@response_cache.cached('etf-analysis', 'fundamentals')
 def etf_analysis():
     """ETF analysis using The Passive Investor"""
     try:
         data = request.get_json()
-        etf_tickers = data.get('etf_tickers', [])
+        etf_tickers = [str(t).strip().upper() for t in data.get('etf_tickers', [])]
         
         if not etf_tickers:
             return jsonify({'error': 'No ETF tickers provided'}), 400
@@ -769,219 +917,203 @@ def etf_analysis():
 
 @app.route('/api/tickers', methods=['GET'])
 def get_tickers_api():
-    """Get ticker data for top tickers display - always fresh data"""
+    """Get ticker data for top tickers display from the shared broadcaster snapshot"""
     try:
-        # Disable caching to ensure fresh data
         from flask import make_response
         
-        def add_no_cache_headers(response):
-            response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-            response.headers['Pragma'] = 'no-cache'
-            response.headers['Expires'] = '0'
-            return response
-        category = request.args.get('category', 'all')
-        
-        # Define top 5 ticker lists for each category (20 total tickers)
-        ticker_lists = {
-            'djia': ['AAPL', 'MSFT', 'UNH', 'GS', 'HD'],
-            'nasdaq': ['GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA'],
-            'sp': ['JPM', 'JNJ', 'V', 'PG', 'MA'],
-            'crypto': ['BTC-USD', 'ETH-USD', 'BNB-USD', 'XRP-USD', 'ADA-USD']
-        }
-        
-        if category.lower() in ticker_lists:
-            tickers = ticker_lists[category.lower()]
-        else:
-            # Return all categories
-            results = {}
-            for cat, tick_list in ticker_lists.items():
-                results[cat] = {}
-                for ticker in tick_list:
-                    try:
-                        if 'USD' in ticker:  # Crypto
-                            # Use YFinance for crypto
-                            import yfinance as yf
-                            stock = yf.Ticker(ticker)
-                            info = stock.info
-                            hist = stock.history(period='1d')
-                            if not hist.empty:
-                                current_price = hist['Close'].iloc[-1]
-                                prev_close = info.get('previousClose', current_price)
-                                change_percent = ((current_price - prev_close) / prev_close * 100) if prev_close else 0
-                                results[cat][ticker] = {
-                                    'current_price': float(current_price),
-                                    'change_percent': float(change_percent)
-                                }
-                        else:
-                            # Use Finnhub for stocks
-                            if FINNHUB_API_KEY:
-                                quote = finnhub_client.quote(ticker)
-                                results[cat][ticker] = {
-                                    'current_price': quote.get('c', 0),
-                                    'change_percent': quote.get('dp', 0)
-                                }
-                            else:
-                                # Fallback to YFinance
-                                import yfinance as yf
-                                stock = yf.Ticker(ticker)
-                                hist = stock.history(period='1d')
-                                if not hist.empty:
-                                    current_price = hist['Close'].iloc[-1]
-                                    prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-                                    change_percent = ((current_price - prev_close) / prev_close * 100) if prev_close else 0
-                                    results[cat][ticker] = {
-                                        'current_price': float(current_price),
-                                        'change_percent': float(change_percent)
-                                    }
-                    except Exception as e:
-                        logger.error(f"Error fetching ticker {ticker}: {str(e)}")
-                        results[cat][ticker] = {
-                            'current_price': 0,
-                            'change_percent': 0
-                        }
-            return jsonify(results)
-        
-        # Single category request
-        results = {}
-        for ticker in tickers:
-            try:
-                if 'USD' in ticker:  # Crypto
-                    import yfinance as yf
-                    stock = yf.Ticker(ticker)
-                    info = stock.info
-                    hist = stock.history(period='1d')
-                    if not hist.empty:
-                        current_price = hist['Close'].iloc[-1]
-                        prev_close = info.get('previousClose', current_price)
-                        change_percent = ((current_price - prev_close) / prev_close * 100) if prev_close else 0
-                        results[ticker] = {
-                            'current_price': float(current_price),
-                            'change_percent': float(change_percent)
-                        }
-                else:
-                    # Use Finnhub for stocks
-                    if FINNHUB_API_KEY:
-                        quote = finnhub_client.quote(ticker)
-                        results[ticker] = {
-                            'current_price': quote.get('c', 0),
-                            'change_percent': quote.get('dp', 0)
-                        }
-                    else:
-                        # Fallback to YFinance
-                        import yfinance as yf
-                        stock = yf.Ticker(ticker)
-                        hist = stock.history(period='1d')
-                        if not hist.empty:
-                            current_price = hist['Close'].iloc[-1]
-                            prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-                            change_percent = ((current_price - prev_close) / prev_close * 100) if prev_close else 0
-                            results[ticker] = {
-                                'current_price': float(current_price),
-                                'change_percent': float(change_percent)
-                            }
-            except Exception as e:
-                logger.error(f"Error fetching ticker {ticker}: {str(e)}")
-                results[ticker] = {
-                    'current_price': 0,
-                    'change_percent': 0
-                }
+        category = request.args.get('category', 'all').lower()
+        if category not in TOP_TICKER_LISTS:
+            category = None  # Return all categories
         
+        version, results = ticker_broadcaster.snapshot(category)
         response = make_response(jsonify(results))
-        return add_no_cache_headers(response)
+        # Clients revalidate every time but unchanged snapshots cost a 304
+        response.headers['Cache-Control'] = 'no-cache'
+        response.set_etag(f"tickers-{category or 'all'}-{version}")
+        return response.make_conditional(request)
     except Exception as e:
         logger.error(f"Tickers API error: {str(e)}")
         error_response = make_response(jsonify({'error': 'Failed to fetch ticker data'}), 500)
-        return add_no_cache_headers(error_response)
+        error_response.headers['Cache-Control'] = 'no-store'
+        return error_response
+
+@app.route('/api/tickers/stream', methods=['GET'])
+def stream_tickers_api():
+    """Server-Sent-Events stream of the ticker snapshot followed by deltas"""
+    from flask import Response, stream_with_context
+    
+    category = request.args.get('category', 'all').lower()
+    if category not in TOP_TICKER_LISTS:
+        category = None
+    if not ticker_broadcaster.acquire_client():
+        # Clients fall back to polling /api/tickers
+        return jsonify({'error': 'Too many ticker streams, poll /api/tickers instead'}), 503
+    
+    def generate():
+        try:
+            yield from ticker_broadcaster.stream(category)
+        finally:
+            ticker_broadcaster.release_client()
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Disable proxy buffering
+    return response
+
+def _market_data_prefetch(periods: List[str]):
+    """Warm function bulk-loading history for a batch over the given periods"""
+    def warm(batch: List[str]) -> int:
+        from market_data_service import get_market_data_service
+        service = get_market_data_service()
+        for period in periods:
+            service.prefetch(batch, period=period)
+        # Symbols yfinance returned nothing for are memoized as empty frames
+        return sum(1 for symbol in batch if not service.get_ticker_history(symbol, period=periods[0]).empty)
+    return warm
+
+def _etf_universe() -> List[str]:
+    from etf_analyzer import ETFAnalyzer
+    return list(ETFAnalyzer().etf_universe) + ['SPY']
+
+def _commodities_universe() -> List[str]:
+    from commodities_trader import CommoditiesTrader
+    return list(CommoditiesTrader().commodities_universe)
+
+def _crypto_universe() -> List[str]:
+    from enhanced_crypto_trader import EnhancedCryptoTrader
+    return list(EnhancedCryptoTrader().crypto_universe)[:int(os.getenv('CACHE_WARMUP_CRYPTO_TOP', 20))]
+
+# Popular symbols are loaded before /ready reports the worker ready
+cache_warmer = CacheWarmer()
+# /api/tickers serves the broadcaster snapshot, so warm that rather than a quote cache
+cache_warmer.add_step('top_tickers',
+                      lambda: [t for tick_list in TOP_TICKER_LISTS.values() for t in tick_list],
+                      ticker_broadcaster.warm)
+# Same history windows the analyzers request
+cache_warmer.add_step('etf_universe', _etf_universe, _market_data_prefetch(['2y', '1y']))
+cache_warmer.add_step('commodities_universe', _commodities_universe, _market_data_prefetch(['1y']))
+cache_warmer.add_step('crypto_universe', _crypto_universe, _market_data_prefetch(['30d']))
+
+@app.route('/api/quotes', methods=['GET'])
+def get_quotes_api():
+    """Quotes for many symbols in one columnar response (?symbols=AAPL,MSFT,BTC-USD)"""
+    try:
+        symbols = [s for s in request.args.get('symbols', '').split(',') if s.strip()]
+        if not symbols:
+            return jsonify({'error': 'No symbols provided'}), 400
+        if len(symbols) > quote_service.max_symbols:
+            return jsonify({'error': f'At most {quote_service.max_symbols} symbols per request'}), 400
+        return jsonify(quote_service.get_quotes(symbols))
+    except Exception as e:
+        logger.error(f"Quotes API error: {str(e)}")
+        return jsonify({'error': 'Failed to fetch quotes'}), 500
+
+@app.before_request
+def start_background_warmup():
+    """Begin loading FinanceDatabase and warming caches once the server is taking requests"""
+    financial_integration.start_warmup()
+    cache_warmer.start()
+
+@app.route('/ready')
+def readiness_check():
+    """Readiness probe: 503 until the preloaded datasets and cache warmup have finished"""
+    status = financial_integration.readiness()
+    status['warmup'] = cache_warmer.status()
+    status['ready'] = status['ready'] and status['warmup']['ready']
+    return jsonify(status), 200 if status['ready'] else 503
 
 @app.route('/health')
 def health_check():
-    """Health check endpoint"""
+    """Liveness check endpoint"""
     return jsonify({
         'status': 'healthy',
         'platform': 'TradeRiser.AI Next Generation',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        'response_cache': response_cache.stats()
     })
 
 @app.route('/api/crypto/analyze', methods=['POST'])
+@response_cache.cached('crypto-analyze', 'quotes')
 def analyze_crypto():
     try:
         data = request.json
         symbols = data.get('symbols', [])
         holdings = data.get('holdings', [])
-        analysis_type = data.get('analysis_type', 'portfolio')
         
         if not symbols:
             return jsonify({'error': 'No crypto symbols provided'})
         
-        # Real crypto analysis using CoinGecko API
-        total_value = 0
-        total_change_weighted = 0
-        crypto_data = {}
-        
-        # Map common symbols to CoinGecko IDs
-        symbol_mapping = {
-            'BTC': 'bitcoin', 'ETH': 'ethereum', 'XRP': 'ripple', 'ADA': 'cardano',
-            'DOT': 'polkadot', 'LINK': 'chainlink', 'LTC': 'litecoin', 'BCH': 'bitcoin-cash',
-            'XLM': 'stellar', 'DOGE': 'dogecoin', 'SOL': 'solana', 'MATIC': 'matic-network'
-        }
-        
-        for i, symbol in enumerate(symbols):
+        def fetch_position(position):
+            """Price one holding; returns (data, None) or (None, error message)"""
+            i, symbol = position
             try:
-                coin_id = symbol_mapping.get(symbol.upper(), symbol.lower())
-                
                 # Fetch real-time data from CoinGecko
-                url = f"https://api.coingecko.com/api/v3/simple/price?ids={coin_id}&vs_currencies=usd&include_24hr_change=true"
-                response = requests.get(url, timeout=10)
+                coin_id = coingecko_coin_id(symbol)
+                response = http_get(coingecko_price_url(coin_id), timeout=10)
+                if response.status_code != 200:
+                    return None, f'Failed to fetch data for {symbol}'
+                price_data = response.json()
+                if coin_id not in price_data:
+                    return None, f'Cryptocurrency {symbol} not found'
                 
-                if response.status_code == 200:
-                    price_data = response.json()
-                    if coin_id in price_data:
-                        current_price = price_data[coin_id]['usd']
-                        change_24h = price_data[coin_id].get('usd_24h_change', 0)
-                        
-                        # Calculate value based on holdings or assume 1 unit
-                        holding_amount = float(holdings[i]) if holdings and i < len(holdings) and holdings[i] else 1
-                        value = current_price * holding_amount
-                        
-                        total_value += value
-                        total_change_weighted += (change_24h * value)
-                        
-                        # Generate individual trading recommendation
-                        recommendation = generate_crypto_recommendation(current_price, change_24h, symbol.upper())
-                        
-                        crypto_data[symbol.upper()] = {
-                            'price': current_price,
-                            'change_24h': change_24h,
-                            'holding': holding_amount,
-                            'value': value,
-                            'recommendation': recommendation['action'],
-                            'confidence': recommendation['confidence'],
-                            'reasoning': recommendation['reasoning']
-                        }
-                    else:
-                        return jsonify({'error': f'Cryptocurrency {symbol} not found'})
-                else:
-                    return jsonify({'error': f'Failed to fetch data for {symbol}'})
-                    
+                current_price = price_data[coin_id]['usd']
+                change_24h = price_data[coin_id].get('usd_24h_change', 0)
+                recommendation = generate_crypto_recommendation(current_price, change_24h, symbol.upper())
+                return crypto_position(current_price, change_24h, crypto_holding(holdings, i), recommendation), None
             except Exception as e:
-                return jsonify({'error': f'Error fetching data for {symbol}: {str(e)}'})
-        
-        # Calculate weighted average change
-        total_change = (total_change_weighted / total_value) if total_value > 0 else 0
-        
-        results = {
-            'total_value': round(total_value, 2),
-            'total_change': round(total_change, 2),
-            'diversification_score': min(len(symbols), 10),
-            'crypto_details': crypto_data,
-            'recommendation': f"Your crypto portfolio shows {'good' if len(symbols) >= 3 else 'limited'} diversification. Consider {'maintaining' if total_change >= 0 else 'rebalancing'} your positions.",
-            'data_source': 'CoinGecko API (Real-Time)'
-        }
+                return None, f'Error fetching data for {symbol}: {str(e)}'
         
-        return jsonify(results)
+        # Price all holdings concurrently under one request deadline
+        fetched = fan_out(fetch_position, list(enumerate(symbols)), key=lambda position: position[0])
+        return jsonify(summarize_crypto_portfolio(symbols, fetched.results, fetched.pending))
     except Exception as e:
         return jsonify({'error': str(e)})
 
+def crypto_holding(holdings: List, i: int) -> float:
+    """Units held of the i-th symbol (1 when not given)"""
+    return float(holdings[i]) if holdings and i < len(holdings) and holdings[i] else 1
+
+def crypto_position(current_price: float, change_24h: float, holding_amount: float, recommendation: Dict) -> Dict:
+    """Position details for one priced crypto holding"""
+    return {
+        'price': current_price,
+        'change_24h': change_24h,
+        'holding': holding_amount,
+        'value': current_price * holding_amount,
+        'recommendation': recommendation['action'],
+        'confidence': recommendation['confidence'],
+        'reasoning': recommendation['reasoning']
+    }
+
+def summarize_crypto_portfolio(symbols: List[str], results: Dict[int, tuple], pending: List[int]) -> Dict:
+    """Aggregate (position, error) results by symbol index into the crypto analysis response"""
+    total_value = 0
+    total_change_weighted = 0
+    crypto_data = {}
+    for i, symbol in enumerate(symbols):
+        if i not in results:
+            continue  # Missed the deadline; reported as pending below
+        position, error = results[i]
+        if error:
+            return {'error': error}
+        total_value += position['value']
+        total_change_weighted += (position['change_24h'] * position['value'])
+        crypto_data[symbol.upper()] = position
+    
+    # Calculate weighted average change
+    total_change = (total_change_weighted / total_value) if total_value > 0 else 0
+    
+    return {
+        'total_value': round(total_value, 2),
+        'total_change': round(total_change, 2),
+        'diversification_score': min(len(symbols), 10),
+        'crypto_details': crypto_data,
+        'recommendation': f"Your crypto portfolio shows {'good' if len(symbols) >= 3 else 'limited'} diversification. Consider {'maintaining' if total_change >= 0 else 'rebalancing'} your positions.",
+        'data_source': 'CoinGecko API (Real-Time)',
+        'partial': bool(pending),
+        'pending_symbols': [symbols[i].upper() for i in pending]
+    }
+
 @app.route('/api/defi/opportunities', methods=['POST'])
 def find_defi_opportunities():
     try:
@@ -1009,12 +1141,30 @@ def find_defi_opportunities():
 def portfolio_analyze():
     try:
         data = request.get_json()
+        if request.args.get('async') == '1':
+            return submit_job('portfolio-analysis', data)
+        return jsonify(run_portfolio_analysis(data))
+        
+    except Exception as e:
+        logger.error(f"Portfolio analysis error: {str(e)}")
+        return jsonify({'error': f'Portfolio analysis failed: {str(e)}'})
+
+def validate_portfolio_payload(data: Dict) -> Optional[str]:
+    """Error message for a portfolio request without tickers or holdings"""
+    if not data.get('tickers') and not data.get('holdings'):
+        return 'Please provide tickers or holdings data'
+    return None
+
+def run_portfolio_analysis(data: Dict) -> Dict:
+    """Quote-based portfolio metrics for tickers/weights or share holdings"""
+    try:
         tickers = data.get('tickers', [])
         holdings = data.get('holdings', {})
         weights = data.get('weights', [])
         
-        if not tickers and not holdings:
-            return jsonify({'error': 'Please provide tickers or holdings data'})
+        error = validate_portfolio_payload(data)
+        if error:
+            return {'error': error}
         
         # Use holdings if provided, otherwise use tickers with equal weights
         if holdings:
@@ -1031,24 +1181,30 @@ def portfolio_analyze():
         total_value = 0
         price_changes = []
         
+        def fetch_quote(ticker):
+            """Get (current_price, daily change) from Finnhub or YFinance"""
+            if FINNHUB_AVAILABLE:
+                quote = finnhub_client.quote(ticker)
+                return quote.get('c', 0), quote.get('dp', 0) / 100
+            # Fallback to YFinance
+            stock = yf.Ticker(ticker)
+            hist = stock.history(period='2d')
+            if hist.empty:
+                return 0, 0
+            current_price = hist['Close'].iloc[-1]
+            prev_price = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
+            return current_price, (current_price - prev_price) / prev_price if prev_price > 0 else 0
+        
+        # Get real-time data for all tickers concurrently under one request deadline
+        quotes = fan_out(fetch_quote, tickers)
+        for ticker, error in quotes.errors.items():
+            logger.error(f"Error analyzing {ticker}: {error}")
+        
         for i, ticker in enumerate(tickers):
+            if ticker not in quotes.results:
+                continue
             try:
-                # Get real-time data from Finnhub or YFinance
-                if FINNHUB_AVAILABLE:
-                    quote = finnhub_client.quote(ticker)
-                    current_price = quote.get('c', 0)
-                    change_percent = quote.get('dp', 0) / 100
-                else:
-                    # Fallback to YFinance
-                    stock = yf.Ticker(ticker)
-                    hist = stock.history(period='2d')
-                    if not hist.empty:
-                        current_price = hist['Close'].iloc[-1]
-                        prev_price = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-                        change_percent = (current_price - prev_price) / prev_price if prev_price > 0 else 0
-                    else:
-                        current_price = 0
-                        change_percent = 0
+                current_price, change_percent = quotes.results[ticker]
                 
                 # Calculate position value
                 if holdings and ticker in holdings:
@@ -1100,7 +1256,7 @@ def portfolio_analyze():
         if not tips:
             tips.append("Your portfolio shows good balance and diversification")
         
-        return jsonify({
+        return {
             'portfolio_value': total_value,
             'total_return': avg_return,
             'annualized_return': avg_return * 252,  # Approximate annualization
@@ -1109,12 +1265,96 @@ def portfolio_analyze():
             'max_drawdown': max_drawdown,
             'diversification_score': diversification_score,
             'holdings': portfolio_data,
-            'investment_tips': tips
-        })
+            'investment_tips': tips,
+            'partial': quotes.partial,
+            'pending_tickers': quotes.pending
+        }
         
     except Exception as e:
         logger.error(f"Portfolio analysis error: {str(e)}")
-        return jsonify({'error': f'Portfolio analysis failed: {str(e)}'})
+        return {'error': f'Portfolio analysis failed: {str(e)}'}
+
+_holdings_analyzer = None
+
+def run_holdings_analysis(data: Dict) -> Dict:
+    """Full PortfolioAnalyzer report for share holdings (or weights) and NAV"""
+    global _holdings_analyzer
+    if _holdings_analyzer is None:
+        from portfolio_analyzer import PortfolioAnalyzer
+        _holdings_analyzer = PortfolioAnalyzer()
+    # Queued work may wait out vendor rate limits instead of failing fast
+    with _holdings_analyzer.api_client.rate_limiter.background():
+        return _holdings_analyzer.analyze_portfolio(data['holdings'], data.get('nav', 100000))
+
+job_manager = JobManager(dumps=app.json.dumps)
+job_manager.register('portfolio-analysis', run_portfolio_analysis, validate_portfolio_payload)
+job_manager.register('comprehensive-analysis',
+                     lambda data: financial_integration.get_comprehensive_analysis(data['tickers']),
+                     lambda data: None if data.get('tickers') else 'No tickers provided')
+job_manager.register('holdings-analysis', run_holdings_analysis,
+                     lambda data: None if data.get('holdings') else 'No holdings provided')
+
+def submit_job(kind: str, data: Dict):
+    """Queue a job and answer 202 with where to poll or stream it"""
+    from flask import make_response, url_for
+    
+    data = data or {}
+    error = job_manager.validate(kind, data)
+    if error:
+        return jsonify({'error': error}), 404 if kind not in job_manager.kinds() else 400
+    try:
+        job, created = job_manager.submit(kind, data)
+    except JobQueueFull as e:
+        response = make_response(jsonify({'error': f'Job queue is full: {str(e)}'}), 503)
+        response.headers['Retry-After'] = '5'
+        return response
+    body = job.to_dict()
+    body['deduplicated'] = not created
+    body['status_url'] = url_for('get_job', job_id=job.id)
+    body['stream_url'] = url_for('stream_job', job_id=job.id)
+    response = make_response(jsonify(body), 202)
+    response.headers['Location'] = body['status_url']
+    return response
+
+@app.route('/api/jobs/<kind>', methods=['POST'])
+def create_job(kind):
+    """Submit an analysis job; returns its id immediately"""
+    try:
+        return submit_job(kind, request.get_json(silent=True))
+    except Exception as e:
+        logger.error(f"Error submitting {kind} job: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Job status and, once finished, its result; ?wait=N long-polls up to N seconds"""
+    wait = min(max(request.args.get('wait', 0, type=float), 0), 30)
+    job = job_manager.wait(job_id, wait)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    """Server-Sent-Events stream that ends with the job result"""
+    from flask import Response, stream_with_context
+    
+    if job_manager.get(job_id) is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    if not stream_slots.acquire():
+        # Clients fall back to long-polling /api/jobs/<id>?wait=N
+        return jsonify({'error': 'Too many open streams, poll the job status instead'}), 503
+    
+    def generate():
+        try:
+            yield from job_manager.stream(job_id)
+        finally:
+            stream_slots.release()
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/api/investment/wizard', methods=['POST'])
 def investment_wizard():
@@ -3524,9 +3764,8 @@ MODERN_DASHBOARD_TEMPLATE = """
         // Top Tickers Display Functionality
         async function loadTopTickers() {
             try {
-                // Add cache-busting parameter to ensure fresh data
-                const timestamp = new Date().getTime();
-                const response = await fetch(`/api/tickers?_t=${timestamp}`);
+                // Server revalidates with an ETag, so unchanged snapshots are cheap
+                const response = await fetch('/api/tickers', {cache: 'no-cache'});
                 const data = await response.json();
                 
                 if (data.error) {
@@ -4249,16 +4488,69 @@ MODERN_DASHBOARD_TEMPLATE = """
             }
         }
         
+        // Live ticker updates: server-sent snapshot + deltas, polling as fallback
+        const tickerCategoryNames = {
+            'djia': '',
+            'nasdaq': '',
+            'sp': 'S&P',
+            'crypto': 'Crypto'
+        };
+        let tickerState = {};
+        let tickerPollTimer = null;
+        
+        function renderTickerState() {
+            for (const [apiCategory, displayCategory] of Object.entries(tickerCategoryNames)) {
+                if (tickerState[apiCategory]) {
+                    displayTickers(displayCategory, tickerState[apiCategory]);
+                } else {
+                    displayTickerError(displayCategory);
+                }
+            }
+        }
+        
+        function startTickerPolling() {
+            if (tickerPollTimer) return;
+            loadTopTickers();
+            tickerPollTimer = setInterval(loadTopTickers, 60000);
+        }
+        
+        function startTickerStream() {
+            if (!window.EventSource) {
+                startTickerPolling();
+                return;
+            }
+            const source = new EventSource('/api/tickers/stream');
+            source.addEventListener('snapshot', function(event) {
+                tickerState = JSON.parse(event.data);
+                renderTickerState();
+            });
+            source.addEventListener('delta', function(event) {
+                const delta = JSON.parse(event.data);
+                for (const [category, quotes] of Object.entries(delta)) {
+                    tickerState[category] = Object.assign(tickerState[category] || {}, quotes);
+                }
+                renderTickerState();
+            });
+            source.onerror = function() {
+                // Server closed the stream (capacity or max duration): EventSource reconnects
+                // on its own unless the connection failed outright
+                if (source.readyState === EventSource.CLOSED) {
+                    startTickerPolling();
+                }
+            };
+        }
+        
         // Load tickers when page loads
         document.addEventListener('DOMContentLoaded', function() {
-            loadTopTickers();
-            // Refresh tickers every 1 minute with fresh API calls
-            setInterval(loadTopTickers, 60000);
+            startTickerStream();
         });
     </script>
 </body>
 </html>
 """
 
+# Build the static dashboard once instead of rendering it on every request
+dashboard_assets = DashboardAssets(MODERN_DASHBOARD_TEMPLATE)
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""Background options-availability enrichment for TradeRiser.AI
+Whether a US equity has listed options used to be probed serially inside
+the IntegratedFinanceDatabase constructor, for the first 20 stocks only.
+This module checks the whole equity universe in a daemon thread instead:
+symbols that were never checked (or whose flag is older than
+OPTIONS_REFRESH_SECONDS) are probed in batches, each batch fanned out
+concurrently and paced by a token bucket. Results are persisted to one
+JSON file with a checked_at time per symbol, so flags survive restarts,
+are shared by every process on the host and feed the instrument snapshot;
+lookups read the flags and never call the network.
+
+Run with:  python options_enrichment.py --once   (or without --once to keep refreshing)
+"""
+import os
+import sys
+import json
+import time
+import threading
+import logging
+from typing import Callable, Dict, List, Optional
+
+from utils_shared import setup_logging
+from Utils.utils_fanout import fan_out
+from Utils.utils_rate_limiter import RateLimiter, RateLimitExceeded
+
+# Setup centralized logging
+setup_logging()
+
+
+def default_flags_path() -> str:
+    """Flags file: OPTIONS_FLAGS_FILE, else data/options_flags.json"""
+    return os.getenv('OPTIONS_FLAGS_FILE', os.path.join('data', 'options_flags.json'))
+
+
+class OptionsEnrichment:
+    """Persisted has_options flags, refreshed in rate-limited concurrent batches"""
+
+    def __init__(self, probe: Callable[[str], bool], path: str = None, refresh_seconds: float = None,
+                 batch_size: int = None, calls_per_minute: int = None, max_workers: int = None,
+                 rate_limiter: RateLimiter = None):
+        """Initialize with a probe that returns has_options for a symbol and raises when it cannot tell"""
+        self.logger = logging.getLogger(__name__)
+        self.probe = probe
+        self.path = path or default_flags_path()
+        self.refresh_seconds = refresh_seconds or float(os.getenv('OPTIONS_REFRESH_SECONDS', 7 * 86400))
+        self.interval = float(os.getenv('OPTIONS_ENRICHMENT_INTERVAL_SECONDS', 3600))
+        self.max_workers = max_workers or int(os.getenv('OPTIONS_ENRICHMENT_WORKERS', 8))
+        calls_per_minute = calls_per_minute or int(os.getenv('OPTIONS_ENRICHMENT_CALLS_PER_MINUTE', 60))
+        # A batch takes one token per symbol, so it can never need more than the bucket holds
+        self.batch_size = min(batch_size or int(os.getenv('OPTIONS_ENRICHMENT_BATCH_SIZE', 20)), calls_per_minute)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.rate_limiter.configure('options_enrichment', calls_per_minute, 60)
+        self._flags: Dict[str, List] = {}  # symbol -> [has_options, checked_at]
+        self.state = 'idle'
+        self.last_run = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """Merge the persisted flags (possibly written by another process) into memory"""
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            for symbol, (flag, checked_at) in stored.items():
+                current = self._flags.get(symbol)
+                if current is None or checked_at > current[1]:
+                    self._flags[symbol] = [bool(flag), float(checked_at)]
+
+    def has_options(self, symbol: str) -> Optional[bool]:
+        """Persisted flag for a symbol, or None when it has not been checked yet"""
+        entry = self._flags.get(symbol)
+        return entry[0] if entry else None
+
+    def flags(self) -> Dict[str, bool]:
+        """Every persisted flag"""
+        with self._lock:
+            return {symbol: entry[0] for symbol, entry in self._flags.items()}
+
+    def apply(self, universe):
+        """Overlay the persisted flags on a universe's has_options column"""
+        universe.set_flags('has_options', self.flags(), 'US_STOCKS')
+
+    def due(self, symbols: List[str]) -> List[str]:
+        """Symbols never checked, then those checked longest ago beyond the refresh cadence"""
+        stale_before = time.time() - self.refresh_seconds
+        unchecked, stale = [], []
+        for symbol in dict.fromkeys(symbols):
+            entry = self._flags.get(symbol)
+            if entry is None:
+                unchecked.append(symbol)
+            elif entry[1] < stale_before:
+                stale.append(symbol)
+        return unchecked + sorted(stale, key=lambda symbol: self._flags[symbol][1])
+
+    def run_once(self, symbols: List[str], on_batch: Callable[[Dict[str, bool]], None] = None) -> int:
+        """Probe every due symbol batch by batch; returns how many flags were recorded"""
+        self.reload()
+        pending = self.due(symbols)
+        recorded = 0
+        self.logger.info(f"Options enrichment: {len(pending)} of {len(symbols)} symbols due")
+        with self.rate_limiter.background():
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+                try:
+                    self.rate_limiter.acquire('options_enrichment', tokens=len(batch))
+                except RateLimitExceeded as e:
+                    self.logger.warning(f"Options enrichment paused: {str(e)}")
+                    break
+                outcome = fan_out(self.probe, batch, max_workers=self.max_workers, pool='background')
+                # Failed or unfinished probes stay due and are retried next pass
+                results = {symbol: bool(flag) for symbol, flag in outcome.results.items()}
+                if results:
+                    self._record(results)
+                    recorded += len(results)
+                    if on_batch:
+                        on_batch(results)
+                self.logger.info(f"Options enrichment: {start + len(batch)}/{len(pending)} symbols "
+                                 f"({len(outcome.errors) + len(outcome.pending)} failed)")
+        self.last_run = time.time()
+        return recorded
+
+    def start(self, symbols: Callable[[], List[str]], on_batch: Callable[[Dict[str, bool]], None] = None):
+        """Refresh in a daemon thread every OPTIONS_ENRICHMENT_INTERVAL_SECONDS; symbols is called each pass"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self.run_forever, args=(symbols, on_batch),
+                                            name='options-enrichment', daemon=True)
+        self._thread.start()
+
+    def run_forever(self, symbols: Callable[[], List[str]], on_batch: Callable[[Dict[str, bool]], None] = None):
+        """Run passes on a fixed interval"""
+        while True:
+            self.state = 'running'
+            try:
+                self.run_once(symbols(), on_batch)
+            except Exception as e:
+                self.logger.error(f"Error enriching options availability: {str(e)}")
+            self.state = 'idle'
+            time.sleep(self.interval)
+
+    def status(self) -> Dict:
+        """Progress metrics"""
+        with self._lock:
+            flags = [entry[0] for entry in self._flags.values()]
+        return {
+            'state': self.state,
+            'checked': len(flags),
+            'with_options': sum(flags),
+            'last_run': self.last_run
+        }
+
+    def _record(self, results: Dict[str, bool]):
+        """Store a batch's flags and persist them atomically"""
+        checked_at = time.time()
+        with self._lock:
+            for symbol, flag in results.items():
+                self._flags[symbol] = [flag, checked_at]
+            payload = dict(self._flags)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = os.path.join(directory, f".{os.path.basename(self.path)}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.error(f"Error persisting options flags: {str(e)}")
+
+
+if __name__ == '__main__':
+    from integrated_finance_database import IntegratedFinanceDatabase
+
+    database = IntegratedFinanceDatabase(enrich_options=False)
+    enrichment = database.options_enrichment
+    universe_symbols = lambda: database.universe.symbols_where(asset_class='US_STOCKS')  # noqa: E731
+    if '--once' in sys.argv:
+        enrichment.run_once(universe_symbols())
+    else:
+        enrichment.run_forever(universe_symbols)
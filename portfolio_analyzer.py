@@ -19,6 +19,7 @@ from scipy import stats
 import ta
 from arch import arch_model
 from utils_shared import AnalysisBase, TechnicalIndicators, setup_logging
+from market_data_service import get_market_data_service
 
 # Setup centralized logging
 setup_logging()
@@ -30,6 +31,7 @@ class PortfolioAnalyzer(AnalysisBase):
         self.api_client = APIClient()
         self.risk_free_rate = 0.045
         self.quant_strategies = QuantStrategies()
+        self.market_data = get_market_data_service()
         self.base_urls = {
             'yahoo_summary': 'https://query1.finance.yahoo.com/v10/finance/quoteSummary',
             'yahoo_chart': 'https://query1.finance.yahoo.com/v8/finance/chart'
@@ -42,10 +44,16 @@ class PortfolioAnalyzer(AnalysisBase):
             portfolio_data = {}
             total_value = 0
             
+            # Bulk-download price history for all holdings in one pass
+            self.market_data.prefetch(list(holdings.keys()), period="1y")
+            
             # First pass: get stock data and calculate total value
             failed_tickers = []
+            with self.api_client.prewarm_cache(self._holding_cache_keys(holdings.keys())):
+                self._warm_technical_data(list(holdings.keys()))
+                fetched = {ticker: self._fetch_stock_data(ticker) for ticker in holdings}
             for ticker, quantity in holdings.items():
-                stock_data = self._fetch_stock_data(ticker)
+                stock_data = fetched[ticker]
                 if stock_data:
                     current_price = stock_data['technical_data'].get('current_price', 0)
                     
@@ -159,6 +167,29 @@ class PortfolioAnalyzer(AnalysisBase):
             self.logger.error(f"Error fetching data for {ticker}: {str(e)}")
             return None
 
+    def _holding_cache_keys(self, tickers) -> List[str]:
+        """Cache keys read per holding, for pre-warming in one round trip"""
+        keys = []
+        for ticker in tickers:
+            keys.extend([f"yfinance_fundamental:{ticker}", f"yfinance_technical:{ticker}",
+                         f"social_sentiment:{ticker}", f"trends:{ticker}"])
+        return keys
+
+    def _warm_technical_data(self, tickers: List[str]):
+        """Compute uncached technical data for all holdings and write it in one pipeline"""
+        try:
+            keys = {ticker: f"yfinance_technical:{ticker}" for ticker in tickers}
+            cached = self.api_client._cache_get_many(list(keys.values()))
+            computed = {}
+            for ticker, cache_key in keys.items():
+                if cache_key not in cached:
+                    result = self._compute_technical_data(ticker)
+                    if result:
+                        computed[cache_key] = result
+            self.api_client._cache_set_many(computed, 300)  # Cache for 5 minutes
+        except Exception as e:
+            self.logger.error(f"Error warming technical data for {len(tickers)} tickers: {str(e)}")
+
     def _fetch_technical_data(self, ticker: str) -> Dict:
         """Fetch technical data using yfinance library"""
         try:
@@ -167,31 +198,47 @@ class PortfolioAnalyzer(AnalysisBase):
             if cached:
                 return cached
                 
-            # Use yfinance library
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="1y")
-            
-            if hist.empty or len(hist) < 50:
-                self.logger.warning(f"Insufficient technical data for {ticker}")
+            result = self._compute_technical_data(ticker)
+            if result is None:
                 return None  # Return None when insufficient data - no placeholder data
-                
-            closes = hist['Close'].values
-            current_price = float(closes[-1])
-            
-            result = {
-                'current_price': current_price,
-                'price_change_1m': (closes[-1] - closes[-21]) / closes[-21] * 100 if len(closes) > 21 else 0,
-                'rsi': self.technical_indicators.calculate_rsi_numpy(closes),
-                'historical_volatility_30d': np.std(closes[-30:]) * np.sqrt(252) if len(closes) >= 30 else 0.2
-            }
             
             self.api_client._cache_set(cache_key, result, 300)  # Cache for 5 minutes
-            self.logger.info(f"Fetched yfinance technical data for {ticker}")
             return result
         except Exception as e:
             self.logger.error(f"Error fetching yfinance technical data for {ticker}: {str(e)}")
             return None  # Return None when data is unavailable - no placeholder data
 
+    def _compute_technical_data(self, ticker: str) -> Dict:
+        """Compute technical data from the shared bulk-downloaded panel"""
+        hist = self._get_price_history(ticker)
+        
+        if hist.empty or len(hist) < 50:
+            self.logger.warning(f"Insufficient technical data for {ticker}")
+            return None
+            
+        closes = hist['Close'].values
+        current_price = float(closes[-1])
+        
+        result = {
+            'current_price': current_price,
+            'price_change_1m': (closes[-1] - closes[-21]) / closes[-21] * 100 if len(closes) > 21 else 0,
+            'rsi': self.technical_indicators.calculate_rsi_numpy(closes),
+            'historical_volatility_30d': np.std(closes[-30:]) * np.sqrt(252) if len(closes) >= 30 else 0.2
+        }
+        self.logger.info(f"Fetched yfinance technical data for {ticker}")
+        return result
+
+    def _get_price_history(self, ticker: str, period: str = "1y") -> pd.DataFrame:
+        """Get OHLCV history, shared across workers through the binary cache"""
+        cache_key = f"history:{ticker}:{period}"
+        hist = self.api_client._cache_get_frame(cache_key)
+        if hist is not None:
+            return hist
+        hist = self.market_data.get_ticker_history(ticker, period=period)
+        if not hist.empty:
+            self.api_client._cache_set_frame(cache_key, hist, 300)  # Cache for 5 minutes
+        return hist
+
     def _fetch_yahoo_fundamentals(self, ticker: str) -> Dict:
         """Fetch fundamental data using yfinance library"""
         try:
@@ -1094,7 +1141,7 @@ class PortfolioAnalyzer(AnalysisBase):
                 'analysis_summary': ''
             }
             
-            # Analyze each ticker with quantitative strategies
+            # Analyze each ticker with quantitative strategies (history already prefetched)
             all_signals = []
             ticker_results = {}
             
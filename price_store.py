@@ -0,0 +1,223 @@
+"""Persistent local OHLCV store for TradeRiser.AI
+Columnar (Parquet) files partitioned by interval and symbol. New bars are
+appended as small immutable part files so a refresh only downloads the bars
+after the last stored timestamp; range reads push the date filter down to
+the Parquet row groups instead of loading whole files.
+"""
+import os
+import json
+import time
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+from utils_shared import setup_logging
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = ds = pq = None
+    PYARROW_AVAILABLE = False
+
+# Setup centralized logging
+setup_logging()
+
+DATE_COLUMN = 'Date'
+META_FILE = '_meta.json'
+
+
+def period_start(period: str, now: Optional[datetime] = None) -> Optional[pd.Timestamp]:
+    """Translate a yfinance period string into the first date it covers"""
+    today = pd.Timestamp(now or datetime.now()).normalize()
+    period = (period or '').strip().lower()
+    if period == 'ytd':
+        return today.replace(month=1, day=1)
+    if period.endswith('mo') and period[:-2].isdigit():
+        return today - pd.DateOffset(months=int(period[:-2]))
+    if period.endswith('y') and period[:-1].isdigit():
+        return today - pd.DateOffset(years=int(period[:-1]))
+    if period.endswith('wk') and period[:-2].isdigit():
+        return today - pd.DateOffset(weeks=int(period[:-2]))
+    if period.endswith('d') and period[:-1].isdigit():
+        return today - pd.DateOffset(days=int(period[:-1]))
+    return None  # 'max' or unknown periods are not served from the store
+
+
+class PriceStore:
+    """On-disk OHLCV store with incremental append and range reads"""
+
+    def __init__(self, root: str = None, compact_after: int = 20):
+        """Initialize the store rooted at PRICE_STORE_DIR"""
+        self.logger = logging.getLogger(__name__)
+        self.root = root or os.getenv('PRICE_STORE_DIR', os.path.join('data', 'price_store'))
+        self.compact_after = compact_after
+        self.enabled = PYARROW_AVAILABLE and os.getenv('PRICE_STORE_ENABLED', 'true').lower() == 'true'
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        if not PYARROW_AVAILABLE:
+            self.logger.warning("pyarrow not installed, local price store disabled")
+
+    def coverage(self, symbol: str, interval: str = '1d') -> Optional[Dict]:
+        """Get stored coverage metadata (covered_from, last, updated_at) for a symbol"""
+        path = os.path.join(self._symbol_dir(symbol, interval), META_FILE)
+        try:
+            with open(path) as f:
+                meta = json.load(f)
+            meta['covered_from'] = pd.Timestamp(meta['covered_from'])
+            meta['last'] = pd.Timestamp(meta['last'])
+            return meta
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def read(self, symbol: str, start=None, end=None, interval: str = '1d') -> pd.DataFrame:
+        """Read stored bars in [start, end] without loading the whole history"""
+        directory = self._symbol_dir(symbol, interval)
+        if not self.enabled or not os.path.isdir(directory):
+            return pd.DataFrame()
+        try:
+            dataset = ds.dataset(directory, format='parquet', exclude_invalid_files=True)
+            condition = None
+            if start is not None:
+                condition = ds.field(DATE_COLUMN) >= pd.Timestamp(start).to_pydatetime()
+            if end is not None:
+                upper = ds.field(DATE_COLUMN) <= pd.Timestamp(end).to_pydatetime()
+                condition = upper if condition is None else condition & upper
+            frame = dataset.to_table(filter=condition).to_pandas()
+        except Exception as e:
+            self.logger.error(f"Error reading stored bars for {symbol}: {str(e)}")
+            return pd.DataFrame()
+        return self._finalize(frame)
+
+    def append(self, symbol: str, bars: pd.DataFrame, interval: str = '1d') -> int:
+        """Append bars newer than or equal to the last stored bar; returns rows written"""
+        if not self.enabled or bars is None or bars.empty:
+            return 0
+        with self._symbol_lock(symbol, interval):
+            meta = self.coverage(symbol, interval)
+            if meta is None:
+                return 0
+            bars = self._prepare(bars)
+            # Re-write the last stored bar too: it may have been a partial session
+            bars = bars[bars[DATE_COLUMN] >= meta['last']]
+            if bars.empty:
+                self._write_meta(symbol, interval, meta['covered_from'], meta['last'])
+                return 0
+            self._write_part(symbol, interval, bars)
+            last = max(meta['last'], bars[DATE_COLUMN].max())
+            self._write_meta(symbol, interval, meta['covered_from'], last)
+            if self._part_count(symbol, interval) > self.compact_after:
+                self._compact(symbol, interval)
+            return len(bars)
+
+    def touch(self, symbol: str, interval: str = '1d'):
+        """Mark a symbol as checked without new bars"""
+        with self._symbol_lock(symbol, interval):
+            meta = self.coverage(symbol, interval)
+            if meta is not None:
+                self._write_meta(symbol, interval, meta['covered_from'], meta['last'])
+
+    def replace(self, symbol: str, bars: pd.DataFrame, covered_from, interval: str = '1d') -> int:
+        """Replace all stored bars for a symbol with a freshly downloaded window"""
+        if not self.enabled or bars is None or bars.empty:
+            return 0
+        with self._symbol_lock(symbol, interval):
+            bars = self._prepare(bars)
+            # New part first, old parts last: readers (or a crash) in between still see full coverage
+            superseded = self._part_names(symbol, interval)
+            self._write_part(symbol, interval, bars)
+            self._write_meta(symbol, interval, pd.Timestamp(covered_from), bars[DATE_COLUMN].max())
+            self._remove_parts(symbol, interval, superseded)
+            return len(bars)
+
+    def _compact(self, symbol: str, interval: str):
+        """Merge all part files of a symbol into a single part"""
+        merged = self._part_names(symbol, interval)
+        frame = self.read(symbol, interval=interval)
+        if frame.empty:
+            return
+        # Parts written by another worker after the listing are kept; duplicates resolve by _written_at
+        self._write_part(symbol, interval, self._prepare(frame))
+        self._remove_parts(symbol, interval, merged)
+        self.logger.info(f"Compacted stored bars for {symbol} ({interval})")
+
+    def _prepare(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """Move the date index into a tz-naive column for Parquet"""
+        frame = bars.copy()
+        index = pd.DatetimeIndex(frame.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        frame.index = index
+        frame.index.name = DATE_COLUMN
+        return frame.reset_index()
+
+    def _finalize(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Restore the date index, keeping the most recently written copy of each bar"""
+        if frame.empty:
+            return pd.DataFrame()
+        frame = frame.sort_values(['_written_at', DATE_COLUMN], kind='stable')
+        frame = frame.drop_duplicates(subset=DATE_COLUMN, keep='last')
+        frame = frame.drop(columns=['_written_at']).set_index(DATE_COLUMN).sort_index()
+        frame.index.name = None
+        return frame
+
+    def _write_part(self, symbol: str, interval: str, frame: pd.DataFrame):
+        """Write one immutable part file atomically"""
+        directory = self._symbol_dir(symbol, interval)
+        os.makedirs(directory, exist_ok=True)
+        written_at = time.time_ns()
+        frame = frame.assign(_written_at=written_at)
+        path = os.path.join(directory, f"part-{written_at}.parquet")
+        tmp_path = os.path.join(directory, f".part-{written_at}.tmp")
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), tmp_path)
+        os.replace(tmp_path, path)
+
+    def _write_meta(self, symbol: str, interval: str, covered_from, last):
+        """Atomically record coverage metadata for a symbol"""
+        directory = self._symbol_dir(symbol, interval)
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = os.path.join(directory, f".{META_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'covered_from': pd.Timestamp(covered_from).isoformat(),
+                'last': pd.Timestamp(last).isoformat(),
+                'updated_at': time.time()
+            }, f)
+        os.replace(tmp_path, os.path.join(directory, META_FILE))
+
+    def _part_names(self, symbol: str, interval: str) -> List[str]:
+        """Part files currently stored for a symbol"""
+        directory = self._symbol_dir(symbol, interval)
+        if not os.path.isdir(directory):
+            return []
+        return [name for name in os.listdir(directory) if name.startswith('part-') and name.endswith('.parquet')]
+
+    def _remove_parts(self, symbol: str, interval: str, names: List[str]):
+        """Delete the given part files of a symbol (already-removed ones are ignored)"""
+        directory = self._symbol_dir(symbol, interval)
+        for name in names:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+    def _part_count(self, symbol: str, interval: str) -> int:
+        """Count part files stored for a symbol"""
+        return len(self._part_names(symbol, interval))
+
+    def _symbol_dir(self, symbol: str, interval: str) -> str:
+        """Partition directory for a symbol"""
+        safe_symbol = symbol.upper().replace('/', '_').replace('^', '_')
+        return os.path.join(self.root, interval, safe_symbol)
+
+    def _symbol_lock(self, symbol: str, interval: str) -> threading.Lock:
+        """Per-symbol write lock"""
+        key = f"{interval}:{symbol}"
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
@@ -7,8 +7,8 @@ Adapted for TradeRiser.AI platform
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
 from typing import Dict, List, Tuple, Optional
+from market_data_service import get_market_data_service
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -19,6 +19,7 @@ class QuantStrategies:
     """
     
     def __init__(self):
+        self.market_data = get_market_data_service()
         self.strategies = {
             'macd': self.macd_strategy,
             'rsi_pattern': self.rsi_pattern_strategy,
@@ -39,9 +40,8 @@ class QuantStrategies:
             Dictionary containing all strategy results
         """
         try:
-            # Fetch data
-            stock = yf.Ticker(ticker)
-            data = stock.history(period=period)
+            # Fetch data from the shared bulk-downloaded panel
+            data = self.market_data.get_ticker_history(ticker, period=period)
             
             if data.empty:
                 return {'error': f'No data available for {ticker}'}
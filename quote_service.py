@@ -0,0 +1,242 @@
+"""Batch quote service for TradeRiser.AI
+Answers quotes for many symbols in one call: cached quotes are served
+directly, plain stock symbols that miss the cache are fetched from Finnhub
+concurrently (within its per-minute budget), and everything else, including
+Finnhub failures, goes to YFinance in one batched download. The whole
+lookup is capped by a deadline; symbols still outstanding are reported as
+pending rather than holding the request.
+"""
+import os
+import math
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from utils_shared import setup_logging
+from Utils.utils_fanout import fan_out
+from Utils.utils_memory_cache import TTLCache
+from Utils.utils_rate_limiter import RateLimiter
+
+# Setup centralized logging
+setup_logging()
+
+QUOTE_FIELDS = ('price', 'change', 'change_percent', 'previous_close', 'source', 'as_of')
+FINNHUB_API_URL = os.getenv('FINNHUB_API_URL', 'https://finnhub.io/api/v1')
+
+
+class QuoteService:
+    """Cache-first batch quotes from Finnhub and YFinance under a deadline"""
+
+    def __init__(self, finnhub_client=None, yf_module=None, ttl: int = None, deadline: float = None,
+                 max_symbols: int = None, finnhub_api_key: str = None, rate_limiter: RateLimiter = None):
+        """Initialize with optional vendor clients, cache TTL, deadline (seconds) and shared rate limiter"""
+        self.logger = logging.getLogger(__name__)
+        self.finnhub = finnhub_client
+        # Used by the async path, which calls the Finnhub REST API directly
+        self.finnhub_api_key = finnhub_api_key
+        self.yf = yf_module
+        self.ttl = ttl or int(os.getenv('QUOTE_CACHE_TTL', 15))
+        self.deadline = deadline or float(os.getenv('QUOTES_DEADLINE_SECONDS', 5))
+        self.max_symbols = max_symbols or int(os.getenv('QUOTES_MAX_SYMBOLS', 100))
+        self.cache = TTLCache(max_entries=5000)
+        # Pass a Redis-backed limiter so every worker process draws on one Finnhub budget
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.rate_limiter.configure('finnhub', int(os.getenv('FINNHUB_CALLS_PER_MINUTE', 60)), 60)
+
+    def get_quotes(self, symbols: List[str]) -> Dict:
+        """Columnar quotes for symbols: {'index': symbols, 'columns': {field: values}}"""
+        started = time.monotonic()
+        symbols, quotes = self._from_cache(symbols)
+        cached = set(quotes)
+        misses = [s for s in symbols if s not in quotes]
+        pending = []
+        if misses:
+            fetched, pending = self._fetch(misses, started + self.deadline)
+            self._remember(fetched)
+            quotes.update(fetched)
+        return self._columnar(symbols, quotes, cached, pending, started)
+
+    async def get_quotes_async(self, symbols: List[str], client) -> Dict:
+        """get_quotes for an event loop: Finnhub calls go through an aiohttp session"""
+        started = time.monotonic()
+        symbols, quotes = self._from_cache(symbols)
+        cached = set(quotes)
+        misses = [s for s in symbols if s not in quotes]
+        pending = []
+        if misses:
+            fetched, pending = await self._fetch_async(misses, started + self.deadline, client)
+            self._remember(fetched)
+            quotes.update(fetched)
+        return self._columnar(symbols, quotes, cached, pending, started)
+
+    def _from_cache(self, symbols: List[str]) -> Tuple[List[str], Dict[str, Dict]]:
+        """Normalized symbols and the quotes already cached for them"""
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        quotes = {}
+        for symbol in symbols:
+            quote = self.cache.get(f"quote:{symbol}")
+            if quote is not None:
+                quotes[symbol] = quote
+        return symbols, quotes
+
+    def _remember(self, quotes: Dict[str, Dict]):
+        """Cache freshly fetched quotes"""
+        for symbol, quote in quotes.items():
+            self.cache.set(f"quote:{symbol}", quote, self.ttl)
+
+    def _columnar(self, symbols: List[str], quotes: Dict[str, Dict], cached: set, pending: List[str],
+                  started: float) -> Dict:
+        """Response with one list per field, aligned with the symbol index"""
+        columns = {field: [quotes.get(s, {}).get(field) for s in symbols] for field in QUOTE_FIELDS}
+        columns['cached'] = [s in cached for s in symbols]
+        return {
+            'index': symbols,
+            'columns': columns,
+            'missing': [s for s in symbols if s not in quotes and s not in pending],
+            'partial': bool(pending),
+            'pending': pending,
+            'elapsed_seconds': round(time.monotonic() - started, 3)
+        }
+
+    def _route(self, symbols: List[str], finnhub_enabled: bool) -> Tuple[List[str], List[str]]:
+        """Split symbols into (Finnhub, YFinance batch), taking the Finnhub budget in one call"""
+        # Only plain stock symbols go to Finnhub, and only as many as its budget grants
+        candidates = [s for s in symbols if s.replace('.', '').isalnum()] if finnhub_enabled else []
+        granted = self.rate_limiter.try_acquire_up_to('finnhub', len(candidates))
+        finnhub_symbols = candidates[:granted]
+        routed = set(finnhub_symbols)
+        return finnhub_symbols, [s for s in symbols if s not in routed]
+
+    def _fetch(self, symbols: List[str], end: float) -> Tuple[Dict[str, Dict], List[str]]:
+        """Fetch misses concurrently; returns (quotes, symbols pending at the deadline)"""
+        finnhub_symbols, batch = self._route(symbols, bool(self.finnhub))
+
+        # The batched download goes first so it never queues behind per-symbol calls
+        items = [('yfinance', tuple(batch))] if batch and self.yf is not None else []
+        items += [('finnhub', symbol) for symbol in finnhub_symbols]
+        outcome = fan_out(self._fetch_item, items, deadline=max(0.0, end - time.monotonic()))
+
+        quotes, pending, fallback = {}, [], []
+        for (source, target), result in outcome.results.items():
+            if source == 'yfinance':
+                quotes.update(result)
+            elif result is not None:
+                quotes[target] = result
+            else:
+                fallback.append(target)
+        for source, target in outcome.errors:
+            if source == 'finnhub':
+                fallback.append(target)
+        for source, target in outcome.pending:
+            pending.extend(target if source == 'yfinance' else [target])
+
+        # Finnhub failures get one batched YFinance attempt with whatever time is left
+        remaining = end - time.monotonic()
+        if fallback and self.yf is not None and remaining > 0.5:
+            try:
+                quotes.update(self._yfinance_quotes(tuple(fallback), timeout=remaining))
+            except Exception as e:
+                self.logger.error(f"YFinance fallback failed for {len(fallback)} symbols: {str(e)}")
+        return quotes, pending
+
+    async def _fetch_async(self, symbols: List[str], end: float, client) -> Tuple[Dict[str, Dict], List[str]]:
+        """_fetch on the event loop; the blocking YFinance download runs in a thread"""
+        # Taking the budget may be a Redis round trip, so keep it off the event loop
+        finnhub_symbols, batch = await asyncio.to_thread(self._route, symbols, bool(self.finnhub_api_key))
+        tasks = {}
+        if batch and self.yf is not None:
+            tasks[('yfinance', tuple(batch))] = asyncio.ensure_future(
+                asyncio.to_thread(self._yfinance_quotes, tuple(batch), self.deadline))
+        for symbol in finnhub_symbols:
+            tasks[('finnhub', symbol)] = asyncio.ensure_future(self._finnhub_quote_async(symbol, client))
+        done = set()
+        if tasks:
+            done, _ = await asyncio.wait(list(tasks.values()), timeout=max(0.0, end - time.monotonic()))
+
+        quotes, pending, fallback = {}, [], []
+        for (source, target), task in tasks.items():
+            if task not in done:
+                task.cancel()
+                pending.extend(target if source == 'yfinance' else [target])
+            elif task.exception() is not None:
+                self.logger.error(f"{source} quote failed for {target}: {str(task.exception())}")
+                if source == 'finnhub':
+                    fallback.append(target)
+            elif source == 'yfinance':
+                quotes.update(task.result())
+            elif task.result() is not None:
+                quotes[target] = task.result()
+            else:
+                fallback.append(target)
+
+        remaining = end - time.monotonic()
+        if fallback and self.yf is not None and remaining > 0.5:
+            try:
+                quotes.update(await asyncio.to_thread(self._yfinance_quotes, tuple(fallback), remaining))
+            except Exception as e:
+                self.logger.error(f"YFinance fallback failed for {len(fallback)} symbols: {str(e)}")
+        return quotes, pending
+
+    async def _finnhub_quote_async(self, symbol: str, client) -> Optional[Dict]:
+        """Quote from the Finnhub REST API over an aiohttp session"""
+        async with client.get(f"{FINNHUB_API_URL}/quote",
+                              params={'symbol': symbol, 'token': self.finnhub_api_key}) as response:
+            response.raise_for_status()
+            return self._finnhub_fields(await response.json(content_type=None))
+
+    def _fetch_item(self, item: Tuple) -> Optional[Dict]:
+        """Run one work item: a Finnhub symbol or a YFinance batch"""
+        source, target = item
+        if source == 'finnhub':
+            return self._finnhub_quote(target)
+        return self._yfinance_quotes(target, timeout=self.deadline)
+
+    def _finnhub_quote(self, symbol: str) -> Optional[Dict]:
+        """Quote from Finnhub, or None when it does not know the symbol"""
+        return self._finnhub_fields(self.finnhub.quote(symbol))
+
+    @staticmethod
+    def _finnhub_fields(quote: Dict) -> Optional[Dict]:
+        """Normalize a Finnhub quote payload; None for unknown symbols"""
+        if not quote or not quote.get('t'):
+            return None
+        return {
+            'price': quote.get('c'),
+            'change': quote.get('d'),
+            'change_percent': quote.get('dp'),
+            'previous_close': quote.get('pc'),
+            'source': 'finnhub',
+            'as_of': datetime.fromtimestamp(quote['t'], tz=timezone.utc).isoformat()
+        }
+
+    def _yfinance_quotes(self, symbols: Tuple[str, ...], timeout: float) -> Dict[str, Dict]:
+        """Latest close and change for many symbols from one YFinance download"""
+        raw = self.yf.download(tickers=' '.join(symbols), period='5d', interval='1d', group_by='column',
+                               auto_adjust=False, actions=False, threads=True, progress=False,
+                               timeout=max(1, int(timeout)))
+        if raw is None or raw.empty or 'Close' not in raw:
+            return {}
+        closes = raw['Close']
+        if not hasattr(closes, 'columns'):
+            closes = closes.to_frame(symbols[0])  # Older YFinance: flat columns for one symbol
+        quotes = {}
+        for symbol in symbols:
+            if symbol not in closes.columns:
+                continue
+            series = closes[symbol].dropna()
+            if series.empty:
+                continue
+            price = float(series.iloc[-1])
+            previous = float(series.iloc[-2]) if len(series) > 1 else math.nan
+            change = price - previous if not math.isnan(previous) else None
+            quotes[symbol] = {
+                'price': price,
+                'change': change,
+                'change_percent': change / previous * 100 if change is not None and previous else None,
+                'previous_close': None if math.isnan(previous) else previous,
+                'source': 'yfinance',
+                'as_of': series.index[-1].isoformat()
+            }
+        return quotes
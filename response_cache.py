@@ -0,0 +1,93 @@
+"""Normalized-request response cache for TradeRiser.AI POST endpoints
+Analysis endpoints are keyed on a canonical form of their JSON body
+(sorted keys, upper-cased and sorted tickers), so the same ticker set
+submitted in a different order or case is answered from cache. Each
+endpoint picks a freshness class whose TTL matches how quickly its data
+goes stale. Responses carry X-Cache: HIT, MISS or BYPASS.
+"""
+import os
+import time
+import logging
+from functools import wraps
+from typing import Dict, Optional
+
+from flask import request, make_response
+
+from utils_shared import setup_logging
+from Utils.utils_memory_cache import TTLCache
+from Utils.utils_request import payload_hash
+
+# Setup centralized logging
+setup_logging()
+
+# Seconds a cached response stays valid for each freshness class
+FRESHNESS_TTLS = {
+    'quotes': int(os.getenv('RESPONSE_CACHE_TTL_QUOTES', 30)),
+    'intraday': int(os.getenv('RESPONSE_CACHE_TTL_INTRADAY', 300)),
+    'fundamentals': int(os.getenv('RESPONSE_CACHE_TTL_FUNDAMENTALS', 3600))
+}
+
+
+class ResponseCache:
+    """Caches successful JSON responses of POST views by normalized body"""
+
+    def __init__(self, max_entries: int = None, max_mb: int = None):
+        """Initialize the bounded in-process store"""
+        self.logger = logging.getLogger(__name__)
+        self.enabled = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+        self.store = TTLCache(max_entries=max_entries or int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 2000)),
+                              max_bytes=(max_mb or int(os.getenv('RESPONSE_CACHE_MAX_MB', 32))) * 1024 * 1024)
+
+    def cached(self, endpoint: str, freshness: str):
+        """Decorate a view to serve repeated equivalent requests from cache"""
+        ttl = FRESHNESS_TTLS[freshness]
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                payload = request.get_json(silent=True)
+                if not self.enabled or not isinstance(payload, dict) or request.args.get('async') == '1':
+                    response = make_response(view(*args, **kwargs))
+                    response.headers['X-Cache'] = 'BYPASS'
+                    return response
+
+                key = self.key_for(endpoint, payload)
+                # Cache-Control: no-cache from the client forces a recompute but still refreshes the entry
+                if 'no-cache' not in request.headers.get('Cache-Control', ''):
+                    entry = self.store.get(key)
+                    if entry is not None:
+                        response = make_response(entry['body'], 200)
+                        response.mimetype = 'application/json'
+                        response.headers['X-Cache'] = 'HIT'
+                        response.headers['Age'] = str(int(time.time() - entry['stored_at']))
+                        return response
+
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and response.is_json and self.cacheable(response.get_json(silent=True)):
+                    self.put(key, response.get_data(as_text=True), ttl)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def key_for(self, endpoint: str, payload: Dict) -> str:
+        """Cache key for an endpoint and its normalized request body"""
+        return f"response:{endpoint}:{payload_hash(endpoint, payload, sort_tickers=True)}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached entry {'body', 'stored_at'} or None"""
+        return self.store.get(key) if self.enabled else None
+
+    def put(self, key: str, body: str, ttl: int):
+        """Store a serialized JSON response body"""
+        self.store.set(key, {'body': body, 'stored_at': time.time()}, ttl)
+
+    @staticmethod
+    def cacheable(body) -> bool:
+        """Only complete, successful JSON bodies are cached"""
+        # Handlers report many failures as 200 with an error field; partial fan-outs must be retried
+        return isinstance(body, dict) and 'error' not in body and not body.get('partial')
+
+    def stats(self) -> Dict:
+        """Hit/miss counters of the store"""
+        return self.store.stats()
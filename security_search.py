@@ -0,0 +1,187 @@
+"""Typo-tolerant in-memory security search for TradeRiser.AI
+Built once per FinanceDatabase dataset (equities, ETFs, funds, crypto...)
+after it loads, so /api/search-securities and /api/autocomplete never
+probe a vendor per keystroke. Symbols and name tokens form one term
+vocabulary; a query token scores the terms it matches exactly, as a
+prefix (autocomplete) or by padded-trigram similarity (typos such as
+"microsft"), and each security takes the best symbol match or the mean
+of its name-token matches. Ranking adds a popularity weight (market-cap
+class, top tickers) and prefers primary listings over exchange-suffixed
+ones. The fuzzy stage is skipped when the latency budget is already spent.
+"""
+import bisect
+import time
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils_shared import setup_logging
+from instrument_index import TOKEN_PATTERN, trigrams
+from instrument_universe import MARKET_CAP_RANKS, market_cap_rank
+
+# Setup centralized logging
+setup_logging()
+
+# Columns copied into results when a dataset has them
+DETAIL_FIELDS = ('sector', 'industry', 'category', 'family', 'exchange', 'country', 'currency', 'market_cap')
+
+PREFIX_TERM_LIMIT = 256   # Completions scored per query token
+FUZZY_TERM_LIMIT = 64     # Similar terms scored per query token
+FUZZY_MIN_SIMILARITY = 0.3
+MIN_SCORE = 0.3
+POPULARITY_WEIGHT = 0.15
+LISTING_PENALTY = 0.05    # "AAPL.MX" ranks below "AAPL" for the same match
+
+
+def padded_trigrams(term: str) -> set:
+    """Trigrams of a term padded with spaces, so short terms and word edges count"""
+    return trigrams(f" {term} ")
+
+
+class SecuritySearchEngine:
+    """Exact, prefix and trigram-similarity search over one dataset's symbols and names"""
+
+    def __init__(self, symbols: Iterable[str], names: Iterable[str], popularity: Iterable[float] = None,
+                 details: Optional[Dict[str, Iterable]] = None):
+        """Build from aligned symbols, names, popularity in [0, 1] and optional detail columns"""
+        self.logger = logging.getLogger(__name__)
+        started = time.perf_counter()
+        self.symbols = np.asarray([str(symbol) for symbol in symbols], dtype=object)
+        self.names = np.asarray(['' if pd.isna(name) else str(name) for name in names], dtype=object)
+        count = len(self.symbols)
+        popularity = np.zeros(count) if popularity is None else np.asarray(list(popularity), dtype=np.float32)
+        listed = np.fromiter(('.' in symbol for symbol in self.symbols), dtype=bool, count=count)
+        self.boost = (POPULARITY_WEIGHT * np.clip(popularity, 0, 1) - LISTING_PENALTY * listed).astype(np.float32)
+        self.details = {field: pd.Categorical(values) for field, values in (details or {}).items()}
+
+        terms: Dict[str, int] = {}
+        name_pairs, symbol_pairs = defaultdict(list), defaultdict(list)
+        for row, (symbol, name) in enumerate(zip(self.symbols, self.names)):
+            symbol_pairs[terms.setdefault(symbol.lower(), len(terms))].append(row)
+            for token in set(TOKEN_PATTERN.findall(name.lower())):
+                name_pairs[terms.setdefault(token, len(terms))].append(row)
+
+        self.terms = list(terms)
+        self._term_ids = terms
+        self._sorted_terms = sorted(terms)
+        self._sorted_ids = np.asarray([terms[term] for term in self._sorted_terms], dtype=np.int32)
+        self._name_postings = self._csr(name_pairs, len(terms))
+        self._symbol_postings = self._csr(symbol_pairs, len(terms))
+
+        gram_pairs = defaultdict(list)
+        self._term_gram_counts = np.zeros(len(terms), dtype=np.float32)
+        for term_id, term in enumerate(self.terms):
+            grams = padded_trigrams(term)
+            self._term_gram_counts[term_id] = len(grams)
+            for gram in grams:
+                gram_pairs[gram].append(term_id)
+        self._gram_postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in gram_pairs.items()}
+        self.logger.info(f"Built security search engine: {count} securities, {len(terms)} terms "
+                         f"in {time.perf_counter() - started:.2f}s")
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, popular: Iterable[str] = ()) -> 'SecuritySearchEngine':
+        """Build from a symbol-indexed FinanceDatabase selection; popular symbols get full popularity"""
+        frame = frame[frame.index.notna()]
+        names = frame['name'] if 'name' in frame else pd.Series('', index=frame.index)
+        if 'market_cap' in frame:
+            ranks = frame['market_cap'].map(market_cap_rank).to_numpy(dtype=np.float32)
+            popularity = ranks / max(MARKET_CAP_RANKS.values())
+        else:
+            popularity = np.zeros(len(frame), dtype=np.float32)
+        popularity[frame.index.isin(list(popular))] = 1.0
+        details = {field: frame[field].where(frame[field].notna(), '').astype(str)
+                   for field in DETAIL_FIELDS if field in frame}
+        return cls(frame.index, names, popularity, details)
+
+    def __len__(self) -> int:
+        """Number of indexed securities"""
+        return len(self.symbols)
+
+    def search(self, query: str, limit: int = 10, budget_ms: Optional[float] = None) -> List[Dict]:
+        """Top matches for query, best first; fuzzy matching is skipped once budget_ms is spent"""
+        started = time.perf_counter()
+        q = query.strip().lower()
+        tokens = TOKEN_PATTERN.findall(q)
+        if not tokens or not len(self.symbols):
+            return []
+
+        symbol_scores = np.zeros(len(self.symbols), dtype=np.float32)
+        token_scores = [np.zeros(len(self.symbols), dtype=np.float32) for _ in tokens]
+        stages = [False] if budget_ms is not None and budget_ms <= 0 else [False, True]
+        for fuzzy in stages:
+            if fuzzy and budget_ms is not None and (time.perf_counter() - started) * 1000 >= budget_ms:
+                break
+            self._score(self._symbol_postings, self._match_terms(q, fuzzy), symbol_scores)
+            for token, scores in zip(tokens, token_scores):
+                self._score(self._name_postings, self._match_terms(token, fuzzy), scores)
+
+        text = np.maximum(symbol_scores, np.mean(token_scores, axis=0))
+        candidates = np.flatnonzero(text >= MIN_SCORE)
+        ranked = text[candidates] + self.boost[candidates]
+        if len(candidates) > limit:
+            top = np.argpartition(-ranked, limit)[:limit]
+            candidates, ranked = candidates[top], ranked[top]
+        order = np.argsort(-ranked, kind='stable')
+        return [self._result(row, score) for row, score in zip(candidates[order], ranked[order])]
+
+    def _match_terms(self, token: str, fuzzy: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """(term ids, scores) for exact and prefix matches, or for trigram-similar terms"""
+        if fuzzy:
+            grams = [self._gram_postings[gram] for gram in padded_trigrams(token) if gram in self._gram_postings]
+            if len(token) < 3 or not grams:
+                return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+            ids = np.concatenate(grams)
+            term_ids, shared = np.unique(ids, return_counts=True)
+            similarity = shared / (len(padded_trigrams(token)) + self._term_gram_counts[term_ids] - shared)
+            keep = similarity >= FUZZY_MIN_SIMILARITY
+            term_ids, similarity = term_ids[keep], similarity[keep]
+            if len(term_ids) > FUZZY_TERM_LIMIT:
+                top = np.argpartition(-similarity, FUZZY_TERM_LIMIT)[:FUZZY_TERM_LIMIT]
+                term_ids, similarity = term_ids[top], similarity[top]
+            return term_ids, (0.9 * similarity).astype(np.float32)
+
+        start = bisect.bisect_left(self._sorted_terms, token)
+        end = bisect.bisect_left(self._sorted_terms, token + '\uffff', start, min(start + PREFIX_TERM_LIMIT,
+                                                                                   len(self._sorted_terms)))
+        term_ids = self._sorted_ids[start:end]
+        # Closer completions score higher; an exact term scores 1
+        lengths = np.fromiter((len(term) for term in self._sorted_terms[start:end]), dtype=np.float32,
+                              count=end - start)
+        scores = np.where(lengths == len(token), 1.0, 0.75 + 0.2 * len(token) / np.maximum(lengths, 1))
+        return term_ids, scores.astype(np.float32)
+
+    @staticmethod
+    def _score(postings: Tuple[np.ndarray, np.ndarray], matches: Tuple[np.ndarray, np.ndarray],
+               scores: np.ndarray):
+        """Raise each matched term's securities to the term's score"""
+        indptr, rows = postings
+        for term_id, score in zip(*matches):
+            hits = rows[indptr[term_id]:indptr[term_id + 1]]
+            if len(hits):
+                scores[hits] = np.maximum(scores[hits], score)
+
+    @staticmethod
+    def _csr(pairs: Dict[int, List[int]], term_count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Term -> rows posting lists packed as (indptr, rows)"""
+        lengths = np.zeros(term_count + 1, dtype=np.int64)
+        for term_id, rows in pairs.items():
+            lengths[term_id + 1] = len(rows)
+        indptr = np.cumsum(lengths)
+        rows = np.empty(indptr[-1], dtype=np.int32)
+        for term_id, term_rows in pairs.items():
+            rows[indptr[term_id]:indptr[term_id + 1]] = term_rows
+        return indptr, rows
+
+    def _result(self, row: int, score: float) -> Dict:
+        """Result dict for one row"""
+        result = {'symbol': self.symbols[row], 'name': self.names[row]}
+        for field, values in self.details.items():
+            code = values.codes[row]
+            if code >= 0 and values.categories[code]:
+                result[field] = values.categories[code]
+        result['score'] = round(float(score), 3)
+        return result
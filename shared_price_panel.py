@@ -0,0 +1,239 @@
+"""Shared-memory price panel for TradeRiser.AI server workers
+A refresher process publishes one read-mostly (tickers x dates x fields)
+float64 matrix into a memory-mapped file (on /dev/shm when available).
+Every waitress/gunicorn worker attaches to it through NumPy, so price
+history is held once per host instead of once per worker. Each ticker's
+(dates x fields) block is contiguous, so a ticker's history is returned
+as a read-only DataFrame over the mapping itself; only a ticker with
+missing dates inside its range is copied. New versions are written to a
+fresh file and swapped in atomically by replacing a small manifest.
+
+Run the refresher with:  python shared_price_panel.py
+"""
+import os
+import sys
+import json
+import time
+import glob
+import threading
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from utils_shared import setup_logging
+
+# Setup centralized logging
+setup_logging()
+
+MANIFEST_FILE = 'current.json'
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+PANEL_LAYOUT = 'tickers,dates,fields'
+
+# Symbols published when PRICE_PANEL_TICKERS is not set
+DEFAULT_PANEL_UNIVERSE = [
+    'SPY', 'QQQ', 'IWM', 'VTI', 'EFA', 'EEM', 'VEA', 'VWO', 'XLK', 'XLF', 'XLE', 'XLV', 'XLI',
+    'AGG', 'TLT', 'HYG', 'LQD', 'ARKK', 'ICLN', 'ROBO', 'FINX', 'MTUM', 'QUAL', 'SIZE', 'USMV',
+    'GLD', 'SLV', 'PPLT', 'USO', 'UNG', 'BNO', 'CORN', 'WEAT', 'SOYB', 'CANE', 'COW', 'COPX',
+    'REMX', 'DJP', 'PDBC', 'AAPL', 'MSFT', 'UNH', 'GS', 'HD', 'GOOGL', 'AMZN', 'NVDA', 'META',
+    'TSLA', 'JPM', 'JNJ', 'V', 'PG', 'MA'
+]
+
+
+def default_panel_dir() -> str:
+    """Panel directory: PRICE_PANEL_DIR, else tmpfs when available"""
+    if os.getenv('PRICE_PANEL_DIR'):
+        return os.getenv('PRICE_PANEL_DIR')
+    if os.path.isdir('/dev/shm'):
+        return '/dev/shm/traderiser_price_panel'
+    return os.path.join('data', 'price_panel')
+
+
+class SharedPricePanel:
+    """Read-only view of the published price panel"""
+
+    def __init__(self, directory: str = None, check_interval: float = 5.0, max_age: float = None):
+        """Attach lazily to the panel published in directory"""
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory or default_panel_dir()
+        self.check_interval = check_interval
+        self.max_age = max_age if max_age is not None else float(os.getenv('PRICE_PANEL_MAX_AGE', 3 * 3600))
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._manifest_mtime = None
+        self._state = None  # (manifest, data, dates, ticker_index)
+
+    @classmethod
+    def from_env(cls) -> Optional['SharedPricePanel']:
+        """Create a reader when PRICE_PANEL_ENABLED is set"""
+        if os.getenv('PRICE_PANEL_ENABLED', 'false').lower() != 'true':
+            return None
+        return cls()
+
+    def covers(self, symbol: str, start: pd.Timestamp, interval: str = '1d') -> bool:
+        """Check whether the current panel can serve a symbol from start onward"""
+        state = self._current()
+        if state is None:
+            return False
+        manifest, _, dates, ticker_index = state
+        if manifest.get('interval') != interval or symbol not in ticker_index or len(dates) == 0:
+            return False
+        # Allow a few days of slack for weekends/holidays at the window start
+        return start is not None and dates[0] <= (start + pd.Timedelta(days=5)).value
+
+    def ticker_history(self, symbol: str, start: pd.Timestamp) -> pd.DataFrame:
+        """One ticker's OHLCV frame from start, backed by the shared mapping (read-only)"""
+        state = self._current()
+        if state is None or symbol not in state[3]:
+            return pd.DataFrame()
+        manifest, data, dates, ticker_index = state
+        first = int(np.searchsorted(dates, start.value, side='left')) if start is not None else 0
+        rows = data[ticker_index[symbol], first:]
+        present = np.flatnonzero(~np.isnan(rows).all(axis=1))
+        if not len(present):
+            return pd.DataFrame()
+        if present[-1] - present[0] + 1 == len(present):
+            # Dates before listing or after delisting are trimmed with a slice, which stays a view
+            present = slice(present[0], present[-1] + 1)
+        return pd.DataFrame(rows[present], index=pd.DatetimeIndex(dates[first:][present]),
+                            columns=manifest['fields'], copy=False)
+
+    def version(self) -> Optional[str]:
+        """Version of the attached panel"""
+        state = self._current()
+        return state[0]['version'] if state else None
+
+    def _current(self):
+        """Return the attached state, re-attaching when a new version was published"""
+        now = time.time()
+        if now - self._last_check >= self.check_interval:
+            with self._lock:
+                if now - self._last_check >= self.check_interval:
+                    self._last_check = now
+                    self._maybe_attach()
+        state = self._state
+        if state is not None and now - state[0].get('created_at', 0) > self.max_age:
+            return None  # Refresher stopped; fall back to regular fetching
+        return state
+
+    def _maybe_attach(self):
+        """Memory-map the panel referenced by the manifest if it changed"""
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        try:
+            mtime = os.stat(manifest_path).st_mtime_ns
+        except OSError:
+            self._state = None
+            return
+        if mtime == self._manifest_mtime:
+            return
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('layout') != PANEL_LAYOUT:
+                raise ValueError(f"unsupported panel layout {manifest.get('layout')!r}; republish the panel")
+            data = np.load(os.path.join(self.directory, manifest['data_file']), mmap_mode='r')
+            dates = np.load(os.path.join(self.directory, manifest['dates_file']), mmap_mode='r')
+            ticker_index = {ticker: i for i, ticker in enumerate(manifest['tickers'])}
+            self._state = (manifest, data, dates, ticker_index)
+            self._manifest_mtime = mtime
+            self.logger.info(f"Attached shared price panel {manifest['version']} "
+                             f"({len(ticker_index)} tickers, {data.nbytes / 1e6:.1f} MB)")
+        except Exception as e:
+            self.logger.error(f"Error attaching shared price panel: {str(e)}")
+
+
+class SharedPricePanelPublisher:
+    """Builds the price panel and publishes new versions atomically"""
+
+    def __init__(self, tickers: List[str] = None, period: str = None, directory: str = None,
+                 keep_versions: int = 2):
+        """Initialize publisher for a ticker universe"""
+        self.logger = logging.getLogger(__name__)
+        env_tickers = os.getenv('PRICE_PANEL_TICKERS')
+        self.tickers = tickers or ([t.strip().upper() for t in env_tickers.split(',') if t.strip()]
+                                   if env_tickers else list(DEFAULT_PANEL_UNIVERSE))
+        self.period = period or os.getenv('PRICE_PANEL_PERIOD', '2y')
+        self.directory = directory or default_panel_dir()
+        self.keep_versions = keep_versions
+
+    def publish(self) -> Optional[Dict]:
+        """Download the universe, write a new panel version and swap the manifest"""
+        from market_data_service import MarketDataService
+
+        # Never read from the panel we are about to replace
+        service = MarketDataService(shared_panel=False)
+        panel = service.get_history(self.tickers, period=self.period)
+        if panel.empty:
+            self.logger.error("Shared price panel not published: no data downloaded")
+            return None
+
+        tickers = [t for t in self.tickers if t in panel.columns.get_level_values(1)]
+        dates = pd.DatetimeIndex(panel.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        data = np.full((len(tickers), len(dates), len(PANEL_FIELDS)), np.nan, dtype=np.float64)
+        for f, field in enumerate(PANEL_FIELDS):
+            if field in panel.columns.get_level_values(0):
+                data[:, :, f] = panel[field].reindex(columns=tickers).to_numpy(dtype=np.float64).T
+
+        os.makedirs(self.directory, exist_ok=True)
+        version = str(time.time_ns())
+        data_file = f"panel-{version}.npy"
+        dates_file = f"dates-{version}.npy"
+        self._atomic_save(data_file, data)
+        # Readers compare against Timestamp.value, which is always nanoseconds
+        self._atomic_save(dates_file, dates.as_unit('ns').asi8)
+
+        manifest = {
+            'version': version,
+            'data_file': data_file,
+            'dates_file': dates_file,
+            'layout': PANEL_LAYOUT,
+            'fields': PANEL_FIELDS,
+            'tickers': tickers,
+            'period': self.period,
+            'interval': '1d',
+            'created_at': time.time()
+        }
+        tmp_path = os.path.join(self.directory, f".{MANIFEST_FILE}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST_FILE))
+        self._cleanup_old_versions()
+        self.logger.info(f"Published shared price panel {version}: {len(tickers)} tickers x {len(dates)} dates")
+        return manifest
+
+    def run_forever(self, refresh_seconds: int = None):
+        """Republish the panel on a fixed cadence"""
+        refresh_seconds = refresh_seconds or int(os.getenv('PRICE_PANEL_REFRESH_SECONDS', 900))
+        while True:
+            try:
+                self.publish()
+            except Exception as e:
+                self.logger.error(f"Error publishing shared price panel: {str(e)}")
+            time.sleep(refresh_seconds)
+
+    def _atomic_save(self, name: str, array: np.ndarray):
+        """Write an .npy file under a temporary name and rename it into place"""
+        tmp_path = os.path.join(self.directory, f".{name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, os.path.join(self.directory, name))
+
+    def _cleanup_old_versions(self):
+        """Remove superseded versions; attached workers keep their mapping until they swap"""
+        for pattern in ('panel-*.npy', 'dates-*.npy'):
+            files = sorted(glob.glob(os.path.join(self.directory, pattern)))
+            for path in files[:-self.keep_versions]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+if __name__ == '__main__':
+    publisher = SharedPricePanelPublisher()
+    if '--once' in sys.argv:
+        publisher.publish()
+    else:
+        publisher.run_forever()
@@ -20,6 +20,7 @@ else
     source venv/bin/activate
 fi
 
-# Start the application with Waitress
-echo "Starting Flask application on port $PORT..."
-waitress-serve --host=0.0.0.0 --port=$PORT application:application
\ No newline at end of file
+# Start the application with Waitress; SERVER_THREADS also sizes the SSE stream cap
+export SERVER_THREADS=${SERVER_THREADS:-32}
+echo "Starting Flask application on port $PORT ($SERVER_THREADS threads)..."
+waitress-serve --host=0.0.0.0 --port=$PORT --threads=$SERVER_THREADS application:application
\ No newline at end of file
@@ -15,6 +15,10 @@ sys.path.insert(0, str(project_root))
 def main():
     """Start the Flask application using waitress"""
     try:
+        # The app caps open SSE streams at a quarter of SERVER_THREADS, so set it before importing
+        threads = int(os.environ.get('WAITRESS_THREADS', 32))
+        os.environ['SERVER_THREADS'] = str(threads)
+        
         # Import waitress and the Flask app
         from waitress import serve
         from application import application
@@ -23,10 +27,10 @@ def main():
         port = int(os.environ.get('PORT', 8000))
         host = '0.0.0.0'
         
-        print(f"Starting TradeRiser AI server on {host}:{port}")
+        print(f"Starting TradeRiser AI server on {host}:{port} ({threads} threads)")
         
         # Start the server
-        serve(application, host=host, port=port)
+        serve(application, host=host, port=port, threads=threads)
         
     except ImportError as e:
         print(f"Import error: {e}")
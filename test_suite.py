@@ -13,6 +13,29 @@ from portfolio_analyzer import PortfolioAnalyzer
 from etf_analyzer import ETFAnalyzer
 from commodities_trader import CommoditiesTrader
 from utils_shared import setup_logging, TechnicalIndicators, DataProcessor, ErrorHandler
+from market_data_service import MarketDataService
+from price_store import PriceStore, period_start, PYARROW_AVAILABLE
+from shared_price_panel import SharedPricePanel, MANIFEST_FILE
+from Utils.utils_singleflight import SingleFlight
+from Utils.utils_memory_cache import TTLCache
+from Utils.utils_codec import pack, unpack
+from Utils.utils_rate_limiter import RateLimiter, RateLimitExceeded
+from Utils.utils_http import get_session
+from ticker_broadcaster import TickerBroadcaster
+from Utils.utils_fanout import fan_out
+from dashboard_assets import DashboardAssets
+from job_manager import JobManager
+from Utils.utils_request import payload_hash
+from response_cache import ResponseCache
+from Utils.utils_json import FastJSONProvider, frame_to_columns
+from quote_service import QuoteService
+from cache_warmer import CacheWarmer
+from dataset_loader import DatasetLoader, dataset_property
+from instrument_index import InstrumentIndex
+from instrument_universe import InstrumentUniverse
+from instrument_snapshot import InstrumentSnapshot, InstrumentSnapshotPublisher
+from options_enrichment import OptionsEnrichment
+from security_search import SecuritySearchEngine
 
 # Setup logging for tests
 setup_logging()
@@ -187,6 +210,1386 @@ class TestSharedUtilities(unittest.TestCase):
         
         print("✓ Error handler test passed")
 
+class TestMarketDataService(unittest.TestCase):
+    """Test cases for the shared bulk market data service"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.service = MarketDataService(batch_size=2, memo_ttl=60)
+    
+    def test_normalize_tickers(self):
+        """Test ticker normalization and de-duplication"""
+        self.assertEqual(self.service._normalize_tickers('spy, qqq SPY'), ['SPY', 'QQQ'])
+        self.assertEqual(self.service._normalize_tickers([' aapl', 'AAPL', '']), ['AAPL'])
+        
+        print("✓ Ticker normalization test passed")
+    
+    def test_split_panel(self):
+        """Test splitting a bulk download into aligned per-ticker frames"""
+        import pandas as pd
+        import numpy as np
+        
+        dates = pd.date_range('2024-01-01', periods=3, freq='D')
+        columns = pd.MultiIndex.from_product([['Close', 'Volume'], ['SPY', 'BTC-USD']])
+        raw = pd.DataFrame(np.arange(12, dtype=float).reshape(3, 4), index=dates, columns=columns)
+        raw.loc[dates[0], ('Close', 'SPY')] = np.nan
+        raw.loc[dates[0], ('Volume', 'SPY')] = np.nan
+        
+        frames = self.service._split_panel(raw, ['SPY', 'BTC-USD', 'MISSING'])
+        self.assertEqual(set(frames), {'SPY', 'BTC-USD'})
+        self.assertEqual(list(frames['SPY'].columns), ['Close', 'Volume'])
+        self.assertEqual(len(frames['SPY']), 2)  # Non-trading day dropped
+        self.assertEqual(len(frames['BTC-USD']), 3)
+        
+        print("✓ Bulk panel split test passed")
+    
+    def test_memo_is_bounded(self):
+        """Test that memoized frames are served within the TTL, copied out and evicted past the limit"""
+        from unittest import mock
+        import pandas as pd
+        
+        with mock.patch.dict(os.environ, {'MARKET_DATA_MEMO_MAX_ENTRIES': '2'}):
+            service = MarketDataService(memo_ttl=60, shared_panel=False)
+        downloads = []
+        
+        def fake_download(symbols, interval, actions=False, **window):
+            downloads.extend(symbols)
+            return {symbol: pd.DataFrame({'Close': [1.0, 2.0]}) for symbol in symbols}
+        
+        service._bulk_download = fake_download
+        first = service.get_ticker_history('spy', period='5d', interval='1h')
+        first['Close'] = 0.0
+        self.assertEqual(list(service.get_ticker_history('SPY', period='5d', interval='1h')['Close']), [1.0, 2.0])
+        self.assertEqual(downloads, ['SPY'])
+        
+        service.prefetch(['QQQ', 'IWM'], period='5d', interval='1h')
+        self.assertEqual(len(service._memo), 2)
+        service.get_ticker_history('SPY', period='5d', interval='1h')  # Evicted, so fetched again
+        self.assertEqual(downloads, ['SPY', 'QQQ', 'IWM', 'SPY'])
+        
+        print("✓ Bounded memo test passed")
+    
+    @unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow not installed")
+    def test_corporate_action_redownloads_stored_range(self):
+        """Test that a split in the incremental window re-downloads instead of appending"""
+        import tempfile
+        import pandas as pd
+        
+        with tempfile.TemporaryDirectory() as root:
+            store = PriceStore(root=root)
+            service = MarketDataService(price_store=store, shared_panel=False)
+            service.store_refresh = 0
+            dates = pd.date_range('2024-01-01', periods=3, freq='D')
+            store.replace('AAPL', pd.DataFrame({'Close': [100.0, 102.0, 104.0]}, index=dates), covered_from=dates[0])
+            calls = []
+            
+            def fake_download(symbols, interval, actions=False, **window):
+                calls.append((actions, window))
+                if actions:  # Incremental tail: a 2-for-1 split on the new bar
+                    tail_dates = pd.date_range('2024-01-03', periods=2, freq='D')
+                    return {'AAPL': pd.DataFrame({'Close': [52.0, 53.0], 'Stock Splits': [0.0, 2.0]}, index=tail_dates)}
+                # Full range on the new (split-adjusted) basis
+                return {'AAPL': pd.DataFrame({'Close': [50.0, 51.0, 52.0, 53.0]},
+                                             index=pd.date_range('2024-01-01', periods=4, freq='D'))}
+            
+            service._bulk_download = fake_download
+            frames = service._download_via_store(['AAPL'], '1y', '1d', dates[0])
+            self.assertEqual([c[0] for c in calls], [True, False])
+            self.assertEqual(calls[1][1], {'start': '2024-01-01'})
+            self.assertEqual(list(frames['AAPL']['Close']), [50.0, 51.0, 52.0, 53.0])
+        
+        print("✓ Corporate action re-download test passed")
+
+class TestPriceStore(unittest.TestCase):
+    """Test cases for the local columnar price store"""
+    
+    def test_period_start(self):
+        """Test translating yfinance periods into window start dates"""
+        from datetime import datetime
+        
+        now = datetime(2024, 6, 15, 13, 30)
+        self.assertEqual(str(period_start('1y', now).date()), '2023-06-15')
+        self.assertEqual(str(period_start('3mo', now).date()), '2024-03-15')
+        self.assertEqual(str(period_start('30d', now).date()), '2024-05-16')
+        self.assertEqual(str(period_start('ytd', now).date()), '2024-01-01')
+        self.assertIsNone(period_start('max', now))
+        
+        print("✓ Period start test passed")
+    
+    @unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow not installed")
+    def test_incremental_append_and_range_read(self):
+        """Test appending new bars and reading a date range back"""
+        import tempfile
+        import pandas as pd
+        
+        with tempfile.TemporaryDirectory() as root:
+            store = PriceStore(root=root)
+            dates = pd.date_range('2024-01-01', periods=5, freq='D')
+            bars = pd.DataFrame({'Close': [1.0, 2.0, 3.0, 4.0, 5.0]}, index=dates)
+            store.replace('SPY', bars, covered_from=dates[0])
+            
+            # Last stored bar is revised and one new bar arrives
+            tail = pd.DataFrame({'Close': [5.5, 6.0]}, index=pd.date_range('2024-01-05', periods=2, freq='D'))
+            self.assertEqual(store.append('SPY', tail), 2)
+            
+            frame = store.read('SPY', start='2024-01-04')
+            self.assertEqual(list(frame['Close']), [4.0, 5.5, 6.0])
+            self.assertEqual(str(store.coverage('SPY')['last'].date()), '2024-01-06')
+        
+        print("✓ Price store append test passed")
+    
+    @unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow not installed")
+    def test_replace_and_compact_never_drop_coverage(self):
+        """Test that replaced and compacted bars stay readable even if old parts are never removed"""
+        import tempfile
+        import pandas as pd
+        
+        with tempfile.TemporaryDirectory() as root:
+            store = PriceStore(root=root, compact_after=2)
+            dates = pd.date_range('2024-01-01', periods=3, freq='D')
+            store.replace('SPY', pd.DataFrame({'Close': [1.0, 2.0, 3.0]}, index=dates), covered_from=dates[0])
+            
+            # Crash after the new part is written but before the old one is deleted
+            remove_parts = store._remove_parts
+            store._remove_parts = lambda *args: None
+            store.replace('SPY', pd.DataFrame({'Close': [10.0, 20.0, 30.0]}, index=dates), covered_from=dates[0])
+            self.assertEqual(store._part_count('SPY', '1d'), 2)
+            self.assertEqual(list(store.read('SPY')['Close']), [10.0, 20.0, 30.0])
+            
+            store._remove_parts = remove_parts
+            store.append('SPY', pd.DataFrame({'Close': [31.0, 40.0]}, index=pd.date_range('2024-01-03', periods=2)))
+            self.assertEqual(store._part_count('SPY', '1d'), 1)  # Compacted
+            self.assertEqual(list(store.read('SPY')['Close']), [10.0, 20.0, 31.0, 40.0])
+        
+        print("✓ Price store replace/compact test passed")
+
+class TestSharedPricePanel(unittest.TestCase):
+    """Test cases for the memory-mapped shared price panel"""
+    
+    def test_attach_and_slice(self):
+        """Test attaching to a published panel and slicing one ticker without copying it"""
+        import json
+        import tempfile
+        import time
+        import numpy as np
+        import pandas as pd
+        
+        with tempfile.TemporaryDirectory() as directory:
+            dates = pd.date_range('2024-01-01', periods=4, freq='D')
+            # (tickers, dates, fields); QQQ listed on the second date, TLT misses the third
+            data = np.arange(4 * 4 * 2, dtype=np.float64).reshape(4, 4, 2)
+            data[2, 0] = np.nan
+            data[3, 2] = np.nan
+            np.save(f"{directory}/panel-1.npy", data)
+            np.save(f"{directory}/dates-1.npy", dates.as_unit('ns').asi8)
+            manifest = {'version': '1', 'data_file': 'panel-1.npy', 'dates_file': 'dates-1.npy',
+                        'layout': 'tickers,dates,fields', 'fields': ['Close', 'Volume'],
+                        'tickers': ['SPY', 'GLD', 'QQQ', 'TLT'], 'interval': '1d', 'created_at': time.time()}
+            with open(f"{directory}/{MANIFEST_FILE}", 'w') as f:
+                json.dump(manifest, f)
+            
+            panel = SharedPricePanel(directory=directory, check_interval=0)
+            self.assertTrue(panel.covers('GLD', dates[0]))
+            self.assertFalse(panel.covers('XLE', dates[0]))
+            
+            frame = panel.ticker_history('GLD', dates[2])
+            self.assertEqual(list(frame['Close']), [12.0, 14.0])
+            self.assertEqual(list(frame['Volume']), [13.0, 15.0])
+            mapping = panel._current()[1]
+            self.assertTrue(np.shares_memory(frame.to_numpy(), mapping))
+            
+            listed = panel.ticker_history('QQQ', dates[0])
+            self.assertEqual(list(listed.index), list(dates[1:]))
+            self.assertTrue(np.shares_memory(listed.to_numpy(), mapping))
+            gapped = panel.ticker_history('TLT', dates[0])
+            self.assertEqual(list(gapped['Close']), [24.0, 26.0, 30.0])
+            
+            # A panel written in another layout is not attached
+            manifest['layout'] = 'fields,dates,tickers'
+            with open(f"{directory}/{MANIFEST_FILE}", 'w') as f:
+                json.dump(manifest, f)
+            other = SharedPricePanel(directory=directory, check_interval=0)
+            self.assertFalse(other.covers('GLD', dates[0]))
+        
+        print("✓ Shared price panel test passed")
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for single-flight request coalescing"""
+    
+    def test_concurrent_calls_share_one_fetch(self):
+        """Test that concurrent callers for the same key trigger a single fetch"""
+        import threading
+        import time
+        
+        calls = []
+        def fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'price': 100.0}
+        
+        flight = SingleFlight()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do('quote:AAPL', fetch)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'price': 100.0}] * 8)
+        
+        print("✓ Single-flight coalescing test passed")
+    
+    def test_errors_propagate_and_clear(self):
+        """Test that a failed fetch raises for the caller and is not remembered"""
+        flight = SingleFlight()
+        def failing():
+            raise ValueError("vendor down")
+        
+        with self.assertRaises(ValueError):
+            flight.do('fred:CPIAUCSL', failing)
+        self.assertEqual(flight.do('fred:CPIAUCSL', lambda: 3.2), 3.2)
+        
+        print("✓ Single-flight error propagation test passed")
+
+class TestTTLCache(unittest.TestCase):
+    """Test cases for the bounded in-process cache"""
+    
+    def test_ttl_expiry(self):
+        """Test that entries expire after their TTL"""
+        import time
+        
+        cache = TTLCache()
+        cache.set('quote:AAPL', {'price': 1.0}, 0.05)
+        self.assertEqual(cache.get('quote:AAPL'), {'price': 1.0})
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('quote:AAPL'))
+        self.assertEqual(cache.stats()['expirations'], 1)
+        
+        print("✓ TTL cache expiry test passed")
+    
+    def test_lru_eviction_by_entries_and_bytes(self):
+        """Test LRU eviction when entry or byte limits are exceeded"""
+        cache = TTLCache(max_entries=2)
+        cache.set('a', 1, 60)
+        cache.set('b', 2, 60)
+        cache.get('a')  # 'b' becomes least recently used
+        cache.set('c', 3, 60)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        
+        small = TTLCache(max_bytes=300)
+        small.set('x', 'y' * 100, 60)
+        small.set('z', 'y' * 100, 60)
+        self.assertIsNone(small.get('x'))
+        self.assertLessEqual(small.stats()['bytes'], 300)
+        
+        print("✓ TTL cache eviction test passed")
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    """Test cases for soft/hard TTL and bulk caching in APIClient"""
+    
+    def setUp(self):
+        """Build an in-memory APIClient without vendor connections"""
+        import logging
+        from Utils.utils_api_client import APIClient
+        self.client = APIClient.__new__(APIClient)
+        self.client.logger = logging.getLogger(__name__)
+        self.client.redis = None
+        self.client.redis_binary = None
+        self.client.in_memory_cache = TTLCache()
+        self.client.stale_factor = 4.0
+        self.client.single_flight = SingleFlight()
+        self.client.rate_limiter = RateLimiter()
+    
+    def test_stale_value_served_and_refreshed(self):
+        """Test that a stale entry is returned immediately and refreshed in the background"""
+        import time
+        
+        self.client._cache_set('quote:TEST', {'price': 1.0}, 300)
+        self.client.in_memory_cache.get('quote:TEST')['_soft'] = time.time() - 1
+        self.assertIsNone(self.client._cache_get('quote:TEST'))
+        
+        value = self.client._get_or_fetch('quote:TEST', 300, lambda: {'price': 2.0})
+        self.assertEqual(value, {'price': 1.0})
+        
+        deadline = time.time() + 5
+        while self.client._cache_get('quote:TEST') is None and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.client._cache_get('quote:TEST'), {'price': 2.0})
+        
+        print("✓ Stale-while-revalidate test passed")
+    
+    def test_hard_expiry_fetches_inline(self):
+        """Test that entries past the hard TTL are fetched on the request path"""
+        import time
+        
+        self.client._cache_set('fred:FEDFUNDS', 5.0, 60)
+        self.client.in_memory_cache.delete('fred:FEDFUNDS')  # Past the hard TTL
+        self.assertEqual(self.client._get_or_fetch('fred:FEDFUNDS', 60, lambda: 5.25), 5.25)
+        
+        print("✓ Hard TTL expiry test passed")
+    
+    def test_bulk_get_set_and_prewarm(self):
+        """Test batched cache reads/writes and thread-local pre-warming"""
+        self.client._cache_set_many({'quote:A': {'price': 1.0}, 'quote:B': {'price': 2.0}}, 300)
+        self.assertEqual(self.client._cache_get_many(['quote:A', 'quote:B', 'quote:C']),
+                         {'quote:A': {'price': 1.0}, 'quote:B': {'price': 2.0}})
+        
+        with self.client.prewarm_cache(['quote:A', 'quote:B']):
+            self.client.in_memory_cache.clear()  # Reads must now come from the pre-warmed set
+            self.assertEqual(self.client._cache_get('quote:A'), {'price': 1.0})
+            self.client._cache_set('quote:C', {'price': 3.0}, 300)
+            self.assertEqual(self.client._cache_get('quote:C'), {'price': 3.0})
+        self.assertIsNone(self.client._cache_get('quote:A'))
+        
+        print("✓ Bulk cache operations test passed")
+
+    def test_packed_frame_cache(self):
+        """Test caching a DataFrame through the binary codec"""
+        import numpy as np
+        import pandas as pd
+        
+        hist = pd.DataFrame({'Close': np.linspace(100, 110, 5)}, index=pd.date_range('2024-01-01', periods=5))
+        self.client._cache_set_frame('history:TEST:1y', hist, 300)
+        pd.testing.assert_frame_equal(self.client._cache_get_frame('history:TEST:1y'), hist, check_freq=False)
+        self.assertIsNone(self.client._cache_get_frame('history:MISSING:1y'))
+        
+        print("✓ Packed frame cache test passed")
+
+class TestBinaryCodec(unittest.TestCase):
+    """Test cases for the compact binary cache codec"""
+    
+    def test_round_trips(self):
+        """Test DataFrame, Series and ndarray round trips"""
+        import numpy as np
+        import pandas as pd
+        
+        index = pd.date_range('2024-01-01', periods=300, freq='D', tz='America/New_York')
+        frame = pd.DataFrame({'Close': np.random.rand(300), 'Volume': np.arange(300, dtype='int64'),
+                              'Signal': ['BUY', 'SELL', None] * 100}, index=index)
+        decoded = unpack(pack(frame))
+        pd.testing.assert_frame_equal(decoded[['Close', 'Volume']], frame[['Close', 'Volume']], check_freq=False)
+        self.assertEqual(list(decoded['Signal'][:2]), ['BUY', 'SELL'])
+        self.assertTrue(pd.isna(decoded['Signal'].iloc[2]))
+        
+        series = frame['Close']
+        pd.testing.assert_series_equal(unpack(pack(series)), series, check_freq=False)
+        
+        matrix = np.random.rand(4, 3)
+        np.testing.assert_array_equal(unpack(pack(matrix)), matrix)
+        
+        print("✓ Binary codec round trip test passed")
+    
+    def test_smaller_than_json(self):
+        """Test that packed prices are smaller than their JSON encoding"""
+        import numpy as np
+        import pandas as pd
+        
+        frame = pd.DataFrame({'Close': np.round(np.linspace(100, 200, 500), 2)},
+                             index=pd.date_range('2022-01-01', periods=500))
+        self.assertLess(len(pack(frame)), len(frame.to_json()))
+        
+        print("✓ Binary codec size test passed")
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for the token-bucket vendor rate limiter"""
+    
+    def test_try_acquire_is_non_blocking(self):
+        """Test that tokens run out after the burst and report a retry delay"""
+        limiter = RateLimiter()
+        limiter.configure('test_try_acquire', 5, 60)
+        results = [limiter.try_acquire('test_try_acquire')[0] for _ in range(6)]
+        self.assertEqual(results, [True] * 5 + [False])
+        acquired, retry_after = limiter.try_acquire('test_try_acquire')
+        self.assertFalse(acquired)
+        self.assertGreater(retry_after, 0)
+        
+        print("✓ Rate limiter try_acquire test passed")
+    
+    def test_acquire_waits_within_bound(self):
+        """Test that acquire waits for a refill but raises past its bound"""
+        limiter = RateLimiter(max_wait=0.5, background_max_wait=0.5)
+        limiter.configure('fast', 1, 0.1)
+        limiter.acquire('fast')
+        limiter.acquire('fast')  # Refills within ~0.1s
+        
+        limiter.configure('slow', 1, 60)
+        limiter.acquire('slow')
+        with self.assertRaises(RateLimitExceeded):
+            limiter.acquire('slow')
+        
+        print("✓ Rate limiter acquire test passed")
+    
+    def test_local_buckets_shared_per_process(self):
+        """Test that limiters in one process (one per APIClient) draw from one budget per vendor"""
+        first, second = RateLimiter(), RateLimiter()
+        first.configure('test_shared_vendor', 3, 60)
+        second.configure('test_shared_vendor', 3, 60)
+        results = [limiter.try_acquire('test_shared_vendor')[0] for limiter in (first, second, first, second)]
+        self.assertEqual(results, [True, True, True, False])
+        
+        print("✓ Rate limiter shared bucket test passed")
+    
+    def test_try_acquire_up_to_grants_what_is_left(self):
+        """Test that a batch takes as many tokens as remain in one call"""
+        limiter = RateLimiter()
+        limiter.configure('test_up_to', 5, 60)
+        self.assertEqual(limiter.try_acquire_up_to('test_up_to', 3), 3)
+        self.assertEqual(limiter.try_acquire_up_to('test_up_to', 4), 2)
+        self.assertEqual(limiter.try_acquire_up_to('test_up_to', 4), 0)
+        self.assertEqual(limiter.try_acquire_up_to('test_up_to', 0), 0)
+        
+        print("✓ Rate limiter try_acquire_up_to test passed")
+    
+    def test_from_env_without_redis(self):
+        """Test that from_env falls back to local buckets and services keep the limiter they are given"""
+        from unittest import mock
+        
+        with mock.patch.dict(os.environ, {'REDIS_HOST': '127.0.0.1', 'REDIS_PORT': '1'}):
+            limiter = RateLimiter.from_env(max_wait=0)
+        self.assertIsNone(limiter.redis)
+        self.assertEqual(limiter.max_wait, 0)
+        service = QuoteService(rate_limiter=limiter)
+        self.assertIs(service.rate_limiter, limiter)
+        self.assertTrue(limiter.try_acquire('finnhub')[0])
+        
+        print("✓ Rate limiter from_env test passed")
+
+class TestHTTPTransport(unittest.TestCase):
+    """Test cases for the shared pooled HTTP session"""
+    
+    def test_session_is_shared_and_pooled(self):
+        """Test that vendor calls share one session with sized connection pools"""
+        session = get_session()
+        self.assertIs(session, get_session())
+        adapter = session.get_adapter('https://api.coingecko.com')
+        self.assertEqual(adapter._pool_maxsize, int(os.getenv('HTTP_POOL_SIZE', 20)))
+        
+        print("✓ Shared HTTP session test passed")
+
+class TestTickerBroadcaster(unittest.TestCase):
+    """Test cases for the ticker snapshot broadcaster"""
+    
+    def test_snapshot_and_deltas(self):
+        """Test that refreshes publish only changed tickers to stream subscribers"""
+        import json
+        
+        prices = {'AAPL': 190.0, 'MSFT': 410.0}
+        broadcaster = TickerBroadcaster({'djia': ['AAPL', 'MSFT']},
+                                        lambda t: {'current_price': prices[t], 'change_percent': 0.0})
+        broadcaster.start = lambda: None  # Drive refreshes manually
+        broadcaster.refresh()
+        version, snapshot = broadcaster.snapshot()
+        self.assertEqual(snapshot['djia']['MSFT']['current_price'], 410.0)
+        
+        stream = broadcaster.stream(heartbeat=0.05)
+        self.assertIn('event: snapshot', next(stream))
+        prices['AAPL'] = 191.5
+        self.assertEqual(broadcaster.refresh(), {'djia': {'AAPL': {'current_price': 191.5, 'change_percent': 0.0}}})
+        message = next(stream)
+        self.assertIn('event: delta', message)
+        self.assertEqual(json.loads(message.split('data: ')[1]), {'djia': {'AAPL': {'current_price': 191.5, 'change_percent': 0.0}}})
+        self.assertEqual(broadcaster.refresh(), {})  # Unchanged prices publish nothing
+        self.assertEqual(broadcaster.version, version + 1)
+        
+        print("✓ Ticker broadcaster test passed")
+    
+    def test_warm_waits_for_first_snapshot(self):
+        """Test that warming starts the refresh thread and reports tickers with a price"""
+        broadcaster = TickerBroadcaster({'djia': ['AAPL', 'MSFT']},
+                                        lambda t: {'current_price': 190.0 if t == 'AAPL' else 0, 'change_percent': 0.0},
+                                        interval=5)
+        self.assertEqual(broadcaster.version, 0)
+        self.assertEqual(broadcaster.warm(['AAPL', 'MSFT']), 1)
+        self.assertGreaterEqual(broadcaster.version, 1)  # /api/tickers no longer waits
+        
+        print("✓ Ticker broadcaster warmup test passed")
+    
+    def test_stream_cap_follows_server_threads(self):
+        """Test that open streams are capped at a quarter of the server threads"""
+        from unittest import mock
+        from Utils.utils_streams import StreamSlots, stream_capacity
+        
+        with mock.patch.dict(os.environ, {'SERVER_THREADS': '32', 'STREAM_MAX_CLIENTS': '32'}):
+            self.assertEqual(stream_capacity(), 8)
+        with mock.patch.dict(os.environ, {'SERVER_THREADS': '64', 'STREAM_MAX_CLIENTS': '5'}):
+            self.assertEqual(stream_capacity(), 5)
+        with mock.patch.dict(os.environ, {'STREAM_MAX_CLIENTS': '32'}):
+            os.environ.pop('SERVER_THREADS', None)
+            self.assertEqual(stream_capacity(), 1)  # Waitress's default of 4 threads
+        
+        slots = StreamSlots(capacity=2)
+        broadcaster = TickerBroadcaster({'stocks': ['AAA']}, lambda ticker: {}, slots=slots)
+        self.assertEqual([broadcaster.acquire_client() for _ in range(3)], [True, True, False])
+        broadcaster.release_client()
+        self.assertTrue(slots.acquire())
+        self.assertEqual(slots.stats(), {'open': 2, 'capacity': 2})
+        
+        print("✓ Ticker stream cap test passed")
+
+class TestFanOut(unittest.TestCase):
+    """Test cases for deadline-bounded concurrent fan-out"""
+    
+    def test_concurrent_results_and_errors(self):
+        """Test that items run concurrently and errors are reported per item"""
+        import time
+        
+        def fetch(ticker):
+            time.sleep(0.2)
+            if ticker == 'BAD':
+                raise ValueError("unknown symbol")
+            return ticker.lower()
+        
+        started = time.time()
+        outcome = fan_out(fetch, ['AAPL', 'MSFT', 'NVDA', 'BAD'], max_workers=4, deadline=5)
+        self.assertLess(time.time() - started, 0.6)
+        self.assertEqual(outcome.results, {'AAPL': 'aapl', 'MSFT': 'msft', 'NVDA': 'nvda'})
+        self.assertIn('BAD', outcome.errors)
+        self.assertFalse(outcome.partial)
+        
+        print("✓ Fan-out concurrency test passed")
+    
+    def test_deadline_marks_pending(self):
+        """Test that slow items are returned as pending when the deadline passes"""
+        import time
+        
+        outcome = fan_out(lambda delay: time.sleep(delay) or delay, [0.01, 1.0], deadline=0.3)
+        self.assertEqual(outcome.results, {0.01: 0.01})
+        self.assertEqual(outcome.pending, [1.0])
+        self.assertTrue(outcome.partial)
+        
+        print("✓ Fan-out deadline test passed")
+    
+    def test_background_pool_does_not_starve_requests(self):
+        """Test that abandoned background calls hold only background threads"""
+        import threading
+        
+        release = threading.Event()
+        try:
+            stuck = fan_out(lambda i: release.wait(5), range(40), max_workers=40, deadline=0.2, pool='background')
+            self.assertEqual(len(stuck.pending), 40)
+            
+            outcome = fan_out(lambda ticker: threading.current_thread().name, ['SPY', 'QQQ'], deadline=2)
+            self.assertFalse(outcome.partial)
+            self.assertTrue(all(name.startswith('fanout-request') for name in outcome.results.values()))
+        finally:
+            release.set()
+        
+        print("✓ Fan-out pool isolation test passed")
+
+class TestDashboardAssets(unittest.TestCase):
+    """Test cases for the prebuilt, precompressed dashboard"""
+    
+    TEMPLATE = ("<html><head><style>body { color: red; }</style></head>"
+                "<body><button onclick=\"go()\">Go</button><script>function go() {}</script></body></html>")
+    
+    def setUp(self):
+        """Set up a Flask app serving a small template"""
+        from flask import Flask, request
+        self.assets = DashboardAssets(self.TEMPLATE)
+        app = Flask(__name__)
+        app.add_url_rule('/', 'index', lambda: self.assets.page_response(request))
+        app.add_url_rule('/assets/<path:name>', 'asset',
+                         lambda name: self.assets.asset_response(name, request) or ('', 404))
+        self.client = app.test_client()
+    
+    def test_fingerprinted_split(self):
+        """Test that inline CSS/JS move into fingerprinted files referenced from the page"""
+        html = self.assets.html.encodings['identity'].decode('utf-8')
+        css = [n for n in self.assets.assets if n.endswith('.css')][0]
+        js = [n for n in self.assets.assets if n.endswith('.js')][0]
+        self.assertIn(f'<link rel="stylesheet" href="/assets/{css}">', html)
+        self.assertIn(f'<script src="/assets/{js}"></script>', html)
+        self.assertNotIn('color: red', html)
+        self.assertEqual(self.assets.assets[js].encodings['identity'], b'function go() {}')
+        
+        print("✓ Dashboard asset split test passed")
+    
+    def test_negotiation_and_revalidation(self):
+        """Test gzip negotiation, immutable asset caching and 304 on a matching ETag"""
+        import gzip
+        js = [n for n in self.assets.assets if n.endswith('.js')][0]
+        response = self.client.get(f'/assets/{js}', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response.headers['Cache-Control'])
+        self.assertEqual(gzip.decompress(response.data), b'function go() {}')
+        
+        page = self.client.get('/')
+        self.assertNotIn('Content-Encoding', page.headers)
+        self.assertEqual(page.headers['Cache-Control'], 'no-cache')
+        again = self.client.get('/', headers={'If-None-Match': page.headers['ETag']})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(self.client.get('/assets/missing.js').status_code, 404)
+        
+        print("✓ Dashboard asset negotiation test passed")
+
+
+class TestJobManager(unittest.TestCase):
+    """Test cases for asynchronous analysis jobs"""
+    
+    def test_deduplicates_identical_jobs(self):
+        """Test that equivalent in-flight requests share one job and its result"""
+        import threading
+        
+        release = threading.Event()
+        calls = []
+        
+        def analyze(payload):
+            calls.append(payload)
+            release.wait(2)
+            return {'tickers': payload['tickers']}
+        
+        manager = JobManager(max_workers=2)
+        manager.register('analysis', analyze)
+        job, created = manager.submit('analysis', {'tickers': ['aapl', 'MSFT '], 'period': '1y'})
+        duplicate, duplicate_created = manager.submit('analysis', {'period': '1y', 'tickers': ['AAPL', 'MSFT']})
+        self.assertTrue(created)
+        self.assertFalse(duplicate_created)
+        self.assertEqual(duplicate.id, job.id)
+        
+        release.set()
+        finished = manager.wait(job.id, 2)
+        self.assertEqual(finished.status, 'succeeded')
+        self.assertEqual(finished.to_dict()['result'], {'tickers': ['aapl', 'MSFT ']})
+        self.assertEqual(len(calls), 1)
+        # Finished jobs are retained for polling but no longer absorb new submissions
+        self.assertTrue(manager.submit('analysis', {'tickers': ['AAPL', 'MSFT'], 'period': '1y'})[1])
+        self.assertEqual(payload_hash('analysis', {'tickers': ['aapl']}), payload_hash('analysis', {'tickers': [' AAPL']}))
+        
+        print("✓ Job deduplication test passed")
+    
+    def test_failure_and_expiry(self):
+        """Test that errors are reported on the job and finished jobs expire after the TTL"""
+        import time
+        
+        manager = JobManager(result_ttl=1)
+        manager.register('broken', lambda payload: 1 / 0)
+        job, _ = manager.submit('broken', {})
+        self.assertEqual(manager.wait(job.id, 2).status, 'failed')
+        self.assertIn('division by zero', job.to_dict()['error'])
+        self.assertNotIn('result', job.to_dict())
+        self.assertIn('event: result', list(manager.stream(job.id))[-1])
+        
+        job.finished_at = time.time() - 5
+        self.assertIsNone(manager.get(job.id))
+        
+        print("✓ Job failure and expiry test passed")
+    
+    def test_stream_uses_app_json_provider(self):
+        """Test that the streamed result is encoded like GET /api/jobs/<id> (NumPy and pandas values)"""
+        import json
+        import numpy as np
+        import pandas as pd
+        from flask import Flask
+        
+        app = Flask(__name__)
+        app.json = FastJSONProvider(app)
+        manager = JobManager(dumps=app.json.dumps)
+        manager.register('prices', lambda payload: {'close': pd.Series([1.5, np.nan], index=['a', 'b']),
+                                                    'as_of': pd.Timestamp('2024-01-02')})
+        job, _ = manager.submit('prices', {})
+        manager.wait(job.id, 2)
+        streamed = list(manager.stream(job.id))[-1].split('data: ', 1)[1].strip()
+        self.assertEqual(json.loads(streamed), json.loads(app.json.dumps(job.to_dict())))
+        self.assertEqual(json.loads(streamed)['result']['close']['values'], [1.5, None])
+        
+        print("✓ Job stream encoding test passed")
+    
+    def test_stream_endpoint_shares_stream_cap(self):
+        """Test that /api/jobs/<id>/stream counts against the SSE cap and releases its slot"""
+        from unittest import mock
+        from Utils.utils_streams import StreamSlots
+        import new_traderiser_platform as platform
+        
+        slots = StreamSlots(capacity=1)
+        manager = JobManager(dumps=platform.app.json.dumps)
+        manager.register('echo', lambda payload: payload)
+        job, _ = manager.submit('echo', {'ok': True})
+        manager.wait(job.id, 2)
+        client = platform.app.test_client()
+        with mock.patch.object(platform, 'job_manager', manager), mock.patch.object(platform, 'stream_slots', slots):
+            slots.acquire()
+            self.assertEqual(client.get(f'/api/jobs/{job.id}/stream').status_code, 503)
+            slots.release()
+            response = client.get(f'/api/jobs/{job.id}/stream')
+            self.assertIn(b'event: result', response.data)
+            response.close()
+        self.assertEqual(slots.stats()['open'], 0)
+        
+        print("✓ Job stream cap test passed")
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for the normalized-request response cache"""
+    
+    def setUp(self):
+        """Set up a Flask app with one cached POST endpoint"""
+        from flask import Flask, request, jsonify
+        self.calls = []
+        cache = ResponseCache(max_entries=100)
+        app = Flask(__name__)
+        
+        @app.route('/analyze', methods=['POST'])
+        @cache.cached('analyze', 'quotes')
+        def analyze():
+            tickers = request.get_json().get('tickers', [])
+            self.calls.append(tickers)
+            if 'FAIL' in tickers:
+                return jsonify({'error': 'vendor unavailable'})
+            return jsonify({'tickers': sorted(t.upper() for t in tickers)})
+        
+        self.client = app.test_client()
+    
+    def test_equivalent_bodies_hit(self):
+        """Test that reordered, differently-cased ticker sets are served from cache"""
+        first = self.client.post('/analyze', json={'tickers': ['msft', 'AAPL']})
+        second = self.client.post('/analyze', json={'tickers': [' aapl', 'MSFT']})
+        self.assertEqual(first.headers['X-Cache'], 'MISS')
+        self.assertEqual(second.headers['X-Cache'], 'HIT')
+        self.assertEqual(second.get_json(), {'tickers': ['AAPL', 'MSFT']})
+        self.assertEqual(len(self.calls), 1)
+        
+        forced = self.client.post('/analyze', json={'tickers': ['AAPL', 'MSFT']}, headers={'Cache-Control': 'no-cache'})
+        self.assertEqual(forced.headers['X-Cache'], 'MISS')
+        self.assertEqual(len(self.calls), 2)
+        
+        print("✓ Response cache hit test passed")
+    
+    def test_errors_and_positional_payloads(self):
+        """Test that error bodies are not cached and weighted ticker order is preserved"""
+        self.client.post('/analyze', json={'tickers': ['FAIL']})
+        self.assertEqual(self.client.post('/analyze', json={'tickers': ['FAIL']}).headers['X-Cache'], 'MISS')
+        self.assertNotEqual(payload_hash('p', {'tickers': ['A', 'B'], 'weights': [0.7, 0.3]}, sort_tickers=True),
+                            payload_hash('p', {'tickers': ['B', 'A'], 'weights': [0.7, 0.3]}, sort_tickers=True))
+        
+        print("✓ Response cache error handling test passed")
+
+
+class TestJSONProvider(unittest.TestCase):
+    """Test cases for the NumPy/pandas-aware JSON provider"""
+    
+    def test_numpy_and_pandas_values(self):
+        """Test that NumPy scalars/arrays, NaN, Timestamps and DataFrames serialize"""
+        import json
+        import numpy as np
+        import pandas as pd
+        from flask import Flask, jsonify
+        
+        app = Flask(__name__)
+        app.json = FastJSONProvider(app)
+        bars = pd.DataFrame({'close': [101.5, np.nan], 'volume': np.array([1200, 900], dtype='int64')},
+                            index=pd.DatetimeIndex(['2024-01-02 14:30', '2024-01-02 14:31'], tz='UTC'))
+        with app.app_context():
+            body = json.loads(jsonify({
+                'bars': bars,
+                'price': np.float64(12.5),
+                'shares': np.int64(3),
+                'returns': np.array([0.1, 0.2]),
+                'as_of': pd.Timestamp('2024-01-02'),
+                'missing': pd.NaT
+            }).get_data(as_text=True))
+        
+        self.assertEqual(body['bars'], {'index': ['2024-01-02T14:30:00Z', '2024-01-02T14:31:00Z'],
+                                        'columns': {'close': [101.5, None], 'volume': [1200, 900]}})
+        self.assertEqual(body['price'], 12.5)
+        self.assertEqual(body['shares'], 3)
+        self.assertEqual(body['returns'], [0.1, 0.2])
+        self.assertEqual(body['as_of'], '2024-01-02T00:00:00')
+        self.assertIsNone(body['missing'])
+        self.assertEqual(frame_to_columns(bars.reset_index(drop=True))['index'], [0, 1])
+        
+        print("✓ JSON provider test passed")
+
+
+class TestQuoteService(unittest.TestCase):
+    """Test cases for cache-first batch quotes"""
+    
+    def test_columnar_quotes_with_fallback(self):
+        """Test Finnhub quotes, batched YFinance for other symbols, and cache hits"""
+        import numpy as np
+        import pandas as pd
+        
+        class FakeFinnhub:
+            def quote(self, symbol):
+                if symbol == 'ZZZZ':
+                    return {'c': 0, 't': 0}  # Unknown symbol
+                return {'c': 190.0, 'd': 2.0, 'dp': 1.06, 'pc': 188.0, 't': 1704200400}
+        
+        class FakeYFinance:
+            downloads = []
+            
+            def download(self, tickers, **kwargs):
+                symbols = tickers.split()
+                self.downloads.append(symbols)
+                columns = pd.MultiIndex.from_product([['Close', 'Open'], symbols])
+                return pd.DataFrame(np.tile([40000.0, 42000.0], (len(columns), 1)).T,
+                                    index=pd.DatetimeIndex(['2024-01-01', '2024-01-02']), columns=columns)
+        
+        yf_module = FakeYFinance()
+        service = QuoteService(FakeFinnhub(), yf_module, deadline=5)
+        quotes = service.get_quotes(['aapl', 'BTC-USD', 'ZZZZ'])
+        self.assertEqual(quotes['index'], ['AAPL', 'BTC-USD', 'ZZZZ'])
+        self.assertEqual(quotes['columns']['price'], [190.0, 42000.0, 42000.0])
+        self.assertEqual(quotes['columns']['source'], ['finnhub', 'yfinance', 'yfinance'])
+        self.assertEqual(quotes['columns']['change'][1], 2000.0)
+        self.assertEqual(yf_module.downloads, [['BTC-USD'], ['ZZZZ']])  # Finnhub miss falls back
+        self.assertFalse(quotes['partial'])
+        
+        again = service.get_quotes(['AAPL', 'BTC-USD'])
+        self.assertEqual(again['columns']['cached'], [True, True])
+        self.assertEqual(len(yf_module.downloads), 2)
+        
+        print("✓ Batch quote test passed")
+
+    def test_route_takes_finnhub_budget_once(self):
+        """Test that routing a batch draws the Finnhub budget in one limiter call"""
+        from unittest import mock
+        
+        limiter = RateLimiter()
+        service = QuoteService(object(), rate_limiter=limiter)
+        with mock.patch.object(limiter, 'try_acquire_up_to', return_value=2) as take:
+            finnhub_symbols, batch = service._route(['AAPL', 'BTC-USD', 'MSFT', 'NVDA'], True)
+        take.assert_called_once_with('finnhub', 3)
+        self.assertEqual(finnhub_symbols, ['AAPL', 'MSFT'])
+        self.assertEqual(batch, ['BTC-USD', 'NVDA'])
+        
+        print("✓ Quote routing budget test passed")
+
+    def test_async_quotes(self):
+        """Test the event-loop path with concurrent Finnhub calls over an async session"""
+        import asyncio
+        import time
+        import threading
+
+        class FakeResponse:
+            def __init__(self, payload):
+                self.payload = payload
+
+            async def __aenter__(self):
+                await asyncio.sleep(0.05)
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def raise_for_status(self):
+                pass
+
+            async def json(self, content_type=None):
+                return self.payload
+
+        class FakeSession:
+            calls = []
+
+            def get(self, url, params=None):
+                self.calls.append(params['symbol'])
+                return FakeResponse({'c': 10.0, 'd': 1.0, 'dp': 11.1, 'pc': 9.0, 't': 1704200400})
+
+        session = FakeSession()
+        service = QuoteService(finnhub_api_key='test-key', deadline=5)
+        route, route_threads = service._route, []
+        service._route = lambda *args: route_threads.append(threading.get_ident()) or route(*args)
+        started = time.time()
+        quotes = asyncio.run(service.get_quotes_async([f'SYM{i}' for i in range(20)], session))
+        self.assertLess(time.time() - started, 0.5)  # 20 calls of 50ms overlap on one loop
+        self.assertEqual(len(session.calls), 20)
+        self.assertEqual(quotes['columns']['price'], [10.0] * 20)
+        self.assertEqual(quotes['columns']['source'], ['finnhub'] * 20)
+        self.assertFalse(quotes['partial'])
+        self.assertNotIn(threading.get_ident(), route_threads)  # Budget taken off the event loop
+
+        print("✓ Async quote test passed")
+
+
+class TestCacheWarmer(unittest.TestCase):
+    """Test cases for the pre-traffic cache warmup"""
+    
+    def test_steps_progress_and_readiness(self):
+        """Test batched warming, per-step metrics and readiness once all steps settle"""
+        warmed_batches = []
+        
+        def warm(batch):
+            warmed_batches.append(batch)
+            return len([s for s in batch if s != 'DEAD'])
+        
+        def broken_universe():
+            raise ImportError("analyzer dependencies missing")
+        
+        warmer = CacheWarmer(enabled=True, batch_size=2, batches_per_minute=600, max_seconds=10, only=[])
+        warmer.add_step('etfs', lambda: ['SPY', 'QQQ', 'DEAD', 'SPY'], warm)
+        warmer.add_step('crypto', broken_universe, warm)
+        self.assertFalse(warmer.status()['ready'])
+        
+        warmer.run()
+        status = warmer.status()
+        self.assertTrue(status['ready'])
+        self.assertEqual(warmed_batches, [['SPY', 'QQQ'], ['DEAD']])
+        etfs = status['steps']['etfs']
+        self.assertEqual((etfs['status'], etfs['total'], etfs['warmed'], etfs['failed']), ('done', 3, 2, 1))
+        self.assertEqual(status['steps']['crypto']['status'], 'failed')
+        
+        selective = CacheWarmer(enabled=True, only=['crypto'])
+        selective.add_step('etfs', lambda: ['SPY'], warm)
+        self.assertNotIn('etfs', selective.steps)
+        self.assertTrue(CacheWarmer(enabled=False).status()['ready'])
+        
+        print("✓ Cache warmer test passed")
+
+
+class TestDatasetLoader(unittest.TestCase):
+    """Test cases for background dataset loading and readiness"""
+    
+    def setUp(self):
+        """Set up builders that block until released and record which thread ran them"""
+        import threading
+        self.release = threading.Event()
+        self.loaded, self.threads = [], set()
+        
+        def builder(name):
+            def build():
+                self.release.wait(5)
+                self.loaded.append(name)
+                self.threads.add(threading.current_thread().name)
+                if name == 'funds':
+                    raise ValueError("download failed")
+                return {'name': name}
+            return build
+        
+        self.builders = {name: builder(name) for name in ('equities', 'etfs', 'funds', 'indices')}
+        self.builders['currencies'] = None
+    
+    def test_readiness_transitions(self):
+        """Test pending -> queued/loading -> loaded/failed states and when the loader reports ready"""
+        loader = DatasetLoader(self.builders, preload=['equities', 'etfs', 'funds', 'bogus'])
+        status = loader.readiness()
+        self.assertFalse(status['ready'])
+        self.assertEqual(status['datasets']['equities'], 'pending')
+        self.assertEqual(status['datasets']['currencies'], 'unavailable')
+        
+        loader.start_warmup()
+        loader.start_warmup()
+        self.assertFalse(loader.readiness()['ready'])
+        self.assertIn(loader.readiness()['datasets']['etfs'], ('queued', 'loading'))
+        self.release.set()
+        self.assertTrue(loader.wait(5))
+        
+        status = loader.readiness()
+        self.assertTrue(status['ready'])
+        self.assertEqual(status['datasets'], {'equities': 'loaded', 'etfs': 'loaded', 'funds': 'failed',
+                                              'indices': 'pending', 'currencies': 'unavailable'})
+        self.assertEqual(self.loaded, ['equities', 'etfs', 'funds'])
+        self.assertTrue(DatasetLoader(self.builders, preload=['equities'], mode='lazy').readiness()['ready'])
+        
+        print("✓ Dataset loader readiness test passed")
+    
+    def test_on_demand_load_joins_warmup_thread(self):
+        """Test that a first use during warmup is queued ahead on the loader thread, not a second thread"""
+        loader = DatasetLoader(self.builders, preload=['equities', 'etfs'])
+        loader.start_warmup()
+        self.assertIsNone(loader.get('indices'))
+        self.assertIsNone(loader.get('indices'))
+        self.assertIsNone(loader.get('currencies'))
+        self.release.set()
+        self.assertTrue(loader.wait(5))
+        
+        self.assertIn(self.loaded, (['equities', 'indices', 'etfs'], ['indices', 'equities', 'etfs']))
+        self.assertEqual(self.threads, {'dataset-loader'})
+        self.assertEqual(loader.get('indices'), {'name': 'indices'})
+        
+        print("✓ Dataset loader serialization test passed")
+    
+    def test_lazy_property_fallback(self):
+        """Test that a dataset property returns None until the load it starts has finished"""
+        loader = DatasetLoader(self.builders, mode='lazy')
+        
+        class Holder:
+            etfs = dataset_property('etfs')
+            
+            def get_dataset(self, name):
+                return loader.get(name)
+        
+        holder = Holder()
+        self.assertIsNone(holder.etfs)
+        self.release.set()
+        self.assertTrue(loader.wait(5))
+        self.assertEqual(holder.etfs, {'name': 'etfs'})
+        self.assertEqual(self.loaded, ['etfs'])
+        
+        print("✓ Dataset lazy property test passed")
+    
+    def test_ready_endpoint(self):
+        """Test that /ready starts the warmup and answers 503 until the preloaded datasets settle"""
+        from unittest import mock
+        import new_traderiser_platform as platform
+        loader = DatasetLoader(self.builders, preload=['equities'])
+        client = platform.app.test_client()
+        
+        with mock.patch.object(platform.financial_integration, 'datasets', loader), \
+                mock.patch.object(platform, 'cache_warmer', CacheWarmer(enabled=False)):
+            response = client.get('/ready')
+            self.assertEqual(response.status_code, 503)
+            self.assertFalse(response.get_json()['ready'])
+            self.release.set()
+            self.assertTrue(loader.wait(5))
+            
+            response = client.get('/ready')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()['datasets']['equities'], 'loaded')
+        
+        print("✓ Readiness endpoint test passed")
+
+
+class TestAsyncApp(unittest.TestCase):
+    """Test cases for the ASGI entry point's async routes"""
+    
+    PRICES = {'bitcoin': {'usd': 50000.0, 'usd_24h_change': 2.0}, 'ethereum': {'usd': 3000.0, 'usd_24h_change': -1.0}}
+    
+    def setUp(self):
+        """Set up fake CoinGecko responses for both the async session and the Flask HTTP client"""
+        from unittest import mock
+        import async_app
+        import new_traderiser_platform as platform
+        self.async_app, self.platform = async_app, platform
+        prices = self.PRICES
+        
+        class FakeAsyncResponse:
+            def __init__(self, url):
+                self.status = 200 if '/simple/price' in url else 503
+                self.payload = {coin: prices[coin] for coin in prices if f'ids={coin}&' in url}
+            
+            async def __aenter__(self):
+                return self
+            
+            async def __aexit__(self, *exc):
+                return False
+            
+            async def json(self, content_type=None):
+                return self.payload
+        
+        class FakeSession:
+            def get(self, url):
+                return FakeAsyncResponse(url)
+        
+        def fake_http_get(url, **kwargs):
+            response = FakeAsyncResponse(url)
+            return mock.Mock(status_code=response.status, json=lambda: response.payload)
+        
+        patches = [mock.patch.object(async_app.app, 'get_client', return_value=FakeSession()),
+                   mock.patch.object(platform, 'http_get', fake_http_get)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+    
+    def post_async(self, body: Dict) -> tuple:
+        """POST /api/crypto/analyze through the ASGI app; returns (status, JSON body)"""
+        import asyncio
+        import json
+        sent = []
+        
+        async def receive():
+            return {'type': 'http.request', 'body': json.dumps(body).encode(), 'more_body': False}
+        
+        async def send(message):
+            sent.append(message)
+        
+        scope = {'type': 'http', 'method': 'POST', 'path': '/api/crypto/analyze', 'query_string': b'',
+                 'headers': [(b'cache-control', b'no-cache')]}
+        asyncio.run(self.async_app.app(scope, receive, send))
+        return sent[0]['status'], json.loads(sent[1]['body'])
+    
+    def post_flask(self, body: Dict) -> tuple:
+        """POST /api/crypto/analyze through the Flask app; returns (status, JSON body)"""
+        response = self.platform.app.test_client().post('/api/crypto/analyze', json=body,
+                                                         headers={'Cache-Control': 'no-cache'})
+        return response.status_code, response.get_json()
+    
+    def test_crypto_analyze_matches_flask(self):
+        """Test that async /api/crypto/analyze prices holdings and answers exactly like the Flask route"""
+        body = {'symbols': ['btc', 'ETH'], 'holdings': [0.5, None]}
+        status, result = self.post_async(body)
+        self.assertEqual(status, 200)
+        self.assertEqual(result['total_value'], 28000.0)
+        self.assertEqual(result['crypto_details']['ETH']['holding'], 1)
+        self.assertFalse(result['partial'])
+        self.assertEqual((status, result), self.post_flask(body))
+        
+        print("✓ Async crypto analysis test passed")
+    
+    def test_crypto_analyze_bad_holding(self):
+        """Test that an unparseable holding is reported per symbol, not as a 500, on both servers"""
+        body = {'symbols': ['BTC', 'ETH'], 'holdings': [1, 'lots']}
+        status, result = self.post_async(body)
+        self.assertEqual(status, 200)
+        self.assertTrue(result['error'].startswith('Error fetching data for ETH'))
+        self.assertEqual((status, result), self.post_flask(body))
+        
+        print("✓ Async crypto bad holding test passed")
+
+
+class TestInstrumentIndex(unittest.TestCase):
+    """Test cases for the instrument search index"""
+    
+    def test_ranking_and_categories(self):
+        """Test exact, prefix and substring ranking and the category filter"""
+        index = InstrumentIndex.from_symbol_database({
+            'US_STOCKS': {
+                'AAPLW': {'name': 'Apple Hospitality Warrants'},
+                'APLE': {'name': 'Apple Hospitality REIT'},
+                'AAPL': {'name': 'Apple Inc.'},
+                'PINE': {'name': 'Alpine Income Property Trust'}
+            },
+            'ETFS': {'SPY': {'name': 'SPDR S&P 500 ETF Trust'}}
+        })
+        self.assertEqual(index.search('aapl')[0], ('US_STOCKS', 'AAPL'))  # Exact beats prefix
+        self.assertEqual(index.search('aapl')[1], ('US_STOCKS', 'AAPLW'))
+        self.assertEqual([s for _, s in index.search('pine')], ['PINE'])
+        self.assertEqual([s for _, s in index.search('inc')], ['AAPL', 'PINE'])  # Name tokens
+        self.assertEqual([s for _, s in index.search('lpine')], ['PINE'])
+        self.assertEqual([s for _, s in index.search('trust', categories=['ETFS'])], ['SPY'])
+        self.assertEqual(len(index.search('', limit=3)), 3)
+        self.assertEqual(index.search('zzzz'), [])
+        
+        print("✓ Instrument index ranking test passed")
+    
+    def test_large_universe_candidates(self):
+        """Test that searches over tens of thousands of instruments find every match, in tier order"""
+        import random
+        import string
+        
+        rng = random.Random(7)
+        words = ['global', 'energy', 'capital', 'holdings', 'systems', 'bio', 'pharma', 'trust', 'group', 'inc']
+        universe = {'US_STOCKS': {}}
+        for _ in range(30000):
+            symbol = ''.join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(1, 5)))
+            universe['US_STOCKS'][symbol] = {'name': ' '.join(rng.choice(words).title() for _ in range(3))}
+        index = InstrumentIndex.from_symbol_database(universe)
+        
+        def tier(q, symbol, name):
+            """0 exact symbol, 1 exact name, 2 symbol prefix, 3 name prefix, 4 symbol/5 name substring"""
+            symbol, name = symbol.lower(), name.lower()
+            if symbol == q or name == q:
+                return 0 if symbol == q else 1
+            if symbol.startswith(q):
+                return 2
+            if name.startswith(q) or any(token.startswith(q) for token in name.split()):
+                return 3
+            return 4 if q in symbol else 5
+        
+        for query in ['a', 'ab', 'abc', 'energy', 'olding', 'apital gro', 'zzzzz']:
+            expected = {symbol for symbol, info in universe['US_STOCKS'].items()
+                        if query in symbol.lower() or query in info['name'].lower()}
+            everything = [symbol for _, symbol in index.search(query, limit=len(universe['US_STOCKS']))]
+            self.assertEqual(len(everything), len(set(everything)))
+            self.assertEqual(set(everything), expected)
+            tiers = [tier(query, symbol, universe['US_STOCKS'][symbol]['name']) for symbol in everything]
+            self.assertEqual(tiers, sorted(tiers))
+            self.assertEqual([symbol for _, symbol in index.search(query, limit=50)], everything[:50])
+        
+        print("✓ Instrument index large universe test passed")
+
+class TestInstrumentUniverse(unittest.TestCase):
+    """Test cases for the columnar instrument universe"""
+    
+    def setUp(self):
+        """Build a small universe from FinanceDatabase-shaped frames"""
+        import pandas as pd
+        
+        equities = pd.DataFrame({
+            'name': ['Apple Inc.', 'Microsoft Corporation', 'Exxon Mobil', None],
+            'sector': ['Information Technology', 'Information Technology', 'Energy', None],
+            'industry': ['Hardware', 'Software', 'Oil & Gas', ''],
+            'country': ['United States'] * 4,
+            'market_cap': ['Mega Cap', 'Mega Cap', 'Large Cap', 'Nano Cap'],
+            'summary': ['...'] * 4
+        }, index=['AAPL', 'MSFT', 'XOM', 'TINY']).assign(has_options=True)
+        etfs = pd.DataFrame({'name': ['SPDR S&P 500 ETF'], 'category': ['Equities'], 'family': ['SPDR'],
+                             'expense_ratio': [0.09]}, index=['SPY'])
+        self.universe = InstrumentUniverse({'US_STOCKS': equities, 'ETFS': etfs})
+    
+    def test_vectorized_filters(self):
+        """Test categorical, boolean and numeric filters over the universe"""
+        self.universe.set_flags('has_options', {'MSFT': False}, 'US_STOCKS')
+        self.assertEqual(self.universe.symbols_where(country='United States', sector='Information Technology',
+                                                     has_options=True), ['AAPL'])
+        self.assertEqual(self.universe.symbols_where(sector=['Energy', 'Information Technology']),
+                         ['AAPL', 'MSFT', 'XOM'])
+        self.assertEqual(self.universe.symbols_where(min_market_cap_rank=5), ['AAPL', 'MSFT', 'XOM'])
+        self.assertEqual(self.universe.symbols_where(max_expense_ratio=0.1), ['SPY'])
+        self.assertEqual(self.universe.symbols_where(sector='Unknown'), [])
+        with self.assertRaises(ValueError):
+            self.universe.mask(min_sector='Energy')
+        
+        print("✓ Instrument universe filter test passed")
+    
+    def test_symbol_database_view(self):
+        """Test the dict-style compatibility view"""
+        database = self.universe.as_symbol_database()
+        self.assertEqual(list(database), ['US_STOCKS', 'ETFS', 'CRYPTO', 'INDICES', 'CURRENCIES'])
+        self.assertEqual(database['US_STOCKS']['TINY'], {
+            'name': '', 'sector': '', 'industry': '', 'market_cap': 'Nano Cap',
+            'country': 'United States', 'has_options': True
+        })
+        self.assertEqual(database['ETFS']['SPY']['expense_ratio'], 0.09)
+        self.assertEqual(database['ETFS']['SPY']['total_assets'], 0)
+        self.assertNotIn('SPY', database['US_STOCKS'])
+        self.assertEqual(len(database['US_STOCKS']), 4)
+        self.assertEqual(database['CRYPTO'].get('BTC-USD', {}), {})
+        
+        print("✓ Instrument universe view test passed")
+
+
+class TestInstrumentSnapshot(unittest.TestCase):
+    """Test cases for the memory-mapped instrument snapshot"""
+    
+    def test_publish_load_and_swap(self):
+        """Test a snapshot round trip and the background swap to a newer version"""
+        import tempfile
+        import time
+        
+        directory = tempfile.mkdtemp()
+        publisher = InstrumentSnapshotPublisher(directory, keep_versions=1)
+        universe = InstrumentUniverse.from_records({
+            'US_STOCKS': {
+                'AAPL': {'name': 'Apple Inc.', 'sector': 'Information Technology', 'market_cap': 'Mega Cap',
+                         'country': 'United States', 'has_options': True},
+                'TINY': {'name': 'Tiny Corp', 'sector': 'Energy', 'has_options': False}
+            },
+            'ETFS': {'SPY': {'name': 'SPDR S&P 500 ETF', 'category': 'Equities', 'expense_ratio': 0.09}}
+        })
+        self.assertIsNone(InstrumentSnapshot(directory).load())  # Nothing published yet
+        manifest = publisher.publish(universe)
+        
+        snapshot = InstrumentSnapshot(directory, check_interval=0.05)
+        loaded = snapshot.load()
+        self.assertEqual(snapshot.version(), manifest['version'])
+        self.assertEqual(loaded.symbols.tolist(), ['AAPL', 'TINY', 'SPY'])
+        self.assertEqual(loaded.record(loaded.row('AAPL')), universe.record(universe.row('AAPL')))
+        self.assertEqual(loaded.record(loaded.row('SPY'))['expense_ratio'], 0.09)
+        self.assertEqual(loaded.symbols_where(has_options=True, min_market_cap_rank=6), ['AAPL'])
+        loaded.set_flags('has_options', {'TINY': True})
+        
+        swapped = []
+        snapshot.start_refresh(swapped.append)
+        publisher.publish(InstrumentUniverse.from_records({'CRYPTO': {'BTC-USD': {'name': 'Bitcoin'}}}))
+        deadline = time.time() + 5
+        while not swapped and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(swapped[0].symbols.tolist(), ['BTC-USD'])
+        self.assertEqual(len([f for f in os.listdir(directory) if f.endswith('.bin')]), 1)
+        
+        print("✓ Instrument snapshot test passed")
+
+
+class TestOptionsEnrichment(unittest.TestCase):
+    """Test cases for the background options-availability enrichment"""
+    
+    def test_batched_probe_and_persisted_flags(self):
+        """Test that due symbols are probed in batches, persisted and overlaid on the universe"""
+        import tempfile
+        import time
+        
+        path = os.path.join(tempfile.mkdtemp(), 'options_flags.json')
+        probed = []
+        
+        def probe(symbol):
+            probed.append(symbol)
+            if symbol == 'FAIL':
+                raise ConnectionError('vendor unavailable')
+            return symbol != 'TINY'
+        
+        symbols = ['AAPL', 'MSFT', 'TINY', 'FAIL', 'NVDA']
+        enrichment = OptionsEnrichment(probe, path=path, batch_size=2, calls_per_minute=600)
+        batches = []
+        self.assertEqual(enrichment.run_once(symbols, batches.append), 4)
+        self.assertEqual(sorted(probed), sorted(symbols))
+        self.assertEqual([len(batch) for batch in batches], [2, 1, 1])  # FAIL recorded nothing
+        self.assertFalse(enrichment.has_options('TINY'))
+        self.assertIsNone(enrichment.has_options('FAIL'))
+        
+        # Another process reads the persisted flags; only the failed symbol is still due
+        reader = OptionsEnrichment(probe, path=path)
+        self.assertEqual(reader.flags(), {'AAPL': True, 'MSFT': True, 'TINY': False, 'NVDA': True})
+        self.assertEqual(reader.due(symbols), ['FAIL'])
+        reader._flags['MSFT'][1] = time.time() - reader.refresh_seconds - 1
+        self.assertEqual(reader.due(symbols), ['FAIL', 'MSFT'])
+        
+        universe = InstrumentUniverse.from_records({
+            'US_STOCKS': {symbol: {'name': symbol, 'has_options': True} for symbol in symbols}
+        })
+        reader.apply(universe)
+        self.assertEqual(universe.symbols_where(has_options=False), ['TINY'])
+        
+        print("✓ Options enrichment test passed")
+
+
+class TestSecuritySearch(unittest.TestCase):
+    """Test cases for the typo-tolerant in-memory security search"""
+    
+    def setUp(self):
+        """Build an engine over a small FinanceDatabase-shaped selection"""
+        import pandas as pd
+        
+        frame = pd.DataFrame({
+            'name': ['Apple Inc.', 'Apple Inc.', 'Microsoft Corporation', 'Bank of America Corporation',
+                     'Maple Leaf Foods Inc.', 'Applied Materials, Inc.', 'Visa Inc.'],
+            'sector': ['Information Technology', 'Information Technology', 'Information Technology',
+                       'Financials', 'Consumer Staples', 'Information Technology', 'Financials'],
+            'market_cap': ['Mega Cap', 'Mega Cap', 'Mega Cap', 'Mega Cap', 'Small Cap', 'Large Cap', 'Mega Cap']
+        }, index=['AAPL', 'AAPL.MX', 'MSFT', 'BAC', 'MFI.TO', 'AMAT', 'V'])
+        self.engine = SecuritySearchEngine.from_frame(frame, popular=['AAPL', 'MSFT'])
+    
+    def test_ranking_and_typos(self):
+        """Test exact, prefix and misspelled queries against symbols and names"""
+        symbols = lambda query: [r['symbol'] for r in self.engine.search(query, 3)]  # noqa: E731
+        
+        self.assertEqual(symbols('aapl')[:2], ['AAPL', 'AAPL.MX'])  # Primary listing first
+        self.assertEqual(symbols('V')[0], 'V')
+        self.assertEqual(symbols('appl')[:3], ['AAPL', 'AAPL.MX', 'AMAT'])
+        self.assertEqual(symbols('aple')[0], 'AAPL')
+        self.assertEqual(symbols('microsft'), ['MSFT'])
+        self.assertEqual(symbols('bank of amer'), ['BAC'])
+        self.assertEqual(symbols('zzzz'), [])
+        
+        result = self.engine.search('Microsoft', 1)[0]
+        self.assertEqual(result['name'], 'Microsoft Corporation')
+        self.assertEqual(result['sector'], 'Information Technology')
+        
+        # With no budget left only exact and prefix matches are scored
+        self.assertEqual(self.engine.search('microsft', 5, budget_ms=0), [])
+        
+        print("✓ Security search ranking test passed")
+    
+    def test_large_universe_ranking(self):
+        """Test ranking, typo matching and the budget cut-off over a large synthetic universe"""
+        import pandas as pd
+        
+        words = ['Global', 'Energy', 'Capital', 'Holdings', 'Systems', 'Therapeutics', 'Bancorp', 'Industries']
+        names = [f"{words[i % 8]} {words[i // 8 % 8]} {words[i // 64 % 8]} {i}" for i in range(30000)]
+        frame = pd.DataFrame({'name': names}, index=[f"S{i}" for i in range(30000)])
+        engine = SecuritySearchEngine.from_frame(frame)
+        
+        exact = engine.search('s123', 10)
+        self.assertEqual(exact[0]['symbol'], 'S123')
+        self.assertTrue({r['symbol'] for r in exact[1:]} <= {f"S123{d}" for d in range(10)})
+        for query, expected in [('globl holdngs', {'global', 'holdings'}), ('energy', {'energy'}),
+                                ('therapeutcs', {'therapeutics'})]:
+            results = engine.search(query, 10)
+            self.assertEqual(len(results), 10)
+            for result in results:
+                self.assertTrue(expected <= set(result['name'].lower().split()), result['name'])
+            scores = [r['score'] for r in results]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertTrue(all('capital' in r['name'].lower().split() for r in engine.search('cap', 10)))
+        
+        # An exhausted budget keeps exact/prefix candidates and drops the fuzzy ones
+        self.assertEqual(engine.search('globl holdngs', 10, budget_ms=0), [])
+        self.assertEqual(len(engine.search('energy', 10, budget_ms=0)), 10)
+        
+        print("✓ Security search large universe test passed")
+
 class TestYahooFinanceAPI(unittest.TestCase):
     """Test Yahoo Finance API functionality"""
     
@@ -224,6 +1627,30 @@ def run_test_suite():
     # Add test cases
     test_classes = [
         TestSharedUtilities,
+        TestMarketDataService,
+        TestPriceStore,
+        TestSharedPricePanel,
+        TestSingleFlight,
+        TestTTLCache,
+        TestStaleWhileRevalidate,
+        TestBinaryCodec,
+        TestRateLimiter,
+        TestHTTPTransport,
+        TestTickerBroadcaster,
+        TestFanOut,
+        TestDashboardAssets,
+        TestJobManager,
+        TestResponseCache,
+        TestJSONProvider,
+        TestQuoteService,
+        TestCacheWarmer,
+        TestDatasetLoader,
+        TestAsyncApp,
+        TestInstrumentIndex,
+        TestInstrumentUniverse,
+        TestInstrumentSnapshot,
+        TestOptionsEnrichment,
+        TestSecuritySearch,
         TestYahooFinanceAPI,
         TestPortfolioAnalyzer,
         TestETFAnalyzer,
@@ -0,0 +1,165 @@
+"""Server-side ticker snapshot broadcaster for TradeRiser.AI
+One background thread per process refreshes the top-ticker quotes on a
+fixed interval and keeps an in-memory snapshot. /api/tickers serves that
+snapshot directly, and Server-Sent-Events subscribers receive only the
+tickers that changed since their last update.
+"""
+import os
+import json
+import time
+import threading
+import logging
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils_shared import setup_logging
+from Utils.utils_fanout import fan_out
+from Utils.utils_streams import StreamSlots
+
+# Setup centralized logging
+setup_logging()
+
+
+class TickerBroadcaster:
+    """Periodically refreshed ticker snapshot with delta notifications"""
+
+    def __init__(self, ticker_lists: Dict[str, List[str]], fetch_quote: Callable[[str], Dict],
+                 interval: int = None, max_clients: int = None, stream_seconds: int = None,
+                 slots: StreamSlots = None):
+        """Initialize with category -> tickers lists, a per-ticker quote function and the stream slots"""
+        self.logger = logging.getLogger(__name__)
+        self.ticker_lists = ticker_lists
+        self.fetch_quote = fetch_quote
+        self.interval = interval or int(os.getenv('TICKER_REFRESH_SECONDS', 60))
+        # Each stream holds a server thread, so the cap follows the server's thread count
+        self.slots = slots or StreamSlots(max_clients)
+        # Streams end after this long; EventSource reconnects, freeing server threads periodically
+        self.stream_seconds = stream_seconds or int(os.getenv('TICKER_STREAM_MAX_SECONDS', 300))
+        self.version = 0
+        self.updated_at = None
+        self._snapshot: Dict[str, Dict[str, Dict]] = {}
+        self._deltas = deque(maxlen=16)  # (version, {category: {ticker: quote}})
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        """Start the refresh thread once per process"""
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='ticker-broadcaster', daemon=True)
+            self._thread.start()
+            self.logger.info(f"Ticker broadcaster started ({self.interval}s interval)")
+
+    def snapshot(self, category: Optional[str] = None, wait: float = 15.0) -> Tuple[int, Dict]:
+        """Get (version, snapshot) for all categories or one; waits for the first refresh"""
+        self.start()
+        with self._condition:
+            if self.version == 0:
+                self._condition.wait_for(lambda: self.version > 0, timeout=wait)
+            snapshot = self._snapshot
+            version = self.version
+        if category:
+            return version, snapshot.get(category, {})
+        return version, snapshot
+
+    def warm(self, tickers: List[str]) -> int:
+        """Start refreshing and wait for the first snapshot; returns how many of tickers have a price"""
+        _, snapshot = self.snapshot(wait=self.interval)
+        quotes = {ticker: quote for category in snapshot.values() for ticker, quote in category.items()}
+        return sum(1 for ticker in tickers if quotes.get(ticker, {}).get('current_price'))
+
+    def refresh(self) -> Dict:
+        """Fetch every ticker once and publish the changes; returns the delta"""
+        tickers = list(dict.fromkeys(t for tick_list in self.ticker_lists.values() for t in tick_list))
+        # Fetch concurrently; tickers that miss the deadline keep their previous quote
+        fetched = fan_out(self._safe_quote, tickers, deadline=self.interval * 0.8, pool='background')
+        snapshot = {}
+        for category, tick_list in self.ticker_lists.items():
+            snapshot[category] = {}
+            for ticker in tick_list:
+                snapshot[category][ticker] = fetched.results.get(ticker) or self._previous_quote(ticker)
+        return self._publish(snapshot)
+
+    def stream(self, category: Optional[str] = None, heartbeat: float = 15.0) -> Iterator[str]:
+        """Yield SSE messages: a full snapshot, then deltas as they are published"""
+        version, snapshot = self.snapshot(category)
+        yield f"retry: 5000\nid: {version}\nevent: snapshot\ndata: {json.dumps(snapshot)}\n\n"
+        deadline = time.monotonic() + self.stream_seconds
+        while time.monotonic() < deadline:
+            with self._condition:
+                self._condition.wait_for(lambda: self.version > version,
+                                         timeout=min(heartbeat, max(0.0, deadline - time.monotonic())))
+                if self.version == version:
+                    pending = None
+                else:
+                    pending = self._changes_since(version, category)
+                    version = self.version
+            if pending is None:
+                yield ": keep-alive\n\n"
+            elif pending[0] == 'snapshot':
+                yield f"id: {version}\nevent: snapshot\ndata: {json.dumps(pending[1])}\n\n"
+            elif pending[1]:
+                yield f"id: {version}\nevent: delta\ndata: {json.dumps(pending[1])}\n\n"
+
+    def acquire_client(self) -> bool:
+        """Reserve a stream slot; False when the per-process cap is reached"""
+        return self.slots.acquire()
+
+    def release_client(self):
+        """Release a stream slot"""
+        self.slots.release()
+
+    def _run(self):
+        """Refresh loop"""
+        while True:
+            started = time.monotonic()
+            try:
+                self.refresh()
+            except Exception as e:
+                self.logger.error(f"Ticker refresh failed: {str(e)}")
+            time.sleep(max(1.0, self.interval - (time.monotonic() - started)))
+
+    def _safe_quote(self, ticker: str) -> Dict:
+        """Fetch one quote, keeping the previous value if the vendor call fails"""
+        try:
+            return self.fetch_quote(ticker)
+        except Exception as e:
+            self.logger.error(f"Error fetching ticker {ticker}: {str(e)}")
+            return self._previous_quote(ticker)
+
+    def _previous_quote(self, ticker: str) -> Dict:
+        """Last published quote for a ticker, or zeros if there is none"""
+        for quotes in self._snapshot.values():
+            if ticker in quotes:
+                return quotes[ticker]
+        return {'current_price': 0, 'change_percent': 0}
+
+    def _publish(self, snapshot: Dict) -> Dict:
+        """Swap in a new snapshot and notify subscribers of changed tickers"""
+        with self._condition:
+            delta = {}
+            for category, quotes in snapshot.items():
+                previous = self._snapshot.get(category, {})
+                changed = {t: q for t, q in quotes.items() if previous.get(t) != q}
+                if changed:
+                    delta[category] = changed
+            if delta or self.version == 0:
+                self._snapshot = snapshot
+                self.version += 1
+                self._deltas.append((self.version, delta))
+                self._condition.notify_all()
+            self.updated_at = time.time()
+        return delta
+
+    def _changes_since(self, version: int, category: Optional[str]):
+        """Merge deltas after version, or fall back to a full snapshot if they were dropped"""
+        deltas = [d for v, d in self._deltas if v > version]
+        if not self._deltas or self._deltas[0][0] > version + 1:
+            snapshot = self._snapshot.get(category, {}) if category else self._snapshot
+            return 'snapshot', snapshot
+        merged: Dict[str, Dict] = {}
+        for delta in deltas:
+            for cat, quotes in delta.items():
+                merged.setdefault(cat, {}).update(quotes)
+        return 'delta', merged.get(category, {}) if category else merged